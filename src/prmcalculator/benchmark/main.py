@@ -0,0 +1,196 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dateutil.parser import isoparse
+
+from prmcalculator.benchmark.synthetic_transfers import SyntheticTransferGenerator
+from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.pipeline.config import MetricsEngine, PipelineConfig, TransferDataDiscovery
+from prmcalculator.pipeline.metrics_calculator import MetricsCalculator
+from prmcalculator.pipeline.s3_uri_resolver import PlatformMetricsS3UriResolver
+from prmcalculator.utils.date_converter import convert_date_range_to_monthly_datetimes
+from prmcalculator.utils.io.local_files import LocalFileDataManager
+from prmcalculator.utils.stage_timings import StageTimings
+
+_TRANSFER_DATA_BUCKET = "transfer-data"
+_METRICS_BUCKET = "metrics"
+_AGGREGATE_CACHE_URI = f"s3://{_METRICS_BUCKET}/aggregate-cache"
+
+
+@dataclass
+class BenchmarkConfig:
+    data_directory: Path
+    seed: int = 42
+    practice_count: int = 7000
+    sicbl_count: int = 200
+    transfers_per_month: int = 2000000
+    date_anchor: datetime = isoparse("2021-07-01T00:00:00Z")
+    number_of_months: int = 6
+    metrics_engine: MetricsEngine = MetricsEngine.TRANSFERS
+    max_concurrent_reads: int = 1
+    practice_metrics_max_workers: int = 1
+    transfer_data_discovery: TransferDataDiscovery = TransferDataDiscovery.DAILY
+    prefetch_queue_size: int = 0
+    backfill_end_date_anchor: Optional[datetime] = None
+    aggregate_cache: bool = False
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+class MetricsBenchmark:
+    def __init__(self, config: BenchmarkConfig):
+        self._config = config
+        self._reporting_windows = [
+            ReportingWindow.prior_to(date_anchor, config.number_of_months)
+            for date_anchor in convert_date_range_to_monthly_datetimes(
+                config.date_anchor, config.backfill_end_date_anchor or config.date_anchor
+            )
+        ]
+        self._dates = sorted({date for window in self._reporting_windows for date in window.dates})
+        self._uris = PlatformMetricsS3UriResolver(
+            transfer_data_bucket=_TRANSFER_DATA_BUCKET,
+            data_platform_metrics_bucket=_METRICS_BUCKET,
+        )
+        self._files = LocalFileDataManager(config.data_directory)
+
+    def generate_transfer_data(self):
+        generator = SyntheticTransferGenerator(
+            seed=self._config.seed,
+            practice_count=self._config.practice_count,
+            sicbl_count=self._config.sicbl_count,
+            transfers_per_month=self._config.transfers_per_month,
+        )
+        for date, uri in zip(self._dates, self._uris.transfer_data(self._dates)):
+            if not self._files.path(uri).exists():
+                self._files.write_parquet(uri, generator.daily_transfer_table(date))
+
+    def _pipeline_config(self) -> PipelineConfig:
+        return PipelineConfig(
+            build_tag="benchmark",
+            input_transfer_data_bucket=_TRANSFER_DATA_BUCKET,
+            output_metrics_bucket=_METRICS_BUCKET,
+            date_anchor=self._config.date_anchor,
+            number_of_months=self._config.number_of_months,
+            s3_endpoint_url=None,
+            national_metrics_s3_path_param_name="national-metrics-path",
+            practice_metrics_s3_path_param_name="practice-metrics-path",
+            max_concurrent_reads=self._config.max_concurrent_reads,
+            metrics_engine=self._config.metrics_engine,
+            aggregate_cache_uri=_AGGREGATE_CACHE_URI if self._config.aggregate_cache else None,
+            backfill_end_date_anchor=self._config.backfill_end_date_anchor,
+            practice_metrics_max_workers=self._config.practice_metrics_max_workers,
+            storage_uri=f"file://{self._config.data_directory.resolve()}",
+            transfer_data_discovery=self._config.transfer_data_discovery,
+            prefetch_queue_size=self._config.prefetch_queue_size,
+            # Every run is timed end to end, so outputs are rewritten even when unchanged.
+            skip_unchanged_outputs=False,
+        )
+
+    def _transfer_count(self) -> int:
+        return sum(
+            pq.read_metadata(self._files.path(uri)).num_rows
+            for uri in self._uris.transfer_data(self._dates)
+        )
+
+    def run(self) -> Dict[str, Any]:
+        timings = StageTimings()
+        MetricsCalculator(self._pipeline_config(), stage_timings=timings).run()
+        practice_metrics = self._files.read_json(
+            self._uris.practice_metrics(self._reporting_windows[-1].last_metric_month)
+        )
+
+        return {
+            "config": {name: _json_value(value) for name, value in asdict(self._config).items()},
+            "environment": {
+                "python_version": platform.python_version(),
+                "pyarrow_version": pa.__version__,
+            },
+            "daily_file_count": len(self._dates),
+            "transfer_count": self._transfer_count(),
+            "practice_count": len(practice_metrics["practices"]),
+            "stage_seconds": timings.to_dict(),
+            "total_seconds": timings.total_seconds,
+            "max_rss_kilobytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def _parse_args(args: Optional[List[str]]) -> Tuple[BenchmarkConfig, argparse.Namespace]:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the metrics calculator against synthetic transfer data."
+    )
+    parser.add_argument("--data-directory", type=Path, required=True)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--practices", type=int, default=7000)
+    parser.add_argument("--sicbls", type=int, default=200)
+    parser.add_argument("--transfers-per-month", type=int, default=2000000)
+    parser.add_argument("--date-anchor", type=isoparse, default="2021-07-01T00:00:00Z")
+    parser.add_argument("--number-of-months", type=int, default=6)
+    parser.add_argument(
+        "--metrics-engine",
+        type=MetricsEngine,
+        choices=list(MetricsEngine),
+        default=MetricsEngine.TRANSFERS,
+    )
+    parser.add_argument("--max-concurrent-reads", type=int, default=1)
+    parser.add_argument("--practice-metrics-max-workers", type=int, default=1)
+    parser.add_argument(
+        "--transfer-data-discovery",
+        type=TransferDataDiscovery,
+        choices=list(TransferDataDiscovery),
+        default=TransferDataDiscovery.DAILY,
+    )
+    parser.add_argument("--prefetch-queue-size", type=int, default=0)
+    parser.add_argument("--backfill-end-date-anchor", type=isoparse)
+    parser.add_argument("--aggregate-cache", action="store_true")
+    parsed = parser.parse_args(args)
+    config = BenchmarkConfig(
+        data_directory=parsed.data_directory,
+        seed=parsed.seed,
+        practice_count=parsed.practices,
+        sicbl_count=parsed.sicbls,
+        transfers_per_month=parsed.transfers_per_month,
+        date_anchor=parsed.date_anchor,
+        number_of_months=parsed.number_of_months,
+        metrics_engine=parsed.metrics_engine,
+        max_concurrent_reads=parsed.max_concurrent_reads,
+        practice_metrics_max_workers=parsed.practice_metrics_max_workers,
+        transfer_data_discovery=parsed.transfer_data_discovery,
+        prefetch_queue_size=parsed.prefetch_queue_size,
+        backfill_end_date_anchor=parsed.backfill_end_date_anchor,
+        aggregate_cache=parsed.aggregate_cache,
+    )
+    return config, parsed
+
+
+def main(args: Optional[List[str]] = None):
+    config, parsed = _parse_args(args)
+    benchmark = MetricsBenchmark(config)
+    benchmark.generate_transfer_data()
+    results = json.dumps(benchmark.run(), indent=2)
+    if parsed.output:
+        parsed.output.write_text(results)
+    else:
+        sys.stdout.write(results + "\n")
+
+
+if __name__ == "__main__":
+    main()
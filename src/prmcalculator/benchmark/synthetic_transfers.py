@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta
+from random import Random
+from typing import List, NamedTuple, Optional
+
+import pyarrow as pa
+
+from prmcalculator.domain.gp2gp.sla import EIGHT_DAYS_IN_SECONDS, THREE_DAYS_IN_SECONDS
+from prmcalculator.domain.gp2gp.transfer import TransferFailureReason, TransferStatus
+
+TRANSFER_PARQUET_SCHEMA = pa.schema(
+    [
+        ("conversation_id", pa.string()),
+        ("sla_duration", pa.uint64()),
+        ("requesting_practice_asid", pa.string()),
+        ("requesting_supplier", pa.string()),
+        ("sending_supplier", pa.string()),
+        ("status", pa.string()),
+        ("failure_reason", pa.string()),
+        ("final_error_codes", pa.list_(pa.int64())),
+        ("date_requested", pa.timestamp("us", tz="UTC")),
+        ("last_sender_message_timestamp", pa.timestamp("us", tz="UTC")),
+        ("requesting_practice_name", pa.string()),
+        ("requesting_practice_ods_code", pa.string()),
+        ("requesting_practice_sicbl_name", pa.string()),
+        ("requesting_practice_sicbl_ods_code", pa.string()),
+    ]
+)
+
+_SUPPLIERS = ["EMIS", "SystmOne", "Vision"]
+_SECONDS_IN_A_DAY = 86400
+_MONTHS_IN_A_YEAR = 12
+_DAYS_IN_A_YEAR = 365
+_UNKNOWN_PRACTICE_RATE = 0.001
+
+
+class _SyntheticPractice(NamedTuple):
+    asid: str
+    supplier: str
+    ods_code: Optional[str]
+    name: str
+    sicbl_ods_code: str
+    sicbl_name: str
+
+
+class _SyntheticOutcome(NamedTuple):
+    status: TransferStatus
+    failure_reason: Optional[TransferFailureReason]
+    min_sla_seconds: Optional[int]
+    max_sla_seconds: Optional[int]
+    final_error_codes: List[int]
+
+
+_OUTCOME_MIX = [
+    (
+        0.70,
+        _SyntheticOutcome(TransferStatus.INTEGRATED_ON_TIME, None, 0, THREE_DAYS_IN_SECONDS, []),
+    ),
+    (
+        0.08,
+        _SyntheticOutcome(
+            TransferStatus.INTEGRATED_ON_TIME,
+            None,
+            THREE_DAYS_IN_SECONDS + 1,
+            EIGHT_DAYS_IN_SECONDS,
+            [],
+        ),
+    ),
+    (
+        0.04,
+        _SyntheticOutcome(
+            TransferStatus.PROCESS_FAILURE,
+            TransferFailureReason.INTEGRATED_LATE,
+            EIGHT_DAYS_IN_SECONDS + 1,
+            EIGHT_DAYS_IN_SECONDS * 4,
+            [],
+        ),
+    ),
+    (
+        0.06,
+        _SyntheticOutcome(
+            TransferStatus.PROCESS_FAILURE,
+            TransferFailureReason.TRANSFERRED_NOT_INTEGRATED,
+            None,
+            None,
+            [],
+        ),
+    ),
+    (
+        0.04,
+        _SyntheticOutcome(
+            TransferStatus.TECHNICAL_FAILURE, TransferFailureReason.FINAL_ERROR, None, None, [30]
+        ),
+    ),
+    (
+        0.02,
+        _SyntheticOutcome(
+            TransferStatus.TECHNICAL_FAILURE,
+            TransferFailureReason.CORE_EHR_NOT_SENT,
+            None,
+            None,
+            [],
+        ),
+    ),
+    (
+        0.02,
+        _SyntheticOutcome(
+            TransferStatus.TECHNICAL_FAILURE,
+            TransferFailureReason.REQUEST_NOT_ACKNOWLEDGED,
+            None,
+            None,
+            [],
+        ),
+    ),
+    (
+        0.02,
+        _SyntheticOutcome(
+            TransferStatus.TECHNICAL_FAILURE, TransferFailureReason.COPC_NOT_SENT, None, None, []
+        ),
+    ),
+    (
+        0.01,
+        _SyntheticOutcome(
+            TransferStatus.UNCLASSIFIED_FAILURE,
+            TransferFailureReason.AMBIGUOUS_COPCS,
+            None,
+            None,
+            [],
+        ),
+    ),
+    (
+        0.01,
+        _SyntheticOutcome(
+            TransferStatus.UNCLASSIFIED_FAILURE,
+            TransferFailureReason.TRANSFERRED_NOT_INTEGRATED_WITH_ERROR,
+            None,
+            None,
+            [99],
+        ),
+    ),
+]
+
+
+def _synthetic_practices(random: Random, practice_count: int, sicbl_count: int):
+    return [
+        _SyntheticPractice(
+            asid=f"{random.randrange(10**12):012d}",
+            supplier=random.choice(_SUPPLIERS),
+            ods_code=f"P{number:05d}",
+            name=f"Practice {number}",
+            sicbl_ods_code=f"{number % sicbl_count:03d}",
+            sicbl_name=f"Sub ICB Location {number % sicbl_count}",
+        )
+        for number in range(practice_count)
+    ]
+
+
+class SyntheticTransferGenerator:
+    def __init__(
+        self,
+        seed: int,
+        practice_count: int = 7000,
+        sicbl_count: int = 200,
+        transfers_per_month: int = 2000000,
+    ):
+        self._seed = seed
+        random = Random(seed)
+        self._practices = _synthetic_practices(random, practice_count, sicbl_count)
+        self._practice_weights = [random.paretovariate(1.5) for _ in self._practices]
+        self._unknown_practice = self._practices[0]._replace(ods_code=None, name="Unknown")
+        self._transfers_per_day = transfers_per_month * _MONTHS_IN_A_YEAR // _DAYS_IN_A_YEAR
+
+    @property
+    def transfers_per_day(self) -> int:
+        return self._transfers_per_day
+
+    def _pick_practices(self, random: Random) -> List[_SyntheticPractice]:
+        practices = random.choices(
+            self._practices, weights=self._practice_weights, k=self._transfers_per_day
+        )
+        return [
+            self._unknown_practice if random.random() < _UNKNOWN_PRACTICE_RATE else practice
+            for practice in practices
+        ]
+
+    def _pick_outcomes(self, random: Random) -> List[_SyntheticOutcome]:
+        weights, outcomes = zip(*_OUTCOME_MIX)
+        return random.choices(outcomes, weights=weights, k=self._transfers_per_day)
+
+    @staticmethod
+    def _sla_seconds(random: Random, outcome: _SyntheticOutcome) -> Optional[int]:
+        if outcome.min_sla_seconds is None or outcome.max_sla_seconds is None:
+            return None
+        return random.randint(outcome.min_sla_seconds, outcome.max_sla_seconds)
+
+    def daily_transfer_table(self, day: datetime) -> pa.Table:
+        random = Random(f"{self._seed}-{day.date().isoformat()}")
+        practices = self._pick_practices(random)
+        outcomes = self._pick_outcomes(random)
+        dates_requested = [
+            day + timedelta(seconds=random.randrange(_SECONDS_IN_A_DAY))
+            for _ in range(self._transfers_per_day)
+        ]
+        return pa.table(
+            {
+                "conversation_id": [
+                    f"{random.getrandbits(128):032x}" for _ in range(self._transfers_per_day)
+                ],
+                "sla_duration": [self._sla_seconds(random, outcome) for outcome in outcomes],
+                "requesting_practice_asid": [practice.asid for practice in practices],
+                "requesting_supplier": [practice.supplier for practice in practices],
+                "sending_supplier": random.choices(_SUPPLIERS, k=self._transfers_per_day),
+                "status": [outcome.status.value for outcome in outcomes],
+                "failure_reason": [
+                    outcome.failure_reason.value if outcome.failure_reason else None
+                    for outcome in outcomes
+                ],
+                "final_error_codes": [outcome.final_error_codes for outcome in outcomes],
+                "date_requested": dates_requested,
+                "last_sender_message_timestamp": [
+                    date_requested + timedelta(minutes=random.randint(1, 60))
+                    for date_requested in dates_requested
+                ],
+                "requesting_practice_name": [practice.name for practice in practices],
+                "requesting_practice_ods_code": [practice.ods_code for practice in practices],
+                "requesting_practice_sicbl_name": [practice.sicbl_name for practice in practices],
+                "requesting_practice_sicbl_ods_code": [
+                    practice.sicbl_ods_code for practice in practices
+                ],
+            },
+            schema=TRANSFER_PARQUET_SCHEMA,
+        )
@@ -14,7 +14,10 @@ class SlaBand(Enum):
 
 
 def assign_to_sla_band(sla_duration: timedelta) -> SlaBand:
-    sla_duration_in_seconds = sla_duration.total_seconds()
+    return assign_seconds_to_sla_band(sla_duration.total_seconds())
+
+
+def assign_seconds_to_sla_band(sla_duration_in_seconds: float) -> SlaBand:
     if sla_duration_in_seconds <= THREE_DAYS_IN_SECONDS:
         return SlaBand.WITHIN_3_DAYS
     elif sla_duration_in_seconds <= EIGHT_DAYS_IN_SECONDS:
@@ -29,8 +32,10 @@ class SlaCounter:
 
     def increment(self, duration: Optional[timedelta]):
         if duration is not None:
-            sla_band = assign_to_sla_band(duration)
-            self._counts[sla_band] += 1
+            self.add(assign_to_sla_band(duration))
+
+    def add(self, sla_band: SlaBand, count: int = 1):
+        self._counts[sla_band] += count
 
     def total(self) -> int:
         return sum(self._counts.values())
@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, NamedTuple, Optional
+from typing import Iterable, List, NamedTuple, Optional, Tuple
 
 import pyarrow as pa
-from dateutil.tz import UTC
+import pyarrow.compute as pc
 
 from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.utils.date_converter import (
+    EPOCH,
+    from_epoch_microseconds,
+    utc_epoch_microseconds,
+)
 
 
 class UnexpectedTransferOutcome(Exception):
@@ -49,6 +54,22 @@ class PracticeDetails:
     sicbl_name: str
 
 
+TRANSFER_COLUMNS = [
+    "conversation_id",
+    "sla_duration",
+    "requesting_practice_asid",
+    "requesting_supplier",
+    "requesting_practice_ods_code",
+    "requesting_practice_name",
+    "requesting_practice_sicbl_ods_code",
+    "requesting_practice_sicbl_name",
+    "status",
+    "failure_reason",
+    "date_requested",
+    "last_sender_message_timestamp",
+]
+
+
 class Transfer(NamedTuple):
     conversation_id: str
     sla_duration: Optional[timedelta]
@@ -59,7 +80,7 @@ class Transfer(NamedTuple):
 
 
 def filter_transfers_by_date_requested(
-    transfers: List[Transfer], reporting_window: ReportingWindow
+    transfers: Iterable[Transfer], reporting_window: ReportingWindow
 ) -> List[Transfer]:
     return [
         transfer
@@ -95,8 +116,45 @@ def _map_transfer_status(status: str) -> TransferStatus:
         raise UnexpectedTransferOutcome(f"Unexpected Status: {status} - cannot be mapped.")
 
 
+def map_transfer_outcome(status: str, failure_reason: Optional[str]) -> TransferOutcome:
+    return TransferOutcome(
+        status=_map_transfer_status(status),
+        failure_reason=_map_transfer_failure_reason(failure_reason) if failure_reason else None,
+    )
+
+
+def _dictionary_codes(column: pa.ChunkedArray) -> Tuple[list, pa.Array]:
+    if not pa.types.is_dictionary(column.type):
+        column = pc.dictionary_encode(column)
+    encoded = column.unify_dictionaries().combine_chunks()
+    values = encoded.dictionary.to_pylist()
+    codes = pc.fill_null(encoded.indices.cast(pa.int32()), len(values))
+    return values + [None], codes
+
+
+def _map_transfer_outcomes(table: pa.Table) -> List[TransferOutcome]:
+    statuses, status_codes = _dictionary_codes(table["status"])
+    failure_reasons, failure_reason_codes = _dictionary_codes(table["failure_reason"])
+    outcome_codes = pc.add(pc.multiply(status_codes, len(failure_reasons)), failure_reason_codes)
+
+    outcomes = {}
+    for code in pc.unique(outcome_codes).to_pylist():
+        status_code, failure_reason_code = divmod(code, len(failure_reasons))
+        outcomes[code] = map_transfer_outcome(
+            statuses[status_code], failure_reasons[failure_reason_code]
+        )
+    return [outcomes[code] for code in outcome_codes.to_pylist()]
+
+
 def convert_table_to_transfers(table: pa.Table) -> List[Transfer]:
-    transfer_dict = table.to_pydict()
+    outcomes = _map_transfer_outcomes(table)
+    transfer_dict = table.drop(
+        ["status", "failure_reason", "date_requested", "last_sender_message_timestamp"]
+    ).to_pydict()
+    transfer_dict["date_requested"] = utc_epoch_microseconds(table["date_requested"])
+    transfer_dict["last_sender_message_timestamp"] = utc_epoch_microseconds(
+        table["last_sender_message_timestamp"]
+    )
 
     transfers = _convert_pydict_to_list_of_dictionaries(transfer_dict)
     return [
@@ -111,16 +169,11 @@ def convert_table_to_transfers(table: pa.Table) -> List[Transfer]:
                 sicbl_ods_code=transfer["requesting_practice_sicbl_ods_code"],
                 sicbl_name=transfer["requesting_practice_sicbl_name"],
             ),
-            outcome=TransferOutcome(
-                status=_map_transfer_status(transfer["status"]),
-                failure_reason=_map_transfer_failure_reason(transfer["failure_reason"])
-                if transfer["failure_reason"]
-                else None,
+            outcome=outcome,
+            date_requested=EPOCH + timedelta(microseconds=transfer["date_requested"]),
+            last_sender_message_timestamp=from_epoch_microseconds(
+                transfer["last_sender_message_timestamp"]
             ),
-            date_requested=transfer["date_requested"].astimezone(UTC),
-            last_sender_message_timestamp=transfer["last_sender_message_timestamp"].astimezone(UTC)
-            if transfer["last_sender_message_timestamp"]
-            else None,
         )
-        for transfer in transfers
+        for transfer, outcome in zip(transfers, outcomes)
     ]
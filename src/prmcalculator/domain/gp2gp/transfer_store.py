@@ -0,0 +1,289 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import pyarrow as pa
+
+from prmcalculator.domain.gp2gp.sla import SlaBand, assign_seconds_to_sla_band
+from prmcalculator.domain.gp2gp.transfer import (
+    PracticeDetails,
+    Transfer,
+    TransferOutcome,
+    map_transfer_outcome,
+)
+from prmcalculator.domain.reporting_window import ReportingWindow, YearMonth
+from prmcalculator.utils.date_converter import (
+    EPOCH,
+    to_epoch_microseconds,
+    utc_epoch_microseconds,
+    year_month_of_epoch_microseconds,
+)
+
+_MISSING_SECONDS = -(2**31)
+_MISSING_MICROSECONDS = -(2**63)
+
+_PRACTICE_COLUMNS = [
+    "requesting_practice_asid",
+    "requesting_supplier",
+    "requesting_practice_ods_code",
+    "requesting_practice_name",
+    "requesting_practice_sicbl_ods_code",
+    "requesting_practice_sicbl_name",
+]
+_OUTCOME_COLUMNS = ["status", "failure_reason"]
+
+Value = TypeVar("Value")
+
+
+class _InternTable(Generic[Value]):
+    def __init__(self):
+        self._values: List[Value] = []
+        self._codes: Dict[Value, int] = {}
+
+    def _append(self, value: Value) -> int:
+        self._values.append(value)
+        return len(self._values) - 1
+
+    def code(self, value: Value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = self._append(value)
+        return code
+
+    def codes(self, keys: Iterable[tuple], build: Callable[..., Value]) -> Iterator[int]:
+        codes_by_key: Dict[tuple, int] = {}
+        for key in keys:
+            code = codes_by_key.get(key)
+            if code is None:
+                code = codes_by_key[key] = self.code(build(*key))
+            yield code
+
+    def __getitem__(self, code: int) -> Value:
+        return self._values[code]
+
+
+def _seconds(duration: Optional[timedelta]) -> int:
+    return _MISSING_SECONDS if duration is None else int(duration.total_seconds())
+
+
+def _sla_band(seconds: int) -> Optional[SlaBand]:
+    return None if seconds == _MISSING_SECONDS else assign_seconds_to_sla_band(seconds)
+
+
+def _duration(seconds: int) -> Optional[timedelta]:
+    return None if seconds == _MISSING_SECONDS else timedelta(seconds=seconds)
+
+
+def _microseconds(a_datetime: Optional[datetime]) -> int:
+    if a_datetime is None:
+        return _MISSING_MICROSECONDS
+    return to_epoch_microseconds(a_datetime)
+
+
+def _datetime(microseconds: int) -> Optional[datetime]:
+    if microseconds == _MISSING_MICROSECONDS:
+        return None
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+def _epoch_microseconds(column: pa.ChunkedArray) -> List[int]:
+    return [
+        _MISSING_MICROSECONDS if value is None else value
+        for value in utc_epoch_microseconds(column)
+    ]
+
+
+def _select(values: array, indices: List[int]) -> array:
+    return array(values.typecode, map(values.__getitem__, indices))
+
+
+class _PackedStrings:
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("q", [0])
+
+    def append(self, value: str):
+        self._append_encoded(value.encode("utf8"))
+
+    def _append_encoded(self, encoded: Union[bytes, bytearray]):
+        self._data += encoded
+        self._offsets.append(len(self._data))
+
+    def extend(self, values: Iterable[str]):
+        for value in values:
+            self.append(value)
+
+    def _encoded(self, index: int) -> bytearray:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._data[start:end]
+
+    def __getitem__(self, index: int) -> str:
+        return self._encoded(index).decode("utf8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def select(self, indices: List[int]) -> "_PackedStrings":
+        selected = _PackedStrings()
+        for index in indices:
+            selected._append_encoded(self._encoded(index))
+        return selected
+
+
+class TransferStore(Sequence[Transfer]):
+    def __init__(self):
+        self._practices: _InternTable[PracticeDetails] = _InternTable()
+        self._outcomes: _InternTable[TransferOutcome] = _InternTable()
+        self._conversation_ids = _PackedStrings()
+        self._practice_codes = array("i")
+        self._outcome_codes = array("i")
+        self._sla_seconds = array("i")
+        self._date_requested = array("q")
+        self._last_sender_message_timestamps = array("q")
+
+    @classmethod
+    def from_transfers(cls, transfers: Iterable[Transfer]) -> "TransferStore":
+        store = cls()
+        store.extend(transfers)
+        return store
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "TransferStore":
+        store = cls()
+        store.extend_table(table)
+        return store
+
+    def append(self, transfer: Transfer):
+        self._conversation_ids.append(transfer.conversation_id)
+        self._practice_codes.append(self._practices.code(transfer.requesting_practice))
+        self._outcome_codes.append(self._outcomes.code(transfer.outcome))
+        self._sla_seconds.append(_seconds(transfer.sla_duration))
+        self._date_requested.append(_microseconds(transfer.date_requested))
+        self._last_sender_message_timestamps.append(
+            _microseconds(transfer.last_sender_message_timestamp)
+        )
+
+    def extend(self, transfers: Iterable[Transfer]):
+        for transfer in transfers:
+            self.append(transfer)
+
+    def extend_table(self, table: pa.Table):
+        columns = table.select(_PRACTICE_COLUMNS + _OUTCOME_COLUMNS).to_pydict()
+        self._conversation_ids.extend(table["conversation_id"].to_pylist())
+        self._practice_codes.extend(
+            self._practices.codes(
+                zip(*[columns[name] for name in _PRACTICE_COLUMNS]), PracticeDetails
+            )
+        )
+        self._outcome_codes.extend(
+            self._outcomes.codes(
+                zip(*[columns[name] for name in _OUTCOME_COLUMNS]), map_transfer_outcome
+            )
+        )
+        self._sla_seconds.extend(
+            _MISSING_SECONDS if seconds is None else seconds
+            for seconds in table["sla_duration"].to_pylist()
+        )
+        self._date_requested.extend(_epoch_microseconds(table["date_requested"]))
+        self._last_sender_message_timestamps.extend(
+            _epoch_microseconds(table["last_sender_message_timestamp"])
+        )
+
+    def _transfer_at(self, index: int) -> Transfer:
+        return Transfer(
+            conversation_id=self._conversation_ids[index],
+            sla_duration=_duration(self._sla_seconds[index]),
+            requesting_practice=self._practices[self._practice_codes[index]],
+            outcome=self._outcomes[self._outcome_codes[index]],
+            date_requested=EPOCH + timedelta(microseconds=self._date_requested[index]),
+            last_sender_message_timestamp=_datetime(self._last_sender_message_timestamps[index]),
+        )
+
+    def select(self, indices: Iterable[int]) -> "TransferStore":
+        selected_indices = list(indices)
+        store = TransferStore()
+        store._practices = self._practices
+        store._outcomes = self._outcomes
+        store._conversation_ids = self._conversation_ids.select(selected_indices)
+        store._practice_codes = _select(self._practice_codes, selected_indices)
+        store._outcome_codes = _select(self._outcome_codes, selected_indices)
+        store._sla_seconds = _select(self._sla_seconds, selected_indices)
+        store._date_requested = _select(self._date_requested, selected_indices)
+        store._last_sender_message_timestamps = _select(
+            self._last_sender_message_timestamps, selected_indices
+        )
+        return store
+
+    @overload
+    def __getitem__(self, index: int) -> Transfer:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TransferStore":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transfer, "TransferStore"]:
+        if isinstance(index, slice):
+            return self.select(range(len(self))[index])
+        return self._transfer_at(range(len(self))[index])
+
+    def __len__(self) -> int:
+        return len(self._conversation_ids)
+
+    def __iter__(self) -> Iterator[Transfer]:
+        return (self._transfer_at(index) for index in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TransferStore) and list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def outcome_counts(self) -> Counter[TransferOutcome]:
+        counts: Counter[TransferOutcome] = Counter()
+        for code, count in Counter(self._outcome_codes).items():
+            counts[self._outcomes[code]] += count
+        return counts
+
+    def outcome_sla_band_counts(self) -> Counter[Tuple[TransferOutcome, Optional[SlaBand]]]:
+        counts: Counter[Tuple[TransferOutcome, Optional[SlaBand]]] = Counter()
+        for (code, seconds), count in Counter(zip(self._outcome_codes, self._sla_seconds)).items():
+            counts[(self._outcomes[code], _sla_band(seconds))] += count
+        return counts
+
+    def group_by_practice_ods_code(self) -> Dict[Optional[str], "TransferStore"]:
+        indices_by_ods_code: Dict[Optional[str], List[int]] = {}
+        for index, practice_code in enumerate(self._practice_codes):
+            ods_code = self._practices[practice_code].ods_code
+            indices_by_ods_code.setdefault(ods_code, []).append(index)
+        return {ods_code: self.select(indices) for ods_code, indices in indices_by_ods_code.items()}
+
+    def group_by_month_requested(self) -> Dict[YearMonth, "TransferStore"]:
+        indices_by_month: Dict[YearMonth, List[int]] = {}
+        for index, date_requested in enumerate(self._date_requested):
+            month = year_month_of_epoch_microseconds(date_requested)
+            indices_by_month.setdefault(month, []).append(index)
+        return {month: self.select(indices) for month, indices in indices_by_month.items()}
+
+    def requested_in_last_month(self, reporting_window: ReportingWindow) -> "TransferStore":
+        return self.select(
+            index
+            for index, date_requested in enumerate(self._date_requested)
+            if reporting_window.last_month_contains_epoch_microseconds(date_requested)
+        )
+
+    def latest_transfer(self) -> Transfer:
+        return self[max(range(len(self)), key=self._date_requested.__getitem__)]
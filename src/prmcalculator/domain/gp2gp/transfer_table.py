@@ -0,0 +1,119 @@
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from prmcalculator.domain.gp2gp.sla import EIGHT_DAYS_IN_SECONDS, THREE_DAYS_IN_SECONDS, SlaBand
+from prmcalculator.domain.gp2gp.transfer import (
+    Transfer,
+    TransferOutcome,
+    convert_table_to_transfers,
+    map_transfer_outcome,
+)
+from prmcalculator.domain.reporting_window import YearMonth
+
+ODS_CODE_COLUMN = "requesting_practice_ods_code"
+YEAR_REQUESTED_COLUMN = "year_requested"
+MONTH_REQUESTED_COLUMN = "month_requested"
+
+_SLA_BAND_COLUMN = "sla_band"
+_OUTCOME_COLUMNS = ["status", "failure_reason", _SLA_BAND_COLUMN]
+_COUNT_COLUMN = "status_count"
+
+OutcomeCounts = Counter[Tuple[TransferOutcome, Optional[SlaBand]]]
+
+
+def _sla_band_codes(sla_duration: pa.ChunkedArray) -> pa.ChunkedArray:
+    return pc.if_else(
+        pc.less_equal(sla_duration, THREE_DAYS_IN_SECONDS),
+        SlaBand.WITHIN_3_DAYS.value,
+        pc.if_else(
+            pc.less_equal(sla_duration, EIGHT_DAYS_IN_SECONDS),
+            SlaBand.WITHIN_8_DAYS.value,
+            SlaBand.BEYOND_8_DAYS.value,
+        ),
+    )
+
+
+def _date_requested_in_utc(table: pa.Table) -> pa.ChunkedArray:
+    # Timestamps are stored as UTC instants, so this only relabels the time zone,
+    # which avoids depending on how the writer spelt it (e.g. "utc").
+    date_requested = table["date_requested"]
+    return date_requested.cast(pa.timestamp(date_requested.type.unit, tz="UTC"))
+
+
+def with_month_requested_columns(table: pa.Table) -> pa.Table:
+    date_requested = _date_requested_in_utc(table)
+    return table.append_column(YEAR_REQUESTED_COLUMN, pc.year(date_requested)).append_column(
+        MONTH_REQUESTED_COLUMN, pc.month(date_requested)
+    )
+
+
+def filter_transfer_table_by_month_requested(table: pa.Table, year_month: YearMonth) -> pa.Table:
+    year, month = year_month
+    date_requested = _date_requested_in_utc(table)
+    return table.filter(
+        pc.and_(
+            pc.equal(pc.year(date_requested), year),
+            pc.equal(pc.month(date_requested), month),
+        )
+    )
+
+
+def split_transfer_table_by_known_practice(table: pa.Table) -> Tuple[pa.Table, pa.Table]:
+    ods_code_is_known = pc.is_valid(table[ODS_CODE_COLUMN])
+    return table.filter(ods_code_is_known), table.filter(pc.invert(ods_code_is_known))
+
+
+class _OutcomeMapper:
+    def __init__(self):
+        self._outcomes: Dict[Tuple[str, Optional[str]], TransferOutcome] = {}
+
+    def map(self, status: str, failure_reason: Optional[str]) -> TransferOutcome:
+        key = (status, failure_reason)
+        if key not in self._outcomes:
+            self._outcomes[key] = map_transfer_outcome(status, failure_reason)
+        return self._outcomes[key]
+
+
+def count_transfers_by_outcome(table: pa.Table, keys: List[str]) -> Dict[tuple, OutcomeCounts]:
+    table_with_sla_bands = table.append_column(
+        _SLA_BAND_COLUMN, _sla_band_codes(table["sla_duration"])
+    )
+    grouped_counts = table_with_sla_bands.group_by(keys + _OUTCOME_COLUMNS).aggregate(
+        [("status", "count", pc.CountOptions(mode="all"))]
+    )
+
+    outcome_mapper = _OutcomeMapper()
+    counts: Dict[tuple, OutcomeCounts] = defaultdict(Counter)
+    for row in grouped_counts.to_pylist():
+        outcome = outcome_mapper.map(row["status"], row["failure_reason"])
+        sla_band = SlaBand(row[_SLA_BAND_COLUMN]) if row[_SLA_BAND_COLUMN] is not None else None
+        counts[tuple(row[key] for key in keys)][(outcome, sla_band)] += row[_COUNT_COLUMN]
+    return counts
+
+
+def _first_row_of_each_practice(sorted_ods_codes: pa.Array) -> pa.Array:
+    is_new_practice = pc.not_equal(sorted_ods_codes[1:], sorted_ods_codes[:-1])
+    return pa.concat_arrays([pa.array([True]), is_new_practice])
+
+
+def latest_transfers_by_practice(known_practice_table: pa.Table) -> Dict[str, Transfer]:
+    if known_practice_table.num_rows == 0:
+        return {}
+
+    # sort_indices is stable, so among a practice's most recent transfers the one
+    # appearing first in the table is chosen, as TransfersService does.
+    sorted_indices = pc.sort_indices(
+        known_practice_table,
+        sort_keys=[(ODS_CODE_COLUMN, "ascending"), ("date_requested", "descending")],
+    )
+    sorted_ods_codes = known_practice_table[ODS_CODE_COLUMN].take(sorted_indices).combine_chunks()
+    latest_indices = pc.filter(sorted_indices, _first_row_of_each_practice(sorted_ods_codes))
+    latest_transfers = convert_table_to_transfers(known_practice_table.take(latest_indices))
+    return {transfer.requesting_practice.ods_code: transfer for transfer in latest_transfers}
+
+
+def practice_ods_codes_in_order_of_appearance(known_practice_table: pa.Table) -> List[str]:
+    return pc.unique(known_practice_table[ODS_CODE_COLUMN]).to_pylist()
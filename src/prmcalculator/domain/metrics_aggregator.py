@@ -0,0 +1,219 @@
+from collections import Counter, defaultdict
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+from dateutil.parser import isoparse
+from dateutil.tz import UTC
+
+from prmcalculator.domain.gp2gp.sla import SlaBand, assign_to_sla_band
+from prmcalculator.domain.gp2gp.transfer import (
+    PracticeDetails,
+    Transfer,
+    TransferOutcome,
+    convert_table_to_transfers,
+    map_transfer_outcome,
+)
+from prmcalculator.domain.gp2gp.transfer_table import (
+    MONTH_REQUESTED_COLUMN,
+    ODS_CODE_COLUMN,
+    YEAR_REQUESTED_COLUMN,
+    OutcomeCounts,
+    count_transfers_by_outcome,
+    latest_transfers_by_practice,
+    practice_ods_codes_in_order_of_appearance,
+    split_transfer_table_by_known_practice,
+    with_month_requested_columns,
+)
+from prmcalculator.domain.national.calculate_national_metrics_month import NationalMetricsMonth
+from prmcalculator.domain.practice.practice_transfer_metrics import PracticeTransferMetrics
+from prmcalculator.domain.practice.transfer_metrics import TransferMetrics
+from prmcalculator.domain.practice.transfer_service import ODSCode
+from prmcalculator.domain.reporting_window import YearMonth
+
+
+class MetricsAggregator:
+    def __init__(self):
+        self._national_counts: Dict[YearMonth, Counter[TransferOutcome]] = defaultdict(Counter)
+        self._practice_counts: Dict[ODSCode, Dict[YearMonth, OutcomeCounts]] = {}
+        self._latest_transfers: Dict[ODSCode, Transfer] = {}
+        self._unknown_practice_transfers: List[Transfer] = []
+
+    def add_transfers(self, transfers: Iterable[Transfer]):
+        for transfer in transfers:
+            self._add_transfer(transfer)
+
+    def _add_transfer(self, transfer: Transfer):
+        ods_code = transfer.requesting_practice.ods_code
+        month = (transfer.date_requested.year, transfer.date_requested.month)
+        sla_band = (
+            assign_to_sla_band(transfer.sla_duration) if transfer.sla_duration is not None else None
+        )
+
+        self._national_counts[month][transfer.outcome] += 1
+        if ods_code is None:
+            self._unknown_practice_transfers.append(transfer)
+            return
+        self._practice_month_counts(ods_code, month)[(transfer.outcome, sla_band)] += 1
+        self._observe_practice_transfer(transfer)
+
+    def _practice_month_counts(self, ods_code: ODSCode, month: YearMonth) -> OutcomeCounts:
+        return self._practice_counts.setdefault(ods_code, {}).setdefault(month, Counter())
+
+    def _observe_practice_transfer(self, transfer: Transfer):
+        ods_code = transfer.requesting_practice.ods_code
+        latest_transfer = self._latest_transfers.get(ods_code)
+        if latest_transfer is None or transfer.date_requested > latest_transfer.date_requested:
+            self._latest_transfers[ods_code] = transfer
+
+    def add_transfer_table(self, transfer_table: pa.Table):
+        known_practice_table, unknown_practice_table = split_transfer_table_by_known_practice(
+            transfer_table
+        )
+        self.add_transfers(convert_table_to_transfers(unknown_practice_table))
+
+        counts_by_practice_month = count_transfers_by_outcome(
+            with_month_requested_columns(known_practice_table),
+            keys=[ODS_CODE_COLUMN, YEAR_REQUESTED_COLUMN, MONTH_REQUESTED_COLUMN],
+        )
+        for (ods_code, year, month), counts in counts_by_practice_month.items():
+            self._add_practice_counts(ods_code, (year, month), counts)
+
+        latest_transfers = latest_transfers_by_practice(known_practice_table)
+        for ods_code in practice_ods_codes_in_order_of_appearance(known_practice_table):
+            self._observe_practice_transfer(latest_transfers[ods_code])
+
+    def _add_practice_counts(self, ods_code: ODSCode, month: YearMonth, counts: OutcomeCounts):
+        self._practice_month_counts(ods_code, month).update(counts)
+        for (outcome, _), count in counts.items():
+            self._national_counts[month][outcome] += count
+
+    def merge(self, other: "MetricsAggregator"):
+        for month, national_counts in other._national_counts.items():
+            self._national_counts[month].update(national_counts)
+        for ods_code, practice_counts in other._practice_counts.items():
+            self._merge_practice_counts(ods_code, practice_counts)
+        for transfer in other._latest_transfers.values():
+            self._observe_practice_transfer(transfer)
+        self._unknown_practice_transfers.extend(other._unknown_practice_transfers)
+
+    def _merge_practice_counts(
+        self, ods_code: ODSCode, counts_by_month: Dict[YearMonth, OutcomeCounts]
+    ):
+        for month, counts in counts_by_month.items():
+            self._practice_month_counts(ods_code, month).update(counts)
+
+    def national_metrics_month(self, year_month: YearMonth) -> NationalMetricsMonth:
+        year, month = year_month
+        return NationalMetricsMonth.from_counts(
+            counts_by_outcome=self._national_counts.get(year_month, Counter()),
+            year=year,
+            month=month,
+        )
+
+    @property
+    def unknown_practice_transfers(self) -> List[Transfer]:
+        return self._unknown_practice_transfers
+
+    @property
+    def latest_practice_transfers(self) -> List[Transfer]:
+        return list(self._latest_transfers.values())
+
+    def practice_transfer_metrics(self, latest_transfer: Transfer) -> PracticeTransferMetrics:
+        practice = latest_transfer.requesting_practice
+        return PracticeTransferMetrics.from_monthly_metrics(
+            ods_code=practice.ods_code,
+            name=practice.name,
+            sicbl_ods_code=practice.sicbl_ods_code,
+            sicbl_name=practice.sicbl_name,
+            metrics_by_month={
+                month: TransferMetrics.from_counts(counts)
+                for month, counts in self._practice_counts.get(practice.ods_code, {}).items()
+            },
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "national_counts": [
+                [year, month, *_outcome_to_list(outcome), count]
+                for (year, month), counts in self._national_counts.items()
+                for outcome, count in counts.items()
+            ],
+            "practice_counts": [
+                [ods_code, year, month, *_outcome_to_list(outcome), _sla_band_name(sla_band), count]
+                for ods_code, counts_by_month in self._practice_counts.items()
+                for (year, month), counts in counts_by_month.items()
+                for (outcome, sla_band), count in counts.items()
+            ],
+            "latest_transfers": [
+                _transfer_to_dict(transfer) for transfer in self._latest_transfers.values()
+            ],
+            "unknown_practice_transfers": [
+                _transfer_to_dict(transfer) for transfer in self._unknown_practice_transfers
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, aggregate: dict):
+        aggregator = cls()
+        for year, month, status, failure_reason, count in aggregate["national_counts"]:
+            outcome = map_transfer_outcome(status, failure_reason)
+            aggregator._national_counts[(year, month)][outcome] += count
+        for ods_code, year, month, status, failure_reason, sla_band, count in aggregate[
+            "practice_counts"
+        ]:
+            outcome = map_transfer_outcome(status, failure_reason)
+            counts = aggregator._practice_month_counts(ods_code, (year, month))
+            counts[(outcome, _sla_band_from_name(sla_band))] += count
+        for transfer in aggregate["latest_transfers"]:
+            aggregator._observe_practice_transfer(_transfer_from_dict(transfer))
+        aggregator._unknown_practice_transfers = [
+            _transfer_from_dict(transfer) for transfer in aggregate["unknown_practice_transfers"]
+        ]
+        return aggregator
+
+
+def _outcome_to_list(outcome: TransferOutcome) -> List[Optional[str]]:
+    failure_reason = outcome.failure_reason.value if outcome.failure_reason else None
+    return [outcome.status.value, failure_reason]
+
+
+def _sla_band_name(sla_band: Optional[SlaBand]) -> Optional[str]:
+    return sla_band.name if sla_band is not None else None
+
+
+def _sla_band_from_name(name: Optional[str]) -> Optional[SlaBand]:
+    return SlaBand[name] if name is not None else None
+
+
+def _datetime_to_str(a_datetime: Optional[datetime]) -> Optional[str]:
+    return a_datetime.isoformat() if a_datetime is not None else None
+
+
+def _datetime_from_str(a_string: Optional[str]) -> Optional[datetime]:
+    return isoparse(a_string).astimezone(UTC) if a_string is not None else None
+
+
+def _transfer_to_dict(transfer: Transfer) -> dict:
+    sla_duration = transfer.sla_duration
+    return {
+        "conversation_id": transfer.conversation_id,
+        "sla_duration": int(sla_duration.total_seconds()) if sla_duration is not None else None,
+        "requesting_practice": asdict(transfer.requesting_practice),
+        "outcome": _outcome_to_list(transfer.outcome),
+        "date_requested": _datetime_to_str(transfer.date_requested),
+        "last_sender_message_timestamp": _datetime_to_str(transfer.last_sender_message_timestamp),
+    }
+
+
+def _transfer_from_dict(transfer: dict) -> Transfer:
+    sla_duration = transfer["sla_duration"]
+    return Transfer(
+        conversation_id=transfer["conversation_id"],
+        sla_duration=timedelta(seconds=sla_duration) if sla_duration is not None else None,
+        requesting_practice=PracticeDetails(**transfer["requesting_practice"]),
+        outcome=map_transfer_outcome(*transfer["outcome"]),
+        date_requested=_datetime_from_str(transfer["date_requested"]),  # type: ignore
+        last_sender_message_timestamp=_datetime_from_str(transfer["last_sender_message_timestamp"]),
+    )
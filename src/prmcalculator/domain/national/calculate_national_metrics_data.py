@@ -1,7 +1,12 @@
 from logging import Logger, getLogger
-from typing import List
+from typing import Iterable
+
+import pyarrow as pa
 
 from prmcalculator.domain.gp2gp.transfer import Transfer, filter_transfers_by_date_requested
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
+from prmcalculator.domain.gp2gp.transfer_table import filter_transfer_table_by_month_requested
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
 from prmcalculator.domain.national.calculate_national_metrics_month import NationalMetricsMonth
 from prmcalculator.domain.national.construct_national_metrics_presentation import (
     NationalMetricsPresentation,
@@ -27,18 +32,51 @@ class NationalMetricsObservabilityProbe:
 
 
 def calculate_national_metrics_data(
-    transfers: List[Transfer],
+    transfers: Iterable[Transfer],
     reporting_window: ReportingWindow,
     observability_probe: NationalMetricsObservabilityProbe,
 ) -> NationalMetricsPresentation:
     observability_probe.record_calculating_national_metrics(reporting_window)
-    metric_month_transfers = filter_transfers_by_date_requested(transfers, reporting_window)
     (year, month) = reporting_window.last_metric_month
-    national_metrics = NationalMetricsMonth(
-        transfers=metric_month_transfers,
-        year=year,
-        month=month,
+    national_metrics = (
+        NationalMetricsMonth.from_counts(
+            transfers.requested_in_last_month(reporting_window).outcome_counts(),
+            year=year,
+            month=month,
+        )
+        if isinstance(transfers, TransferStore)
+        else NationalMetricsMonth(
+            transfers=filter_transfers_by_date_requested(transfers, reporting_window),
+            year=year,
+            month=month,
+        )
     )
     return construct_national_metrics_presentation(
         national_metrics_months=[national_metrics],
     )
+
+
+def calculate_national_metrics_data_from_aggregate(
+    aggregator: MetricsAggregator,
+    reporting_window: ReportingWindow,
+    observability_probe: NationalMetricsObservabilityProbe,
+) -> NationalMetricsPresentation:
+    observability_probe.record_calculating_national_metrics(reporting_window)
+    national_metrics = aggregator.national_metrics_month(reporting_window.last_metric_month)
+    return construct_national_metrics_presentation(
+        national_metrics_months=[national_metrics],
+    )
+
+
+def calculate_national_metrics_data_from_table(
+    transfer_table: pa.Table,
+    reporting_window: ReportingWindow,
+    observability_probe: NationalMetricsObservabilityProbe,
+) -> NationalMetricsPresentation:
+    aggregator = MetricsAggregator()
+    aggregator.add_transfer_table(
+        filter_transfer_table_by_month_requested(transfer_table, reporting_window.last_metric_month)
+    )
+    return calculate_national_metrics_data_from_aggregate(
+        aggregator, reporting_window, observability_probe
+    )
@@ -1,5 +1,5 @@
 from collections import Counter
-from typing import Iterable
+from typing import Iterable, Mapping
 
 from prmcalculator.domain.gp2gp.transfer import (
     Transfer,
@@ -29,6 +29,15 @@ class NationalMetricsMonth:
             self._counts_by_status.update([transfer.outcome.status])
             self.total += 1
 
+    @classmethod
+    def from_counts(cls, counts_by_outcome: Mapping[TransferOutcome, int], year: int, month: int):
+        national_metrics_month = cls(transfers=[], year=year, month=month)
+        for outcome, count in counts_by_outcome.items():
+            national_metrics_month._counts_by_outcome[outcome] += count
+            national_metrics_month._counts_by_status[outcome.status] += count
+            national_metrics_month.total += count
+        return national_metrics_month
+
     def integrated_on_time_total(self) -> int:
         return self._counts_by_status[TransferStatus.INTEGRATED_ON_TIME]
 
@@ -1,18 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
 from logging import Logger, getLogger
-from typing import List
+from typing import Dict, Iterable, List
 
+import pyarrow as pa
 from dateutil.tz import UTC
 
 from prmcalculator.domain.gp2gp.transfer import Transfer
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
 from prmcalculator.domain.practice.construct_practice_summary import (
     PracticeSummary,
     construct_practice_summary,
 )
 from prmcalculator.domain.practice.practice_transfer_metrics import PracticeTransferMetrics
-from prmcalculator.domain.practice.transfer_service import ODSCode, TransfersService
-from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.domain.practice.transfer_metrics import OutcomeSlaBandCounts, TransferMetrics
+from prmcalculator.domain.practice.transfer_service import ODSCode, Practice, TransfersService
+from prmcalculator.domain.reporting_window import ReportingWindow, YearMonth
 
 module_logger = getLogger(__name__)
 
@@ -66,26 +73,123 @@ class PracticeMetricsPresentation:
     sicbls: List[SICBLPresentation]
 
 
+def _construct_practice_summaries(
+    practices: List[Practice], reporting_window: ReportingWindow
+) -> List[PracticeSummary]:
+    return [
+        construct_practice_summary(
+            practice_metrics=PracticeTransferMetrics.from_group(practice),
+            reporting_window=reporting_window,
+        )
+        for practice in practices
+    ]
+
+
+@dataclass(frozen=True)
+class _PracticeMonthlyCounts:
+    ods_code: ODSCode
+    name: str
+    sicbl_ods_code: ODSCode
+    sicbl_name: str
+    counts_by_month: Dict[YearMonth, OutcomeSlaBandCounts]
+
+
+def _count_practice_transfers_by_month(
+    practice: Practice, reporting_window: ReportingWindow
+) -> _PracticeMonthlyCounts:
+    transfers = (
+        practice.transfers
+        if isinstance(practice.transfers, TransferStore)
+        else TransferStore.from_transfers(practice.transfers)
+    )
+    metric_months = set(reporting_window.metric_months)
+    return _PracticeMonthlyCounts(
+        ods_code=practice.ods_code,
+        name=practice.name,
+        sicbl_ods_code=practice.sicbl_ods_code,
+        sicbl_name=practice.sicbl_name,
+        counts_by_month={
+            month: transfers_in_month.outcome_sla_band_counts()
+            for month, transfers_in_month in transfers.group_by_month_requested().items()
+            if month in metric_months
+        },
+    )
+
+
+def _construct_practice_summaries_from_counts(
+    practices: List[_PracticeMonthlyCounts], reporting_window: ReportingWindow
+) -> List[PracticeSummary]:
+    return [
+        construct_practice_summary(
+            practice_metrics=PracticeTransferMetrics.from_monthly_metrics(
+                ods_code=practice.ods_code,
+                name=practice.name,
+                sicbl_ods_code=practice.sicbl_ods_code,
+                sicbl_name=practice.sicbl_name,
+                metrics_by_month={
+                    month: TransferMetrics.from_counts(counts)
+                    for month, counts in practice.counts_by_month.items()
+                },
+            ),
+            reporting_window=reporting_window,
+        )
+        for practice in practices
+    ]
+
+
+def _shard_practices_by_sicbl(
+    practices: List[Practice], reporting_window: ReportingWindow
+) -> List[List[_PracticeMonthlyCounts]]:
+    # Workers are sent each practice's monthly counts rather than its transfers, which share the
+    # intern tables of the whole national transfer store.
+    practices_by_sicbl: Dict[ODSCode, List[_PracticeMonthlyCounts]] = {}
+    for practice in practices:
+        practices_by_sicbl.setdefault(practice.sicbl_ods_code, []).append(
+            _count_practice_transfers_by_month(practice, reporting_window)
+        )
+    return list(practices_by_sicbl.values())
+
+
+def _construct_practice_summaries_in_parallel(
+    practices: List[Practice], reporting_window: ReportingWindow, max_workers: int
+) -> List[PracticeSummary]:
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries_by_shard = executor.map(
+            _construct_practice_summaries_from_counts,
+            _shard_practices_by_sicbl(practices, reporting_window),
+            repeat(reporting_window),
+        )
+        summaries_by_ods_code = {
+            summary.ods_code: summary for summaries in summaries_by_shard for summary in summaries
+        }
+    return [summaries_by_ods_code[practice.ods_code] for practice in practices]
+
+
 def calculate_practice_metrics(
-    transfers: List[Transfer],
+    transfers: Iterable[Transfer],
     reporting_window: ReportingWindow,
     observability_probe: PracticeMetricsObservabilityProbe,
+    max_workers: int = 1,
 ) -> PracticeMetricsPresentation:
     observability_probe.record_calculating_practice_metrics(reporting_window)
 
     transfers_service = TransfersService(
         transfers=transfers, observability_probe=observability_probe
     )
+    practices = transfers_service.grouped_practices_by_ods
+
+    # Worker processes only pay off with a CPU each, so there are never more than the host has.
+    max_workers = min(max_workers, os.cpu_count() or 1)
+    if max_workers > 1:
+        practice_summaries = _construct_practice_summaries_in_parallel(
+            practices, reporting_window, max_workers
+        )
+    else:
+        practice_summaries = _construct_practice_summaries(practices, reporting_window)
 
     return PracticeMetricsPresentation(
         generated_on=datetime.now(UTC),
-        practices=[
-            construct_practice_summary(
-                practice_metrics=PracticeTransferMetrics.from_group(practice_transfers),
-                reporting_window=reporting_window,
-            )
-            for practice_transfers in transfers_service.grouped_practices_by_ods
-        ],
+        practices=practice_summaries,
         sicbls=[
             SICBLPresentation(
                 practices=transfer_by_sicbl.practices_ods_codes,
@@ -95,3 +199,60 @@ def calculate_practice_metrics(
             for transfer_by_sicbl in transfers_service.grouped_practices_by_sicbl
         ],
     )
+
+
+def _construct_sicbl_presentations(
+    practices: List[PracticeTransferMetrics],
+) -> List[SICBLPresentation]:
+    sicbls: Dict[ODSCode, SICBLPresentation] = {}
+    for practice in practices:
+        if practice.sicbl_ods_code not in sicbls:
+            sicbls[practice.sicbl_ods_code] = SICBLPresentation(
+                ods_code=practice.sicbl_ods_code,
+                name=practice.sicbl_name,  # type: ignore
+                practices=[],
+            )
+        sicbls[practice.sicbl_ods_code].practices.append(practice.ods_code)
+    return list(sicbls.values())
+
+
+def calculate_practice_metrics_from_aggregate(
+    aggregator: MetricsAggregator,
+    reporting_window: ReportingWindow,
+    observability_probe: PracticeMetricsObservabilityProbe,
+) -> PracticeMetricsPresentation:
+    observability_probe.record_calculating_practice_metrics(reporting_window)
+
+    for transfer in aggregator.unknown_practice_transfers:
+        observability_probe.record_unknown_practice_ods_code_for_transfer(transfer)
+
+    practices = []
+    for latest_transfer in aggregator.latest_practice_transfers:
+        if latest_transfer.requesting_practice.sicbl_ods_code is None:
+            observability_probe.record_unknown_practice_sicbl_ods_code_for_transfer(latest_transfer)
+            continue
+        practices.append(aggregator.practice_transfer_metrics(latest_transfer))
+
+    return PracticeMetricsPresentation(
+        generated_on=datetime.now(UTC),
+        practices=[
+            construct_practice_summary(
+                practice_metrics=practice_metrics,
+                reporting_window=reporting_window,
+            )
+            for practice_metrics in practices
+        ],
+        sicbls=_construct_sicbl_presentations(practices),
+    )
+
+
+def calculate_practice_metrics_from_table(
+    transfer_table: pa.Table,
+    reporting_window: ReportingWindow,
+    observability_probe: PracticeMetricsObservabilityProbe,
+) -> PracticeMetricsPresentation:
+    aggregator = MetricsAggregator()
+    aggregator.add_transfer_table(transfer_table)
+    return calculate_practice_metrics_from_aggregate(
+        aggregator, reporting_window, observability_probe
+    )
@@ -0,0 +1,51 @@
+from dataclasses import fields
+from typing import Dict, List
+
+import pyarrow as pa
+
+from prmcalculator.domain.practice.calculate_practice_metrics import PracticeMetricsPresentation
+from prmcalculator.domain.practice.construct_practice_summary import RequestedTransferMetrics
+
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+PRACTICE_METRICS_SCHEMA = pa.schema(
+    [
+        ("ods_code", _DICTIONARY_STRING),
+        ("name", _DICTIONARY_STRING),
+        ("sicbl_ods_code", _DICTIONARY_STRING),
+        ("sicbl_name", _DICTIONARY_STRING),
+        ("year", pa.int16()),
+        ("month", pa.int8()),
+        ("requested_count", pa.int64()),
+        ("received_count", pa.int64()),
+        ("received_percent_of_requested", pa.float64()),
+        ("integrated_within_3_days_count", pa.int64()),
+        ("integrated_within_3_days_percent_of_received", pa.float64()),
+        ("integrated_within_8_days_count", pa.int64()),
+        ("integrated_within_8_days_percent_of_received", pa.float64()),
+        ("not_integrated_within_8_days_total", pa.int64()),
+        ("not_integrated_within_8_days_percent_of_received", pa.float64()),
+        ("failures_total_count", pa.int64()),
+        ("failures_total_percent_of_requested", pa.float64()),
+    ]
+)
+
+_REQUESTED_TRANSFER_FIELDS = [field.name for field in fields(RequestedTransferMetrics)]
+
+
+def convert_practice_metrics_to_table(presentation: PracticeMetricsPresentation) -> pa.Table:
+    columns: Dict[str, List] = {name: [] for name in PRACTICE_METRICS_SCHEMA.names}
+    for practice in presentation.practices:
+        for monthly_metrics in practice.metrics:
+            columns["ods_code"].append(practice.ods_code)
+            columns["name"].append(practice.name)
+            columns["sicbl_ods_code"].append(practice.sicbl_ods_code)
+            columns["sicbl_name"].append(practice.sicbl_name)
+            columns["year"].append(monthly_metrics.year)
+            columns["month"].append(monthly_metrics.month)
+            for name in _REQUESTED_TRANSFER_FIELDS:
+                columns[name].append(getattr(monthly_metrics.requested_transfers, name))
+
+    return pa.Table.from_pydict(columns, schema=PRACTICE_METRICS_SCHEMA).replace_schema_metadata(
+        {"generated_on": presentation.generated_on.isoformat()}
+    )
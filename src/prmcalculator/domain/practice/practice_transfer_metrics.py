@@ -1,12 +1,21 @@
 from collections import defaultdict
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
 
 from prmcalculator.domain.gp2gp.transfer import Transfer
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
 from prmcalculator.domain.practice.transfer_metrics import TransferMetrics
 from prmcalculator.domain.practice.transfer_service import ODSCode, Practice
 from prmcalculator.domain.reporting_window import MonthNumber, YearMonth, YearNumber
 
 
+def _group_by_month_requested(transfers: Iterable[Transfer]) -> Dict[YearMonth, List[Transfer]]:
+    transfers_by_month: Dict[YearMonth, List[Transfer]] = defaultdict(list)
+    for transfer in transfers:
+        date_requested_tuple = (transfer.date_requested.year, transfer.date_requested.month)
+        transfers_by_month[date_requested_tuple].append(transfer)
+    return transfers_by_month
+
+
 class PracticeTransferMetrics:
     @classmethod
     def from_group(cls, group: Practice):
@@ -30,14 +39,38 @@ class PracticeTransferMetrics:
         self._name = name
         self._sicbl_ods_code = sicbl_ods_code
         self._sicbl_name = sicbl_name
-        self._transfers_by_month: Dict[YearMonth, List[Transfer]] = defaultdict(list)
+        self._transfers_by_month: Mapping[YearMonth, Sequence[Transfer]] = (
+            transfers.group_by_month_requested()
+            if isinstance(transfers, TransferStore)
+            else _group_by_month_requested(transfers)
+        )
+        self._metrics_by_month: Dict[YearMonth, TransferMetrics] = {}
 
-        for transfer in transfers:
-            date_requested_tuple = (transfer.date_requested.year, transfer.date_requested.month)
-            self._transfers_by_month[date_requested_tuple].append(transfer)
+    @classmethod
+    def from_monthly_metrics(
+        cls,
+        ods_code: ODSCode,
+        name: str,
+        sicbl_ods_code: ODSCode,
+        sicbl_name: Optional[str],
+        metrics_by_month: Dict[YearMonth, TransferMetrics],
+    ):
+        practice_metrics = cls(
+            ods_code=ods_code,
+            name=name,
+            sicbl_ods_code=sicbl_ods_code,
+            sicbl_name=sicbl_name,
+            transfers=[],
+        )
+        practice_metrics._metrics_by_month = metrics_by_month
+        return practice_metrics
 
     def monthly_metrics(self, year: YearNumber, month: MonthNumber):
-        transfers_in_month = self._transfers_by_month[(year, month)]
+        if (year, month) in self._metrics_by_month:
+            return self._metrics_by_month[(year, month)]
+        transfers_in_month = self._transfers_by_month.get((year, month), [])
+        if isinstance(transfers_in_month, TransferStore):
+            return TransferMetrics.from_counts(transfers_in_month.outcome_sla_band_counts())
         return TransferMetrics(transfers=transfers_in_month)
 
     @property
@@ -1,7 +1,7 @@
 from collections import Counter
-from typing import Iterable, Optional
+from typing import Iterable, Mapping, Optional, Tuple
 
-from prmcalculator.domain.gp2gp.sla import SlaCounter
+from prmcalculator.domain.gp2gp.sla import SlaBand, SlaCounter
 from prmcalculator.domain.gp2gp.transfer import (
     Transfer,
     TransferFailureReason,
@@ -17,6 +17,8 @@ _INTEGRATED_LATE = TransferOutcome(
     TransferStatus.PROCESS_FAILURE, TransferFailureReason.INTEGRATED_LATE
 )
 
+OutcomeSlaBandCounts = Mapping[Tuple[TransferOutcome, Optional[SlaBand]], int]
+
 
 class TransferMetrics:
     def __init__(self, transfers: Iterable[Transfer]):
@@ -32,6 +34,20 @@ class TransferMetrics:
             if transfer.outcome.status == TransferStatus.INTEGRATED_ON_TIME:
                 self._sla_counter.increment(transfer.sla_duration)
 
+    @classmethod
+    def from_counts(cls, counts: OutcomeSlaBandCounts):
+        transfer_metrics = cls(transfers=[])
+        for (outcome, sla_band), count in counts.items():
+            transfer_metrics._add_outcome_count(outcome, sla_band, count)
+        return transfer_metrics
+
+    def _add_outcome_count(self, outcome: TransferOutcome, sla_band: Optional[SlaBand], count: int):
+        self._counts_by_outcome[outcome] += count
+        self._counts_by_status[outcome.status] += count
+        self._transfers_requested_count += count
+        if outcome.status == TransferStatus.INTEGRATED_ON_TIME and sla_band is not None:
+            self._sla_counter.add(sla_band, count)
+
     def integrated_total(self) -> int:
         return (
             self._counts_by_outcome[_INTEGRATED_LATE]
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from prmcalculator.domain.gp2gp.transfer import Transfer
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
 
 ODSCode = str
-PracticeTransfersDictByOds = Dict[ODSCode, List[Transfer]]
+PracticeTransfersDictByOds = Dict[Optional[ODSCode], TransferStore]
 
 
 @dataclass(frozen=True)
@@ -21,7 +22,7 @@ SICBLTransfersDictByOds = Dict[ODSCode, SICBL]
 class Practice:
     ods_code: ODSCode
     name: str
-    transfers: List[Transfer]
+    transfers: Sequence[Transfer]
     sicbl_ods_code: ODSCode
     sicbl_name: str
 
@@ -31,8 +32,12 @@ class PracticeTransfers:
 
 
 class TransfersService:
-    def __init__(self, transfers: List[Transfer], observability_probe):
-        self._transfers = transfers
+    def __init__(self, transfers: Iterable[Transfer], observability_probe):
+        self._transfers = (
+            transfers
+            if isinstance(transfers, TransferStore)
+            else TransferStore.from_transfers(transfers)
+        )
         self._observability_probe = observability_probe
         self._grouped_transfers_by_practice = self.group_transfers_by_practice()
         self._grouped_practices_by_sicbl = self.group_practices_by_sicbl()
@@ -40,7 +45,7 @@ class TransfersService:
     def group_transfers_by_practice(self) -> List[Practice]:
         practice_list = []
         for practice_transfers in self._group_practice_transfers_by_ods_code().values():
-            latest_transfer = self._get_latest_transfer(practice_transfers)
+            latest_transfer = practice_transfers.latest_transfer()
 
             if latest_transfer.requesting_practice.sicbl_ods_code is None:
                 self._observability_probe.record_unknown_practice_sicbl_ods_code_for_transfer(
@@ -60,29 +65,11 @@ class TransfersService:
         return practice_list
 
     def _group_practice_transfers_by_ods_code(self) -> PracticeTransfersDictByOds:
-        practice_transfers_by_ods_code: PracticeTransfersDictByOds = {}
-        for transfer in self._transfers:
-            if transfer.requesting_practice.ods_code is None:
-                self._observability_probe.record_unknown_practice_ods_code_for_transfer(transfer)
-                continue
-
-            self._add_transfer_to_ods_dictionary(practice_transfers_by_ods_code, transfer)
+        practice_transfers_by_ods_code = self._transfers.group_by_practice_ods_code()
+        for transfer in practice_transfers_by_ods_code.pop(None, TransferStore()):
+            self._observability_probe.record_unknown_practice_ods_code_for_transfer(transfer)
         return practice_transfers_by_ods_code
 
-    @staticmethod
-    def _get_latest_transfer(practice_transfers):
-        latest_transfer = practice_transfers[0]
-        for transfer in practice_transfers:
-            if transfer.date_requested > latest_transfer.date_requested:
-                latest_transfer = transfer
-        return latest_transfer
-
-    @staticmethod
-    def _add_transfer_to_ods_dictionary(practice_transfers, transfer):
-        if transfer.requesting_practice.ods_code not in practice_transfers:
-            practice_transfers[transfer.requesting_practice.ods_code] = []
-        practice_transfers[transfer.requesting_practice.ods_code].append(transfer)
-
     def group_practices_by_sicbl(self) -> List[SICBL]:
         sicbls_dict: SICBLTransfersDictByOds = {}
         for practice in self._grouped_transfers_by_practice:
@@ -6,6 +6,7 @@ from dateutil.relativedelta import relativedelta
 from prmcalculator.utils.date_converter import (
     convert_date_range_to_dates,
     get_first_day_of_month_datetime,
+    to_epoch_microseconds,
 )
 
 YearNumber = int
@@ -24,6 +25,8 @@ class ReportingWindow:
         self._dates = dates
         self._metric_months_datetimes = metric_months_datetimes
         self._latest_metric_month = metric_months_datetimes[0]
+        self._last_month_start_microseconds = to_epoch_microseconds(self._latest_metric_month)
+        self._last_month_end_microseconds = to_epoch_microseconds(date_anchor_month_start)
 
     @classmethod
     def prior_to(cls, date_anchor: datetime, number_of_months: int):
@@ -64,3 +67,8 @@ class ReportingWindow:
 
     def last_month_contains(self, time: datetime) -> bool:
         return self._latest_metric_month <= time < self._date_anchor_month_start
+
+    def last_month_contains_epoch_microseconds(self, microseconds: int) -> bool:
+        return (
+            self._last_month_start_microseconds <= microseconds < self._last_month_end_microseconds
+        )
@@ -0,0 +1,42 @@
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from prmcalculator.domain.reporting_window import ReportingWindow
+
+DailyAggregates = Dict[datetime, MetricsAggregator]
+
+
+def _merge_daily_aggregates(
+    dates: List[datetime], aggregates_by_date: DailyAggregates
+) -> MetricsAggregator:
+    aggregator = MetricsAggregator()
+    for date in dates:
+        aggregator.merge(aggregates_by_date[date])
+    return aggregator
+
+
+def _discard_dates_before_next_window(
+    pending_windows: Deque[ReportingWindow], aggregates_by_date: DailyAggregates
+):
+    first_date_needed = pending_windows[0].dates[0] if pending_windows else None
+    for date in list(aggregates_by_date):
+        if first_date_needed is None or date < first_date_needed:
+            del aggregates_by_date[date]
+
+
+def aggregate_reporting_windows(
+    reporting_windows: List[ReportingWindow],
+    daily_aggregates: Iterable[Tuple[datetime, MetricsAggregator]],
+) -> Iterator[Tuple[ReportingWindow, MetricsAggregator]]:
+    pending_windows = deque(reporting_windows)
+    aggregates_by_date: DailyAggregates = {}
+    for date, daily_aggregate in daily_aggregates:
+        aggregates_by_date[date] = daily_aggregate
+        while pending_windows and pending_windows[0].dates[-1] <= date:
+            reporting_window = pending_windows.popleft()
+            yield reporting_window, _merge_daily_aggregates(
+                reporting_window.dates, aggregates_by_date
+            )
+            _discard_dates_before_next_window(pending_windows, aggregates_by_date)
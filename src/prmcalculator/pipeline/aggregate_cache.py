@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional
+from urllib.parse import urlparse
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from prmcalculator.utils.io.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+def _write_file_atomically(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as temp_file:
+        temp_file.write(text)
+    os.replace(temp_file.name, path)
+
+
+class AggregateCache:
+    _CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, s3_data_manager: StorageBackend, cache_uri: str):
+        self._s3_manager = s3_data_manager
+        self._cache_uri = cache_uri.rstrip("/")
+        self._is_s3 = urlparse(cache_uri).scheme == "s3"
+
+    def _entry_uri(self, source_uri: str) -> str:
+        return f"{self._cache_uri}/{sha256(source_uri.encode('utf8')).hexdigest()}.json"
+
+    def _read_entry(self, entry_uri: str) -> dict:
+        if self._is_s3:
+            return self._s3_manager.read_json(entry_uri)
+        return json.loads(Path(entry_uri).read_text())
+
+    def _write_entry(self, entry_uri: str, entry: dict):
+        if self._is_s3:
+            self._s3_manager.write_json(object_uri=entry_uri, data=entry, metadata={})
+        else:
+            _write_file_atomically(Path(entry_uri), json.dumps(entry))
+
+    def _read_entry_if_valid(self, source_uri: str) -> dict:
+        try:
+            return self._read_entry(self._entry_uri(source_uri))
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, UnicodeDecodeError) as error:
+            logger.warning(
+                f"Ignoring undecodable aggregate cache entry for: {source_uri}: {error}",
+                extra={"event": "UNDECODABLE_AGGREGATE_CACHE_ENTRY", "object_uri": source_uri},
+            )
+            return {}
+
+    def get(self, source_uri: str, etag: str) -> Optional[MetricsAggregator]:
+        entry = self._read_entry_if_valid(source_uri)
+
+        if entry.get("version") != self._CACHE_FORMAT_VERSION or entry.get("etag") != etag:
+            logger.info(
+                f"Aggregate cache miss for: {source_uri}",
+                extra={"event": "AGGREGATE_CACHE_MISS", "object_uri": source_uri},
+            )
+            return None
+
+        logger.info(
+            f"Aggregate cache hit for: {source_uri}",
+            extra={"event": "AGGREGATE_CACHE_HIT", "object_uri": source_uri},
+        )
+        return MetricsAggregator.from_dict(entry["aggregate"])
+
+    def put(self, source_uri: str, etag: str, aggregator: MetricsAggregator):
+        entry = {
+            "version": self._CACHE_FORMAT_VERSION,
+            "source_uri": source_uri,
+            "etag": etag,
+            "aggregate": aggregator.to_dict(),
+        }
+        self._write_entry(self._entry_uri(source_uri), entry)
@@ -1,10 +1,13 @@
 import logging
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Optional
+from enum import Enum
+from typing import Optional, Type, TypeVar
 
 from dateutil.parser import isoparse
 
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +19,26 @@ class InvalidEnvironmentVariableValue(Exception):
     pass
 
 
+class MetricsEngine(Enum):
+    TRANSFERS = "transfers"
+    FUSED = "fused"
+    ARROW = "arrow"
+
+
+class AwsRetryMode(Enum):
+    LEGACY = "legacy"
+    STANDARD = "standard"
+    ADAPTIVE = "adaptive"
+
+
+class TransferDataDiscovery(Enum):
+    DAILY = "daily"
+    DATASET = "dataset"
+
+
+EnumType = TypeVar("EnumType", bound=Enum)
+
+
 class EnvConfig:
     def __init__(self, env_vars):
         self._env_vars = env_vars
@@ -45,6 +68,9 @@ class EnvConfig:
     def read_optional_int(self, name: str, default: int) -> int:
         return self._read_env(name, optional=True, converter=int, default=default)
 
+    def read_optional_int_or_none(self, name: str) -> Optional[int]:
+        return self._read_env(name, optional=True, converter=int)
+
     def read_optional_str(self, name: str) -> Optional[str]:
         return self._read_env(name, optional=True)
 
@@ -56,11 +82,28 @@ class EnvConfig:
             default=datetime.combine(date.today(), datetime.min.time()),
         )
 
+    def read_optional_datetime_or_none(self, name: str) -> Optional[datetime]:
+        return self._read_env(name, optional=True, converter=isoparse)
+
     def read_optional_bool(self, name: str, default: bool) -> bool:
         return self._read_env(
             name, optional=True, converter=lambda string: string.lower() == "true", default=default
         )
 
+    def read_optional_enum(
+        self, name: str, enum_type: Type[EnumType], default: EnumType
+    ) -> EnumType:
+        return self._read_env(
+            name, optional=True, converter=lambda string: enum_type(string.lower()), default=default
+        )
+
+    def read_optional_enum_or_none(
+        self, name: str, enum_type: Type[EnumType]
+    ) -> Optional[EnumType]:
+        return self._read_env(
+            name, optional=True, converter=lambda string: enum_type(string.lower())
+        )
+
 
 @dataclass
 class PipelineConfig:
@@ -72,6 +115,30 @@ class PipelineConfig:
     s3_endpoint_url: Optional[str]
     national_metrics_s3_path_param_name: str
     practice_metrics_s3_path_param_name: str
+    max_concurrent_reads: int = 1
+    metrics_engine: MetricsEngine = MetricsEngine.TRANSFERS
+    aggregate_cache_uri: Optional[str] = None
+    backfill_end_date_anchor: Optional[datetime] = None
+    practice_metrics_max_workers: int = 1
+    parquet_cache_directory: Optional[str] = None
+    parquet_cache_max_bytes: int = 10 * 1024**3
+    storage_uri: Optional[str] = None
+    transfer_data_discovery: TransferDataDiscovery = TransferDataDiscovery.DAILY
+    s3_read_max_attempts: int = 3
+    s3_read_retry_base_delay_ms: int = 100
+    s3_read_hedging: bool = False
+    s3_read_part_size_bytes: int = 0
+    s3_read_part_concurrency: int = 4
+    s3_read_footer_first: bool = False
+    s3_max_pool_connections: Optional[int] = None
+    s3_connect_timeout_seconds: int = 60
+    s3_read_timeout_seconds: int = 60
+    s3_tcp_keepalive: bool = False
+    aws_retry_mode: Optional[AwsRetryMode] = None
+    prefetch_queue_size: int = 0
+    output_content_encoding: ContentEncoding = ContentEncoding.IDENTITY
+    skip_unchanged_outputs: bool = True
+    practice_metrics_parquet: bool = False
 
     def __str__(self):
         return str(self.__dict__)
@@ -88,4 +155,46 @@ class PipelineConfig:
             s3_endpoint_url=env.read_optional_str("S3_ENDPOINT_URL"),
             national_metrics_s3_path_param_name=env.read_str("NATIONAL_METRICS_S3_PATH_PARAM_NAME"),
             practice_metrics_s3_path_param_name=env.read_str("PRACTICE_METRICS_S3_PATH_PARAM_NAME"),
+            max_concurrent_reads=env.read_optional_int("MAX_CONCURRENT_READS", default=1),
+            metrics_engine=env.read_optional_enum(
+                "METRICS_ENGINE", MetricsEngine, default=MetricsEngine.TRANSFERS
+            ),
+            aggregate_cache_uri=env.read_optional_str("AGGREGATE_CACHE_URI"),
+            backfill_end_date_anchor=env.read_optional_datetime_or_none("BACKFILL_END_DATE_ANCHOR"),
+            practice_metrics_max_workers=env.read_optional_int(
+                "PRACTICE_METRICS_MAX_WORKERS", default=1
+            ),
+            parquet_cache_directory=env.read_optional_str("PARQUET_CACHE_DIRECTORY"),
+            parquet_cache_max_bytes=env.read_optional_int(
+                "PARQUET_CACHE_MAX_BYTES", default=10 * 1024**3
+            ),
+            storage_uri=env.read_optional_str("STORAGE_URI"),
+            transfer_data_discovery=env.read_optional_enum(
+                "TRANSFER_DATA_DISCOVERY",
+                TransferDataDiscovery,
+                default=TransferDataDiscovery.DAILY,
+            ),
+            s3_read_max_attempts=env.read_optional_int("S3_READ_MAX_ATTEMPTS", default=3),
+            s3_read_retry_base_delay_ms=env.read_optional_int(
+                "S3_READ_RETRY_BASE_DELAY_MS", default=100
+            ),
+            s3_read_hedging=env.read_optional_bool("S3_READ_HEDGING", default=False),
+            s3_read_part_size_bytes=env.read_optional_int("S3_READ_PART_SIZE_BYTES", default=0),
+            s3_read_part_concurrency=env.read_optional_int("S3_READ_PART_CONCURRENCY", default=4),
+            s3_read_footer_first=env.read_optional_bool("S3_READ_FOOTER_FIRST", default=False),
+            s3_max_pool_connections=env.read_optional_int_or_none("S3_MAX_POOL_CONNECTIONS"),
+            s3_connect_timeout_seconds=env.read_optional_int(
+                "S3_CONNECT_TIMEOUT_SECONDS", default=60
+            ),
+            s3_read_timeout_seconds=env.read_optional_int("S3_READ_TIMEOUT_SECONDS", default=60),
+            s3_tcp_keepalive=env.read_optional_bool("S3_TCP_KEEPALIVE", default=False),
+            aws_retry_mode=env.read_optional_enum_or_none("AWS_RETRY_MODE", AwsRetryMode),
+            prefetch_queue_size=env.read_optional_int("PREFETCH_QUEUE_SIZE", default=0),
+            output_content_encoding=env.read_optional_enum(
+                "OUTPUT_CONTENT_ENCODING", ContentEncoding, default=ContentEncoding.IDENTITY
+            ),
+            skip_unchanged_outputs=env.read_optional_bool("SKIP_UNCHANGED_OUTPUTS", default=True),
+            practice_metrics_parquet=env.read_optional_bool(
+                "PRACTICE_METRICS_PARQUET", default=False
+            ),
         )
@@ -1,56 +1,326 @@
+import hashlib
+import json
 import logging
-from dataclasses import asdict
-from typing import Dict, List
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional
 
 import pyarrow as pa
+import pyarrow.parquet as pq
 from botocore.exceptions import ClientError
 
-from prmcalculator.domain.gp2gp.transfer import Transfer, convert_table_to_transfers
+from prmcalculator.domain.gp2gp.transfer import (
+    TRANSFER_COLUMNS,
+    Transfer,
+    convert_table_to_transfers,
+)
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
 from prmcalculator.domain.national.construct_national_metrics_presentation import (
     NationalMetricsPresentation,
 )
-from prmcalculator.utils.io.dictionary import camelize_dict
-from prmcalculator.utils.io.s3 import S3DataManager
+from prmcalculator.domain.practice.calculate_practice_metrics import PracticeMetricsPresentation
+from prmcalculator.domain.practice.practice_metrics_table import convert_practice_metrics_to_table
+from prmcalculator.pipeline.aggregate_cache import AggregateCache
+from prmcalculator.pipeline.transfer_dataset import TRANSFER_DATA_PARTITIONING, TransferDataset
+from prmcalculator.utils.concurrent_map import concurrent_map
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+from prmcalculator.utils.io.dictionary import serializer_for
+from prmcalculator.utils.io.json_stream import encode_json_chunks
+from prmcalculator.utils.io.storage import StorageBackend
+from prmcalculator.utils.staged_pipeline import Stage, StagedPipeline
 
 logger = logging.getLogger(__name__)
 
+CONTENT_HASH_METADATA_KEY = "content-hash"
+
+
+def _content_digest(presentation) -> str:
+    # generatedOn changes on every run, so it is left out. Chunks are hashed as they are encoded,
+    # so the whole output is never held in memory.
+    digest = hashlib.sha256()
+    for chunk in encode_json_chunks(replace(presentation, generated_on=None)):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_hash(
+    content_digest: str, metadata: Dict[str, str], content_encoding: Optional[ContentEncoding]
+) -> str:
+    encoding = None if content_encoding is None else content_encoding.value
+    hashed = json.dumps([content_digest, sorted(metadata.items()), encoding])
+    return hashlib.sha256(hashed.encode("utf8")).hexdigest()
+
+
+def _with_content_hash(
+    output_metadata: Dict[str, str],
+    content_digest: Optional[str],
+    content_encoding: Optional[ContentEncoding],
+) -> Dict[str, str]:
+    if content_digest is None:
+        return output_metadata
+    content_hash = _content_hash(content_digest, output_metadata, content_encoding)
+    return {**output_metadata, CONTENT_HASH_METADATA_KEY: content_hash}
+
+
+@dataclass
+class _DailyTransfers:
+    s3_uri: str
+    etag: Optional[str] = None
+    parquet_file: Optional[pa.NativeFile] = None
+    table: Optional[pa.Table] = None
+    aggregator: Optional[MetricsAggregator] = None
+
 
 class PlatformMetricsIO:
     def __init__(
         self,
-        s3_data_manager: S3DataManager,
+        s3_data_manager: StorageBackend,
         ssm_manager,
         output_metadata: Dict[str, str],
+        max_concurrent_reads: int = 1,
+        aggregate_cache: Optional[AggregateCache] = None,
+        prefetch_queue_size: int = 0,
+        output_content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+        skip_unchanged_outputs: bool = True,
     ):
         self._ssm_manager = ssm_manager
         self._s3_manager = s3_data_manager
         self._output_metadata = output_metadata
+        self._max_concurrent_reads = max_concurrent_reads
+        self._aggregate_cache = aggregate_cache
+        self._prefetch_queue_size = prefetch_queue_size
+        self._output_content_encoding = output_content_encoding
+        self._skip_unchanged_outputs = skip_unchanged_outputs
 
     @staticmethod
     def _create_platform_json_object(platform_data) -> dict:
-        content_dict = asdict(platform_data)
-        return camelize_dict(content_dict)
+        return serializer_for(type(platform_data)).to_dict(platform_data)
 
     def read_transfers_as_dataclass(self, s3_uris: List[str]) -> List[Transfer]:
-        transfer_table = self.read_transfers_as_table(s3_uris)
+        transfer_table = self.read_transfers_as_table(s3_uris, columns=TRANSFER_COLUMNS)
         return convert_table_to_transfers(transfer_table)
 
-    def read_transfers_as_table(self, s3_uris: List[str]) -> pa.Table:
+    def read_transfers_as_store(self, s3_uris: List[str]) -> TransferStore:
+        transfer_store = TransferStore()
+        for transfer_table in self.read_transfer_tables(s3_uris, columns=TRANSFER_COLUMNS):
+            transfer_store.extend_table(transfer_table)
+        return transfer_store
+
+    def open_transfer_dataset(self, prefix_uri: str) -> TransferDataset:
+        dataset = self._s3_manager.open_parquet_dataset(prefix_uri, TRANSFER_DATA_PARTITIONING)
+        return TransferDataset(dataset, max_concurrent_reads=self._max_concurrent_reads)
+
+    def read_transfers_as_store_from_dataset(
+        self, prefix_uri: str, dates: List[datetime]
+    ) -> TransferStore:
+        transfer_dataset = self.open_transfer_dataset(prefix_uri)
+        return TransferStore.from_table(
+            transfer_dataset.read_table(dates, columns=TRANSFER_COLUMNS)
+        )
+
+    def read_transfer_aggregates_from_dataset(
+        self,
+        prefix_uri: str,
+        dates: List[datetime],
+        aggregate_table: Callable[[pa.Table], MetricsAggregator],
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[MetricsAggregator]:
+        transfer_dataset = self.open_transfer_dataset(prefix_uri)
+        return map(aggregate_table, transfer_dataset.read_tables_by_date(dates, columns=columns))
+
+    def read_transfers_as_table(
+        self,
+        s3_uris: List[str],
+        columns: Optional[List[str]] = None,
+    ) -> pa.Table:
         return pa.concat_tables(
-            [self._s3_manager.read_parquet(s3_path) for s3_path in s3_uris],
+            list(self.read_transfer_tables(s3_uris, columns=columns)),
+        )
+
+    def read_transfer_tables(
+        self,
+        s3_uris: List[str],
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pa.Table]:
+        if self._prefetch_queue_size > 0:
+            return self._read_transfer_tables_in_stages(s3_uris, columns)
+        read_parquet = partial(self._s3_manager.read_parquet, columns=columns)
+        return concurrent_map(read_parquet, s3_uris, max_workers=self._max_concurrent_reads)
+
+    def _read_transfer_tables_in_stages(
+        self,
+        s3_uris: List[str],
+        columns: Optional[List[str]],
+    ) -> Iterator[pa.Table]:
+        fetch_parquet = partial(self._s3_manager.fetch_parquet, columns=columns)
+        pipeline = StagedPipeline(
+            [
+                Stage("download", fetch_parquet, max_workers=self._max_concurrent_reads),
+                Stage("decode", partial(pq.read_table, columns=columns)),
+            ],
+            queue_size=self._prefetch_queue_size,
+        )
+        try:
+            yield from pipeline.run(s3_uris)
+        finally:
+            pipeline.log_metrics("transfer tables")
+
+    def read_transfer_aggregates(
+        self,
+        s3_uris: List[str],
+        aggregate_table: Callable[[pa.Table], MetricsAggregator],
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[MetricsAggregator]:
+        if self._prefetch_queue_size > 0:
+            return self._read_transfer_aggregates_in_stages(s3_uris, aggregate_table, columns)
+        read_aggregate = partial(
+            self._read_transfer_aggregate, aggregate_table=aggregate_table, columns=columns
+        )
+        return concurrent_map(read_aggregate, s3_uris, max_workers=self._max_concurrent_reads)
+
+    def _read_transfer_aggregates_in_stages(
+        self,
+        s3_uris: List[str],
+        aggregate_table: Callable[[pa.Table], MetricsAggregator],
+        columns: Optional[List[str]],
+    ) -> Iterator[MetricsAggregator]:
+        pipeline = StagedPipeline(
+            [
+                Stage(
+                    "download",
+                    partial(self._fetch_daily_transfers, columns=columns),
+                    max_workers=self._max_concurrent_reads,
+                ),
+                Stage("decode", partial(self._decode_daily_transfers, columns=columns)),
+                Stage("fold", partial(self._fold_daily_transfers, aggregate_table=aggregate_table)),
+            ],
+            queue_size=self._prefetch_queue_size,
+        )
+        try:
+            yield from pipeline.run(s3_uris)
+        finally:
+            pipeline.log_metrics("transfer aggregates")
+
+    def _fetch_daily_transfers(self, s3_uri: str, columns: Optional[List[str]]) -> _DailyTransfers:
+        if self._aggregate_cache is None:
+            return _DailyTransfers(
+                s3_uri, parquet_file=self._s3_manager.fetch_parquet(s3_uri, columns)
+            )
+
+        etag = self._s3_manager.read_etag(s3_uri)
+        cached_aggregator = self._aggregate_cache.get(s3_uri, etag)
+        if cached_aggregator is not None:
+            return _DailyTransfers(s3_uri, etag, aggregator=cached_aggregator)
+        return _DailyTransfers(
+            s3_uri, etag, parquet_file=self._s3_manager.fetch_parquet(s3_uri, columns, etag)
+        )
+
+    @staticmethod
+    def _decode_daily_transfers(
+        daily_transfers: _DailyTransfers, columns: Optional[List[str]]
+    ) -> _DailyTransfers:
+        if daily_transfers.parquet_file is not None:
+            daily_transfers.table = pq.read_table(daily_transfers.parquet_file, columns=columns)
+            daily_transfers.parquet_file = None
+        return daily_transfers
+
+    def _fold_daily_transfers(
+        self,
+        daily_transfers: _DailyTransfers,
+        aggregate_table: Callable[[pa.Table], MetricsAggregator],
+    ) -> MetricsAggregator:
+        if daily_transfers.aggregator is not None:
+            return daily_transfers.aggregator
+
+        aggregator = aggregate_table(daily_transfers.table)
+        if self._aggregate_cache is not None and daily_transfers.etag is not None:
+            self._aggregate_cache.put(daily_transfers.s3_uri, daily_transfers.etag, aggregator)
+        return aggregator
+
+    def _read_transfer_aggregate(
+        self,
+        s3_uri: str,
+        aggregate_table: Callable[[pa.Table], MetricsAggregator],
+        columns: Optional[List[str]],
+    ) -> MetricsAggregator:
+        if self._aggregate_cache is None:
+            return aggregate_table(self._s3_manager.read_parquet(s3_uri, columns=columns))
+
+        etag = self._s3_manager.read_etag(s3_uri)
+        cached_aggregator = self._aggregate_cache.get(s3_uri, etag)
+        if cached_aggregator is not None:
+            return cached_aggregator
+
+        parquet_file = self._s3_manager.fetch_parquet(s3_uri, columns, etag)
+        aggregator = aggregate_table(pq.read_table(parquet_file, columns=columns))
+        self._aggregate_cache.put(s3_uri, etag, aggregator)
+        return aggregator
+
+    def _metadata_with(self, metadata: Optional[Dict[str, str]]) -> Dict[str, str]:
+        return {**self._output_metadata, **(metadata or {})}
+
+    def _content_digest_for(self, presentation) -> Optional[str]:
+        return _content_digest(presentation) if self._skip_unchanged_outputs else None
+
+    def _output_metadata_for(self, presentation, metadata: Optional[Dict[str, str]]):
+        return _with_content_hash(
+            self._metadata_with(metadata),
+            self._content_digest_for(presentation),
+            self._output_content_encoding,
         )
 
+    def _is_unchanged(self, s3_uri: str, output_metadata: Dict[str, str]) -> bool:
+        if CONTENT_HASH_METADATA_KEY not in output_metadata:
+            return False
+        try:
+            existing_metadata = self._s3_manager.read_metadata(s3_uri)
+        except FileNotFoundError:
+            return False
+        unchanged = existing_metadata.get(CONTENT_HASH_METADATA_KEY) == (
+            output_metadata[CONTENT_HASH_METADATA_KEY]
+        )
+        if unchanged:
+            logger.info(
+                "Skipping upload of unchanged: " + s3_uri,
+                extra={"event": "SKIPPED_UNCHANGED_UPLOAD", "object_uri": s3_uri},
+            )
+        return unchanged
+
     def write_national_metrics(
-        self, national_metrics_presentation_data: NationalMetricsPresentation, s3_uri: str
+        self,
+        national_metrics_presentation_data: NationalMetricsPresentation,
+        s3_uri: str,
+        metadata: Optional[Dict[str, str]] = None,
     ):
+        output_metadata = self._output_metadata_for(national_metrics_presentation_data, metadata)
+        if self._is_unchanged(s3_uri, output_metadata):
+            return
         self._s3_manager.write_json(
             object_uri=s3_uri,
             data=self._create_platform_json_object(national_metrics_presentation_data),
-            metadata=self._output_metadata,
+            metadata=output_metadata,
             log_data=True,
+            content_encoding=self._output_content_encoding,
         )
 
+    def _ssm_param_value(self, ssm_param_name: str) -> Optional[str]:
+        try:
+            return self._ssm_manager.get_parameter(Name=ssm_param_name)["Parameter"]["Value"]
+        except ClientError:
+            return None
+
     def store_ssm_param(self, ssm_param_name: str, ssm_param_value: str):
+        if (
+            self._skip_unchanged_outputs
+            and self._ssm_param_value(ssm_param_name) == ssm_param_value
+        ):
+            logger.info(
+                f"Skipping unchanged SSM param {ssm_param_name}",
+                extra={"event": "SKIPPED_UNCHANGED_SSM", "ssm_param_name": ssm_param_name},
+            )
+            return
         try:
             logger.info(f"Attempting to store SSM param {ssm_param_name}: {ssm_param_value}")
             self._ssm_manager.put_parameter(
@@ -68,9 +338,53 @@ class PlatformMetricsIO:
             )
             raise e
 
-    def write_practice_metrics(self, practice_metrics_presentation_data, s3_uri: str):
-        self._s3_manager.write_json(
+    def write_practice_metrics(
+        self,
+        practice_metrics_presentation_data: PracticeMetricsPresentation,
+        s3_uri: str,
+        metadata: Optional[Dict[str, str]] = None,
+        parquet_s3_uri: Optional[str] = None,
+    ):
+        output_metadata = self._metadata_with(metadata)
+        content_digest = self._content_digest_for(practice_metrics_presentation_data)
+        self._write_practice_metrics_json(
+            practice_metrics_presentation_data,
+            s3_uri,
+            _with_content_hash(output_metadata, content_digest, self._output_content_encoding),
+        )
+        if parquet_s3_uri is not None:
+            # The Parquet file is never content encoded, so its hash leaves the encoding out.
+            self._write_practice_metrics_parquet(
+                practice_metrics_presentation_data,
+                parquet_s3_uri,
+                _with_content_hash(output_metadata, content_digest, None),
+            )
+
+    def _write_practice_metrics_json(
+        self,
+        practice_metrics_presentation_data: PracticeMetricsPresentation,
+        s3_uri: str,
+        output_metadata: Dict[str, str],
+    ):
+        if self._is_unchanged(s3_uri, output_metadata):
+            return
+        self._s3_manager.write_json_chunks(
+            object_uri=s3_uri,
+            chunks=encode_json_chunks(practice_metrics_presentation_data),
+            metadata=output_metadata,
+            content_encoding=self._output_content_encoding,
+        )
+
+    def _write_practice_metrics_parquet(
+        self,
+        practice_metrics_presentation_data: PracticeMetricsPresentation,
+        s3_uri: str,
+        output_metadata: Dict[str, str],
+    ):
+        if self._is_unchanged(s3_uri, output_metadata):
+            return
+        self._s3_manager.write_parquet(
             object_uri=s3_uri,
-            data=self._create_platform_json_object(practice_metrics_presentation_data),
-            metadata=self._output_metadata,
+            table=convert_practice_metrics_to_table(practice_metrics_presentation_data),
+            metadata=output_metadata,
         )
@@ -1,34 +1,72 @@
-from typing import List
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import boto3
-
-from prmcalculator.domain.gp2gp.transfer import Transfer
+from prmcalculator.domain.gp2gp.transfer import TRANSFER_COLUMNS, convert_table_to_transfers
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
 from prmcalculator.domain.national.calculate_national_metrics_data import (
     NationalMetricsObservabilityProbe,
     calculate_national_metrics_data,
+    calculate_national_metrics_data_from_aggregate,
+)
+from prmcalculator.domain.national.construct_national_metrics_presentation import (
+    NationalMetricsPresentation,
 )
 from prmcalculator.domain.practice.calculate_practice_metrics import (
     PracticeMetricsObservabilityProbe,
     PracticeMetricsPresentation,
     calculate_practice_metrics,
+    calculate_practice_metrics_from_aggregate,
 )
 from prmcalculator.domain.reporting_window import ReportingWindow, YearMonth
+from prmcalculator.domain.reporting_window_aggregates import aggregate_reporting_windows
+from prmcalculator.pipeline.aggregate_cache import AggregateCache
+from prmcalculator.pipeline.config import MetricsEngine, TransferDataDiscovery
 from prmcalculator.pipeline.io import PlatformMetricsIO
 from prmcalculator.pipeline.s3_uri_resolver import PlatformMetricsS3UriResolver
-from prmcalculator.utils.io.s3 import S3DataManager
+from prmcalculator.pipeline.storage_factory import create_storage, s3_max_pool_connections
+from prmcalculator.utils.date_converter import convert_date_range_to_monthly_datetimes
+from prmcalculator.utils.io.connection_pool_monitor import ConnectionPoolMonitor
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
+from prmcalculator.utils.io.storage import ParameterStore, StorageBackend
+from prmcalculator.utils.stage_timings import StageTimings
 
 
 class MetricsCalculator:
-    def __init__(self, config):
-        s3 = boto3.resource("s3", endpoint_url=config.s3_endpoint_url)
-        s3_manager = S3DataManager(s3)
-        ssm_manager = boto3.client("ssm")
+    def __init__(
+        self,
+        config,
+        storage: Optional[StorageBackend] = None,
+        parameter_store: Optional[ParameterStore] = None,
+        stage_timings: Optional[StageTimings] = None,
+    ):
+        self._stage_timings = StageTimings() if stage_timings is None else stage_timings
+        self._read_latencies = LatencyHistogram("S3 read")
+        self._connection_pool_monitor: AbstractContextManager = (
+            ConnectionPoolMonitor(s3_max_pool_connections(config))
+            if storage is None and config.storage_uri is None
+            else nullcontext()
+        )
+        self._created_storage: Optional[StorageBackend] = None
+        if storage is None or parameter_store is None:
+            default_storage, default_parameter_store = create_storage(config, self._read_latencies)
+            if storage is None:
+                storage = self._created_storage = default_storage
+            parameter_store = (
+                default_parameter_store if parameter_store is None else parameter_store
+            )
 
         self._national_metrics_s3_path_param_name = config.national_metrics_s3_path_param_name
         self._practice_metrics_s3_path_param_name = config.practice_metrics_s3_path_param_name
+        self._metrics_engine = config.metrics_engine
+        self._transfer_data_discovery = config.transfer_data_discovery
+        self._practice_metrics_parquet = config.practice_metrics_parquet
+        self._practice_metrics_max_workers = config.practice_metrics_max_workers
 
-        self._reporting_window = ReportingWindow.prior_to(
-            config.date_anchor, config.number_of_months
+        self._number_of_months = config.number_of_months
+        self._date_anchors = convert_date_range_to_monthly_datetimes(
+            config.date_anchor, config.backfill_end_date_anchor or config.date_anchor
         )
 
         output_metadata = {
@@ -42,47 +80,143 @@ class MetricsCalculator:
             data_platform_metrics_bucket=config.output_metrics_bucket,
         )
 
+        aggregate_cache = (
+            AggregateCache(storage, config.aggregate_cache_uri)
+            if config.aggregate_cache_uri
+            else None
+        )
+
         self._io = PlatformMetricsIO(
-            s3_data_manager=s3_manager,
-            ssm_manager=ssm_manager,
+            s3_data_manager=storage,
+            ssm_manager=parameter_store,
             output_metadata=output_metadata,
+            max_concurrent_reads=config.max_concurrent_reads,
+            aggregate_cache=aggregate_cache,
+            prefetch_queue_size=config.prefetch_queue_size,
+            output_content_encoding=config.output_content_encoding,
+            skip_unchanged_outputs=config.skip_unchanged_outputs,
         )
 
     def _read_transfer_data(self, dates):
+        if self._transfer_data_discovery == TransferDataDiscovery.DATASET:
+            return self._io.read_transfers_as_store_from_dataset(
+                self._uris.transfer_data_prefix(), dates
+            )
         transfers_data_s3_uris = self._uris.transfer_data(dates)
-        return self._io.read_transfers_as_dataclass(transfers_data_s3_uris)
+        return self._io.read_transfers_as_store(transfers_data_s3_uris)
 
-    def _calculate_national_metrics(self, transfers):
+    def _calculate_national_metrics(self, transfers, reporting_window: ReportingWindow):
         return calculate_national_metrics_data(
             transfers=transfers,
-            reporting_window=self._reporting_window,
+            reporting_window=reporting_window,
             observability_probe=NationalMetricsObservabilityProbe(),
         )
 
     def _calculate_practice_metrics(
         self,
-        transfers: List[Transfer],
+        transfers: TransferStore,
+        reporting_window: ReportingWindow,
     ):
         return calculate_practice_metrics(
             transfers=transfers,
-            reporting_window=self._reporting_window,
+            reporting_window=reporting_window,
             observability_probe=PracticeMetricsObservabilityProbe(),
+            max_workers=self._practice_metrics_max_workers,
         )
 
+    def _calculate_metrics(
+        self, reporting_window: ReportingWindow
+    ) -> Tuple[NationalMetricsPresentation, PracticeMetricsPresentation]:
+        with self._stage_timings.stage("read"):
+            transfers = self._read_transfer_data(reporting_window.dates)
+        with self._stage_timings.stage("national"):
+            national_metrics = self._calculate_national_metrics(transfers, reporting_window)
+        with self._stage_timings.stage("practice"):
+            practice_metrics = self._calculate_practice_metrics(transfers, reporting_window)
+        return national_metrics, practice_metrics
+
+    def _aggregate_transfer_table(self, transfer_table) -> MetricsAggregator:
+        aggregator = MetricsAggregator()
+        if self._metrics_engine == MetricsEngine.ARROW:
+            aggregator.add_transfer_table(transfer_table)
+        else:
+            aggregator.add_transfers(convert_table_to_transfers(transfer_table))
+        return aggregator
+
+    def _aggregate_transfers_by_date(
+        self, dates: List[datetime]
+    ) -> Iterator[Tuple[datetime, MetricsAggregator]]:
+        if self._transfer_data_discovery == TransferDataDiscovery.DATASET:
+            daily_aggregates = self._io.read_transfer_aggregates_from_dataset(
+                self._uris.transfer_data_prefix(),
+                dates,
+                aggregate_table=self._aggregate_transfer_table,
+                columns=TRANSFER_COLUMNS,
+            )
+        else:
+            daily_aggregates = self._io.read_transfer_aggregates(
+                self._uris.transfer_data(dates),
+                aggregate_table=self._aggregate_transfer_table,
+                columns=TRANSFER_COLUMNS,
+            )
+        return zip(dates, daily_aggregates)
+
+    def _calculate_metrics_from_aggregate(
+        self, reporting_window: ReportingWindow, aggregator: MetricsAggregator
+    ) -> Tuple[NationalMetricsPresentation, PracticeMetricsPresentation]:
+        with self._stage_timings.stage("national"):
+            national_metrics = calculate_national_metrics_data_from_aggregate(
+                aggregator=aggregator,
+                reporting_window=reporting_window,
+                observability_probe=NationalMetricsObservabilityProbe(),
+            )
+        with self._stage_timings.stage("practice"):
+            practice_metrics = calculate_practice_metrics_from_aggregate(
+                aggregator=aggregator,
+                reporting_window=reporting_window,
+                observability_probe=PracticeMetricsObservabilityProbe(),
+            )
+        return national_metrics, practice_metrics
+
+    def _calculate_metrics_for_reporting_windows(
+        self, reporting_windows: List[ReportingWindow]
+    ) -> Iterator[Tuple[NationalMetricsPresentation, PracticeMetricsPresentation]]:
+        if self._metrics_engine == MetricsEngine.TRANSFERS and len(reporting_windows) == 1:
+            yield self._calculate_metrics(reporting_windows[0])
+            return
+
+        dates = sorted({date for window in reporting_windows for date in window.dates})
+        aggregates_by_window = aggregate_reporting_windows(
+            reporting_windows, self._aggregate_transfers_by_date(dates)
+        )
+        # Transfer files are read and aggregated lazily, so the read stage is timed per window.
+        for reporting_window, aggregator in self._stage_timings.iterate(
+            "read", aggregates_by_window
+        ):
+            yield self._calculate_metrics_from_aggregate(reporting_window, aggregator)
+
     def _write_practice_metrics(
         self,
         practice_metrics: PracticeMetricsPresentation,
         year_month: YearMonth,
+        metadata: Dict[str, str],
     ):
         self._io.write_practice_metrics(
             practice_metrics_presentation_data=practice_metrics,
             s3_uri=self._uris.practice_metrics(year_month),
+            metadata=metadata,
+            parquet_s3_uri=(
+                self._uris.practice_metrics_parquet(year_month)
+                if self._practice_metrics_parquet
+                else None
+            ),
         )
 
-    def _write_national_metrics(self, national_metrics, month):
+    def _write_national_metrics(self, national_metrics, month, metadata: Dict[str, str]):
         self._io.write_national_metrics(
             national_metrics_presentation_data=national_metrics,
             s3_uri=self._uris.national_metrics(month),
+            metadata=metadata,
         )
 
     def _store_national_metrics_uri_ssm_param(
@@ -101,20 +235,47 @@ class MetricsCalculator:
             ssm_param_value=self._uris.practice_metrics_key(month),
         )
 
+    def _write_metrics(
+        self,
+        date_anchor: datetime,
+        reporting_window: ReportingWindow,
+        metrics: Tuple[NationalMetricsPresentation, PracticeMetricsPresentation],
+    ):
+        national_metrics, practice_metrics = metrics
+        metadata = {"date-anchor": date_anchor.isoformat()}
+        last_month = reporting_window.last_metric_month
+        with self._stage_timings.stage("write"):
+            self._write_national_metrics(national_metrics, last_month, metadata)
+            self._write_practice_metrics(practice_metrics, last_month, metadata)
+
     def run(self):
-        dates = self._reporting_window.dates
-        last_month = self._reporting_window.last_metric_month
-        transfers = self._read_transfer_data(dates)
-        national_metrics = self._calculate_national_metrics(transfers)
-        practice_metrics_including_slow_transfers = self._calculate_practice_metrics(transfers)
+        try:
+            with self._connection_pool_monitor:
+                self._run()
+        finally:
+            if self._created_storage is not None:
+                self._created_storage.close()
 
-        self._write_national_metrics(national_metrics, last_month)
-        self._write_practice_metrics(practice_metrics_including_slow_transfers, last_month)
+    def _run(self):
+        reporting_windows = [
+            ReportingWindow.prior_to(date_anchor, self._number_of_months)
+            for date_anchor in self._date_anchors
+        ]
+        calculated_metrics = self._calculate_metrics_for_reporting_windows(reporting_windows)
+        for date_anchor, reporting_window, metrics in zip(
+            self._date_anchors, reporting_windows, calculated_metrics
+        ):
+            self._write_metrics(date_anchor, reporting_window, metrics)
 
-        self._store_national_metrics_uri_ssm_param(
-            self._national_metrics_s3_path_param_name, last_month
-        )
+        last_month = reporting_windows[-1].last_metric_month
 
-        self._store_practice_metrics_uri_ssm_param(
-            self._practice_metrics_s3_path_param_name, last_month
-        )
+        with self._stage_timings.stage("ssm"):
+            self._store_national_metrics_uri_ssm_param(
+                self._national_metrics_s3_path_param_name, last_month
+            )
+
+            self._store_practice_metrics_uri_ssm_param(
+                self._practice_metrics_s3_path_param_name, last_month
+            )
+
+        self._read_latencies.log_summary()
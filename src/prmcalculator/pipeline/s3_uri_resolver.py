@@ -11,6 +11,7 @@ class PlatformMetricsS3UriResolver:
     _DEFAULT_DATA_PLATFORM_METRICS_VERSION = "v12"
 
     _PRACTICE_METRICS_FILE_NAME = "practiceMetrics.json"
+    _PRACTICE_METRICS_PARQUET_FILE_NAME = "practiceMetrics.parquet"
     _NATIONAL_METRICS_FILE_NAME = "nationalMetrics.json"
     _SUPPLIER_PATHWAY_OUTCOME_COUNTS_FILE_NAME = "supplier_pathway_outcome_counts.csv"
     _TRANSFER_DATA_FILE_NAME = "transfers.parquet"
@@ -44,6 +45,16 @@ class PlatformMetricsS3UriResolver:
             [self._data_platform_metrics_s3_prefix, self.practice_metrics_key(year_month)]
         )
 
+    def practice_metrics_parquet(self, year_month: YearMonth) -> str:
+        year, month = year_month
+        return "/".join(
+            [
+                self._data_platform_metrics_s3_prefix,
+                f"{year}/{month}",
+                f"{year}-{month}-{self._PRACTICE_METRICS_PARQUET_FILE_NAME}",
+            ]
+        )
+
     def national_metrics_key(self, year_month: YearMonth) -> str:
         year, month = year_month
         return "/".join(
@@ -58,6 +69,15 @@ class PlatformMetricsS3UriResolver:
             [self._data_platform_metrics_s3_prefix, self.national_metrics_key(year_month)]
         )
 
+    def transfer_data_prefix(self) -> str:
+        return "/".join(
+            [
+                f"s3://{self._transfer_data_bucket}",
+                self._TRANSFER_DATA_VERSION,
+                self._TRANSFER_DATA_CUTOFF_FOLDER_NAME,
+            ]
+        )
+
     def _transfer_data_uri(self, a_date: datetime) -> str:
         year = a_date.year
         month = add_leading_zero(a_date.month)
@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+from typing import Tuple
+from urllib.parse import urlparse
+
+import boto3
+from botocore.config import Config
+from pyarrow.fs import S3FileSystem
+
+from prmcalculator.pipeline.config import TransferDataDiscovery
+from prmcalculator.utils.io.disk_cache import DiskCache
+from prmcalculator.utils.io.hedged_requests import HedgedRequests
+from prmcalculator.utils.io.in_memory import InMemoryDataManager, InMemoryParameterStore
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
+from prmcalculator.utils.io.local_files import LocalFileDataManager, LocalFileParameterStore
+from prmcalculator.utils.io.s3 import S3DataManager
+from prmcalculator.utils.io.s3_ranges import RangedDownloader
+from prmcalculator.utils.io.storage import ParameterStore, StorageBackend
+from prmcalculator.utils.retry import RetryPolicy
+
+LOCAL_PARAMETER_STORE_FILE_NAME = "ssm-parameters.json"
+
+_DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
+class UnsupportedStorageUri(Exception):
+    pass
+
+
+def _ranged_reads_enabled(config) -> bool:
+    return config.s3_read_part_size_bytes > 0 or config.s3_read_footer_first
+
+
+def _concurrent_ranged_requests(config) -> int:
+    return config.max_concurrent_reads * max(1, config.s3_read_part_concurrency)
+
+
+def s3_max_pool_connections(config) -> int:
+    if config.s3_max_pool_connections is not None:
+        return config.s3_max_pool_connections
+    concurrent_requests = (
+        _concurrent_ranged_requests(config)
+        if _ranged_reads_enabled(config)
+        else config.max_concurrent_reads
+    )
+    if config.s3_read_hedging:
+        concurrent_requests *= 2
+    return max(_DEFAULT_MAX_POOL_CONNECTIONS, concurrent_requests)
+
+
+def create_boto_config(config) -> Config:
+    # Left unset, botocore keeps the retry mode from its own defaults or the AWS config file.
+    retries = None if config.aws_retry_mode is None else {"mode": config.aws_retry_mode.value}
+    return Config(
+        max_pool_connections=s3_max_pool_connections(config),
+        connect_timeout=config.s3_connect_timeout_seconds,
+        read_timeout=config.s3_read_timeout_seconds,
+        tcp_keepalive=config.s3_tcp_keepalive,
+        retries=retries,
+    )
+
+
+def _create_s3_storage(
+    config, read_latencies: LatencyHistogram
+) -> Tuple[StorageBackend, ParameterStore]:
+    boto_config = create_boto_config(config)
+    # A single resource is shared by every read and write, so its low-level client and
+    # connection pool are reused rather than each S3DataManager call opening its own.
+    s3 = boto3.resource("s3", endpoint_url=config.s3_endpoint_url, config=boto_config)
+    disk_cache = (
+        DiskCache(config.parquet_cache_directory, config.parquet_cache_max_bytes)
+        if config.parquet_cache_directory
+        else None
+    )
+    filesystem = (
+        S3FileSystem(
+            endpoint_override=config.s3_endpoint_url,
+            connect_timeout=config.s3_connect_timeout_seconds,
+            request_timeout=config.s3_read_timeout_seconds,
+        )
+        if config.transfer_data_discovery == TransferDataDiscovery.DATASET
+        else None
+    )
+    # Each concurrent read can hold a primary and a hedge, and up to the same again in losing
+    # requests from earlier reads that are still running.
+    hedged_requests = (
+        HedgedRequests(read_latencies, max_workers=4 * config.max_concurrent_reads)
+        if config.s3_read_hedging
+        else None
+    )
+    ranged_downloader = (
+        RangedDownloader(
+            config.s3_read_part_size_bytes or sys.maxsize,
+            # One pool serves the parts of every file read concurrently, and of hedged reads.
+            _concurrent_ranged_requests(config) * (2 if config.s3_read_hedging else 1),
+            footer_first=config.s3_read_footer_first,
+        )
+        if _ranged_reads_enabled(config)
+        else None
+    )
+    s3_manager = S3DataManager(
+        s3,
+        disk_cache=disk_cache,
+        filesystem=filesystem,
+        retry_policy=RetryPolicy(
+            max_attempts=config.s3_read_max_attempts,
+            base_delay_seconds=config.s3_read_retry_base_delay_ms / 1000,
+        ),
+        read_latencies=read_latencies,
+        hedged_requests=hedged_requests,
+        ranged_downloader=ranged_downloader,
+    )
+    return s3_manager, boto3.client("ssm", config=boto_config)
+
+
+def create_storage(
+    config, read_latencies: LatencyHistogram
+) -> Tuple[StorageBackend, ParameterStore]:
+    if config.storage_uri is None:
+        return _create_s3_storage(config, read_latencies)
+
+    storage_uri = urlparse(config.storage_uri)
+    if storage_uri.scheme == "file":
+        root = Path(storage_uri.path)
+        return LocalFileDataManager(root), LocalFileParameterStore(
+            root / LOCAL_PARAMETER_STORE_FILE_NAME
+        )
+    if storage_uri.scheme == "memory":
+        return InMemoryDataManager(), InMemoryParameterStore()
+    raise UnsupportedStorageUri(f"Unsupported storage URI: {config.storage_uri}")
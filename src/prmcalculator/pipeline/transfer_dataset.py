@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime
+from functools import partial
+from itertools import groupby
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from prmcalculator.utils.concurrent_map import concurrent_map
+
+logger = logging.getLogger(__name__)
+
+TRANSFER_DATA_PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int16()), ("month", pa.int8()), ("day", pa.int8())])
+)
+_PARTITION_COLUMNS = TRANSFER_DATA_PARTITIONING.schema.names
+
+
+def _year_month(a_date: datetime):
+    return a_date.year, a_date.month
+
+
+def _month_filter(year: int, month: int, days: List[int]) -> ds.Expression:
+    return (ds.field("year") == year) & (ds.field("month") == month) & ds.field("day").isin(days)
+
+
+def _dates_filter(dates: List[datetime]) -> ds.Expression:
+    month_filters = [
+        _month_filter(year, month, [a_date.day for a_date in month_dates])
+        for (year, month), month_dates in groupby(sorted(dates), key=_year_month)
+    ]
+    dates_filter = month_filters[0]
+    for month_filter in month_filters[1:]:
+        dates_filter = dates_filter | month_filter
+    return dates_filter
+
+
+def _date_key(a_date: datetime):
+    return a_date.year, a_date.month, a_date.day
+
+
+def _warn_missing_dates(missing_dates: List[datetime]):
+    if missing_dates:
+        logger.warning(
+            f"No transfer data found for {len(missing_dates)} dates",
+            extra={
+                "event": "MISSING_TRANSFER_DATA",
+                "dates": [a_date.date().isoformat() for a_date in missing_dates],
+            },
+        )
+
+
+class TransferDataset:
+    def __init__(self, dataset: ds.Dataset, max_concurrent_reads: int = 1):
+        self._dataset = dataset
+        self._max_concurrent_reads = max_concurrent_reads
+
+    @staticmethod
+    def _present_date_keys(table: pa.Table):
+        return {
+            (row["year"], row["month"], row["day"])
+            for row in table.group_by(_PARTITION_COLUMNS).aggregate([]).to_pylist()
+        }
+
+    def read_table(self, dates: List[datetime], columns: Optional[List[str]] = None) -> pa.Table:
+        table = self._dataset.to_table(
+            columns=None if columns is None else columns + _PARTITION_COLUMNS,
+            filter=_dates_filter(dates),
+        )
+        present_date_keys = self._present_date_keys(table)
+        _warn_missing_dates(
+            [a_date for a_date in dates if _date_key(a_date) not in present_date_keys]
+        )
+        return table.select([name for name in table.column_names if name not in _PARTITION_COLUMNS])
+
+    def _read_date(self, a_date: datetime, columns: Optional[List[str]]) -> pa.Table:
+        return self._dataset.to_table(columns=columns, filter=_dates_filter([a_date]))
+
+    def read_tables_by_date(
+        self, dates: List[datetime], columns: Optional[List[str]] = None
+    ) -> Iterator[pa.Table]:
+        read_date = partial(self._read_date, columns=columns)
+        tables = concurrent_map(read_date, dates, max_workers=self._max_concurrent_reads)
+        missing_dates = []
+        for a_date, table in zip(dates, tables):
+            if table.num_rows == 0:
+                missing_dates.append(a_date)
+            yield table
+        _warn_missing_dates(missing_dates)
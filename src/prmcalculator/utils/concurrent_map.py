@@ -0,0 +1,53 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Deque, Generic, Iterable, Iterator, TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+class _InFlightCalls(Generic[Item, Result]):
+    def __init__(
+        self, executor: Executor, function: Callable[[Item], Result], items: Iterable[Item]
+    ):
+        self._executor = executor
+        self._function = function
+        self._pending_items = iter(items)
+        self._futures: Deque[Future] = deque()
+
+    def submit(self, count: int):
+        for item in islice(self._pending_items, count):
+            self._futures.append(self._executor.submit(self._function, item))
+
+    def has_pending(self) -> bool:
+        return len(self._futures) > 0
+
+    def _raise_first_failure(self):
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                future.result()
+
+    def completed_in_order(self) -> Iterator[Result]:
+        wait([self._futures[0]])
+        self._raise_first_failure()
+        while self._futures and self._futures[0].done():
+            yield self._futures.popleft().result()
+            self.submit(1)
+
+
+def concurrent_map(
+    function: Callable[[Item], Result], items: Iterable[Item], max_workers: int
+) -> Iterator[Result]:
+    if max_workers <= 1:
+        yield from map(function, items)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        calls: _InFlightCalls[Item, Result] = _InFlightCalls(executor, function, items)
+        calls.submit(max_workers)
+        while calls.has_pending():
+            yield from calls.completed_in_order()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,8 +1,15 @@
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
+import pyarrow as pa
+from dateutil.relativedelta import relativedelta
 from dateutil.tz import UTC
 
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+_MICROSECONDS_PER_DAY = 24 * 60 * 60 * 10**6
+
 
 def convert_date_range_to_dates(start_datetime: datetime, end_datetime: datetime) -> List[datetime]:
     if start_datetime > end_datetime:
@@ -14,3 +21,39 @@ def convert_date_range_to_dates(start_datetime: datetime, end_datetime: datetime
 
 def get_first_day_of_month_datetime(a_datetime: datetime) -> datetime:
     return datetime(year=a_datetime.year, month=a_datetime.month, day=1, tzinfo=UTC)
+
+
+def convert_date_range_to_monthly_datetimes(
+    start_datetime: datetime, end_datetime: datetime
+) -> List[datetime]:
+    if start_datetime > end_datetime:
+        raise ValueError("Start datetime must be before end datetime")
+
+    monthly_datetimes = [start_datetime]
+    while monthly_datetimes[-1] + relativedelta(months=1) <= end_datetime:
+        monthly_datetimes.append(start_datetime + relativedelta(months=len(monthly_datetimes)))
+    return monthly_datetimes
+
+
+def to_epoch_microseconds(a_datetime: datetime) -> int:
+    return (a_datetime - EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_microseconds(microseconds: Optional[int]) -> Optional[datetime]:
+    if microseconds is None:
+        return None
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+def utc_epoch_microseconds(column: pa.ChunkedArray) -> List[Optional[int]]:
+    return column.cast(pa.timestamp("us", tz="UTC")).cast(pa.int64()).to_pylist()
+
+
+@lru_cache(maxsize=None)
+def _year_month_of_day(day: int) -> Tuple[int, int]:
+    a_date = date.fromordinal(_EPOCH_ORDINAL + day)
+    return a_date.year, a_date.month
+
+
+def year_month_of_epoch_microseconds(microseconds: int) -> Tuple[int, int]:
+    return _year_month_of_day(microseconds // _MICROSECONDS_PER_DAY)
@@ -0,0 +1,45 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+_URLLIB3_POOL_LOGGER_NAME = "urllib3.connectionpool"
+_POOL_FULL_MESSAGE_PREFIX = "Connection pool is full"
+
+
+class ConnectionPoolMonitor(logging.Handler):
+    def __init__(self, max_pool_connections: int):
+        super().__init__(level=logging.WARNING)
+        self._max_pool_connections = max_pool_connections
+        self.saturations = 0
+
+    def _log_saturation(self, message: str):
+        logger.warning(
+            message,
+            extra={
+                "event": "S3_CONNECTION_POOL_SATURATED",
+                "max_pool_connections": self._max_pool_connections,
+                "saturations": self.saturations,
+            },
+        )
+
+    def emit(self, record: logging.LogRecord):
+        if not record.getMessage().startswith(_POOL_FULL_MESSAGE_PREFIX):
+            return
+        self.saturations += 1
+        # Saturated pools discard a connection on every request, so only log at powers of two.
+        if self.saturations & (self.saturations - 1) == 0:
+            self._log_saturation(
+                f"S3 connection pool of {self._max_pool_connections} connections is saturated"
+            )
+
+    def __enter__(self):
+        logging.getLogger(_URLLIB3_POOL_LOGGER_NAME).addHandler(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        logging.getLogger(_URLLIB3_POOL_LOGGER_NAME).removeHandler(self)
+        if self.saturations:
+            self._log_saturation(
+                f"S3 connection pool was saturated {self.saturations} times, "
+                "consider raising S3_MAX_POOL_CONNECTIONS"
+            )
@@ -0,0 +1,92 @@
+import io
+import logging
+from enum import Enum
+from typing import Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+class ContentEncoding(Enum):
+    IDENTITY = "identity"
+    GZIP = "gzip"
+    BROTLI = "br"
+
+
+_ARROW_CODECS = {ContentEncoding.GZIP: "gzip", ContentEncoding.BROTLI: "brotli"}
+_ARROW_CODECS_BY_NAME = {encoding.value: codec for encoding, codec in _ARROW_CODECS.items()}
+
+
+class _CollectedWrites(io.RawIOBase):
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        collected = b"".join(self.chunks)
+        self.chunks = []
+        return collected
+
+
+class EncodedChunks:
+    def __init__(self, chunks: Iterable[bytes], content_encoding: ContentEncoding):
+        self._chunks = chunks
+        self.content_encoding = content_encoding
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+
+    def _raw(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.raw_bytes += len(chunk)
+            yield chunk
+
+    def _compressed(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        collected = _CollectedWrites()
+        stream = pa.CompressedOutputStream(
+            pa.PythonFile(collected, mode="w"), _ARROW_CODECS[self.content_encoding]
+        )
+        for chunk in chunks:
+            stream.write(chunk)
+            yield collected.take()
+        stream.close()
+        yield collected.take()
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = self._raw()
+        if self.content_encoding != ContentEncoding.IDENTITY:
+            chunks = self._compressed(chunks)
+        for chunk in chunks:
+            self.encoded_bytes += len(chunk)
+            if chunk:
+                yield chunk
+
+    def log_ratio(self, object_uri: str):
+        if self.content_encoding == ContentEncoding.IDENTITY:
+            return
+        logger.info(
+            f"Compressed {object_uri} with {self.content_encoding.value} from {self.raw_bytes} "
+            f"to {self.encoded_bytes} bytes",
+            extra={
+                "event": "COMPRESSED_OUTPUT",
+                "object_uri": object_uri,
+                "content_encoding": self.content_encoding.value,
+                "raw_bytes": self.raw_bytes,
+                "encoded_bytes": self.encoded_bytes,
+                "compression_ratio": round(self.encoded_bytes / max(self.raw_bytes, 1), 4),
+            },
+        )
+
+
+def decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    for name in reversed((content_encoding or "").split(",")):
+        codec = _ARROW_CODECS_BY_NAME.get(name.strip())
+        if codec is not None:
+            body = pa.input_stream(pa.BufferReader(body), compression=codec).read()
+    return body
@@ -1,7 +1,11 @@
-from typing import List, Mapping
+import json
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple
 
 
-def _camelize(string):
+@lru_cache(maxsize=None)
+def camelize(string):
     components = string.split("_")
     return components[0] + "".join(x.title() for x in components[1:])
 
@@ -10,5 +14,38 @@ def camelize_dict(obj):
     if isinstance(obj, List):
         return [camelize_dict(i) for i in obj]
     elif isinstance(obj, Mapping):
-        return {_camelize(k): camelize_dict(v) for k, v in obj.items()}
+        return {camelize(k): camelize_dict(v) for k, v in obj.items()}
+    return obj
+
+
+class DataclassSerializer:
+    def __init__(self, cls: type):
+        self.fields: Tuple[Tuple[str, str], ...] = tuple(
+            (field.name, camelize(field.name)) for field in fields(cls)
+        )
+        self.encoded_fields: Tuple[Tuple[str, str], ...] = tuple(
+            (name, json.dumps(key) + ": ") for name, key in self.fields
+        )
+
+    def to_dict(self, obj) -> dict:
+        return {key: to_camelized_json_object(getattr(obj, name)) for name, key in self.fields}
+
+
+_serializers: Dict[type, DataclassSerializer] = {}
+
+
+def serializer_for(cls: type) -> DataclassSerializer:
+    serializer = _serializers.get(cls)
+    if serializer is None:
+        serializer = _serializers[cls] = DataclassSerializer(cls)
+    return serializer
+
+
+def to_camelized_json_object(obj: Any):
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return serializer_for(type(obj)).to_dict(obj)
+    if isinstance(obj, Mapping):
+        return {camelize(key): to_camelized_json_object(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_camelized_json_object(value) for value in obj]
     return obj
@@ -0,0 +1,119 @@
+import logging
+import os
+import re
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Iterator, Optional
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SUBDIRECTORY = "prm-parquet-cache"
+_ENTRY_FILE_NAME = re.compile(r"[0-9a-f]{64}(\.\w+)?")
+_TEMPORARY_FILE_PREFIX = "partial-"
+_TEMPORARY_FILE_NAME = re.compile(_TEMPORARY_FILE_PREFIX + r"\w+\.tmp")
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self._directory = Path(directory) / _CACHE_SUBDIRECTORY
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Path, int] = OrderedDict()
+        self._total_bytes = 0
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._load_entries()
+
+    def _regular_files(self) -> Iterator[Path]:
+        for entry in self._directory.iterdir():
+            if entry.is_file() and not entry.is_symlink():
+                yield entry
+
+    def _load_entries(self):
+        stats = []
+        for entry in self._regular_files():
+            if _TEMPORARY_FILE_NAME.fullmatch(entry.name):
+                entry.unlink(missing_ok=True)
+            elif _ENTRY_FILE_NAME.fullmatch(entry.name):
+                stats.append((entry.stat(), entry))
+        for stat, entry in sorted(stats, key=lambda stat_and_entry: stat_and_entry[0].st_mtime):
+            self._add_entry(entry, stat.st_size)
+        self._evict_least_recently_used()
+
+    def _path(self, bucket: str, key: str, etag: str) -> Path:
+        digest = sha256("\n".join([bucket, key, etag]).encode("utf8")).hexdigest()
+        return self._directory / f"{digest}{Path(key).suffix}"
+
+    def _record(self, event: str, message: str, **extra):
+        logger.info(
+            message,
+            extra={
+                "event": event,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                **extra,
+            },
+        )
+
+    def get(self, bucket: str, key: str, etag: str) -> Optional[pa.MemoryMappedFile]:
+        object_uri = f"s3://{bucket}/{key}"
+        path = self._path(bucket, key, etag)
+        with self._lock:
+            if not self._touch(path):
+                self.misses += 1
+                self._record(
+                    "DISK_CACHE_MISS", f"Disk cache miss for: {object_uri}", object_uri=object_uri
+                )
+                return None
+
+            self.hits += 1
+            self._record(
+                "DISK_CACHE_HIT", f"Disk cache hit for: {object_uri}", object_uri=object_uri
+            )
+            return pa.memory_map(str(path))
+
+    def put(self, bucket: str, key: str, etag: str, data: pa.Buffer):
+        path = self._path(bucket, key, etag)
+        with NamedTemporaryFile(
+            dir=self._directory, prefix=_TEMPORARY_FILE_PREFIX, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(memoryview(data))
+        os.replace(temp_file.name, path)
+        with self._lock:
+            self._remove_entry(path)
+            self._add_entry(path, data.size)
+            self._evict_least_recently_used()
+
+    def _add_entry(self, path: Path, size: int):
+        self._entries[path] = size
+        self._total_bytes += size
+
+    def _remove_entry(self, path: Path):
+        self._total_bytes -= self._entries.pop(path, 0)
+
+    def _touch(self, path: Path) -> bool:
+        if path not in self._entries:
+            return False
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._remove_entry(path)
+            return False
+        self._entries.move_to_end(path)
+        return True
+
+    def _evict_least_recently_used(self):
+        while self._total_bytes > self._max_bytes and self._entries:
+            entry, size = self._entries.popitem(last=False)
+            entry.unlink(missing_ok=True)
+            self._total_bytes -= size
+            self.evictions += 1
+            self._record("DISK_CACHE_EVICTION", f"Disk cache evicted: {entry.name}")
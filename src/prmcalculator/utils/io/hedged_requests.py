@@ -0,0 +1,73 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional, TypeVar
+
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+Result = TypeVar("Result")
+
+
+def _first_successful_result(futures: Iterable[Future]):
+    pending = set(futures)
+    first_error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+            first_error = first_error or error
+    raise first_error  # type: ignore
+
+
+class HedgedRequests:
+    def __init__(
+        self,
+        latencies: LatencyHistogram,
+        max_workers: int,
+        percentile: float = 95,
+        min_samples: int = 20,
+    ):
+        self._latencies = latencies
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self.hedged = 0
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self._latencies.count < self._min_samples:
+            return None
+        return self._latencies.percentile(self._percentile)
+
+    def call(self, function: Callable[[], Result], description: str) -> Result:
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return function()
+
+        primary = self._executor.submit(function)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self.hedged += 1
+        logger.info(
+            f"Hedging slow request: {description}",
+            extra={
+                "event": "HEDGING_REQUEST",
+                "description": description,
+                "hedge_delay_seconds": hedge_delay,
+                "hedged": self.hedged,
+            },
+        )
+        hedge = self._executor.submit(function)
+        try:
+            return _first_successful_result([primary, hedge])
+        finally:
+            # A losing request that has not started yet is dropped rather than left queued.
+            hedge.cancel()
+
+    def close(self):
+        # Losing requests still running are left to finish on their own rather than awaited.
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+import json
+from hashlib import md5
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+from prmcalculator.utils.io.storage import (
+    ParquetFilters,
+    encode_json,
+    encode_parquet,
+    parameter_response,
+)
+
+
+class InMemoryDataManager:
+    def __init__(self):
+        self._objects: Dict[str, bytes] = {}
+        self._metadata: Dict[str, Dict[str, str]] = {}
+
+    def _read(self, object_uri: str) -> bytes:
+        try:
+            return self._objects[object_uri]
+        except KeyError:
+            raise FileNotFoundError(object_uri)
+
+    def fetch_parquet(
+        self, object_uri: str, columns: Optional[List[str]] = None, etag: Optional[str] = None
+    ) -> pa.NativeFile:
+        return pa.BufferReader(self._read(object_uri))
+
+    def read_parquet(
+        self,
+        object_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[ParquetFilters] = None,
+    ) -> pa.Table:
+        return pq.read_table(self.fetch_parquet(object_uri), columns=columns, filters=filters)
+
+    def _read_partition(self, object_uri: str, relative_path: str, partitioning: ds.Partitioning):
+        table = self.read_parquet(object_uri)
+        partition_keys = ds.get_partition_keys(partitioning.parse(relative_path))
+        for field in partitioning.schema:
+            values = pa.array([partition_keys[field.name]] * table.num_rows, type=field.type)
+            table = table.append_column(field, values)
+        return ds.dataset(table)
+
+    def open_parquet_dataset(self, prefix_uri: str, partitioning: ds.Partitioning) -> ds.Dataset:
+        prefix = prefix_uri.rstrip("/") + "/"
+        partitions = [
+            self._read_partition(object_uri, object_uri.replace(prefix, "", 1), partitioning)
+            for object_uri in sorted(self._objects)
+            if object_uri.startswith(prefix) and object_uri.endswith(".parquet")
+        ]
+        if not partitions:
+            raise FileNotFoundError(prefix_uri)
+        return ds.dataset(partitions)
+
+    def read_etag(self, object_uri: str) -> str:
+        return f'"{md5(self._read(object_uri)).hexdigest()}"'  # nosec
+
+    def read_json(self, object_uri: str) -> Any:
+        return json.loads(self._read(object_uri))
+
+    def read_metadata(self, object_uri: str) -> Dict[str, str]:
+        self._read(object_uri)
+        return self._metadata[object_uri]
+
+    def write_json(
+        self,
+        object_uri: str,
+        data: Any,
+        metadata: Dict[str, str],
+        log_data: bool = False,
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        self._objects[object_uri] = encode_json(data)
+        self._metadata[object_uri] = metadata
+
+    def write_json_chunks(
+        self,
+        object_uri: str,
+        chunks: Iterable[bytes],
+        metadata: Dict[str, str],
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        self._objects[object_uri] = b"".join(chunks)
+        self._metadata[object_uri] = metadata
+
+    def write_parquet(
+        self, object_uri: str, table: pa.Table, metadata: Optional[Dict[str, str]] = None
+    ):
+        self._objects[object_uri] = encode_parquet(table)
+        self._metadata[object_uri] = metadata or {}
+
+    def close(self):
+        pass
+
+
+class InMemoryParameterStore:
+    def __init__(self):
+        self._parameters: Dict[str, str] = {}
+
+    def get_parameter(self, Name: str) -> dict:
+        return parameter_response(Name, self._parameters)
+
+    def put_parameter(self, Name: str, Value: str, Type: str, Overwrite: bool):
+        self._parameters[Name] = Value
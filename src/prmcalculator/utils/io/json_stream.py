@@ -0,0 +1,61 @@
+import json
+from dataclasses import is_dataclass
+from datetime import datetime
+from typing import Any, Iterator, List, Mapping
+
+from prmcalculator.utils.io.dictionary import camelize, serializer_for
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _encode_dataclass(obj) -> Iterator[str]:
+    separator = "{"
+    for name, encoded_key in serializer_for(type(obj)).encoded_fields:
+        yield separator + encoded_key
+        yield from _encode(getattr(obj, name))
+        separator = ", "
+    yield "}" if separator == ", " else "{}"
+
+
+def _encode_mapping(obj: Mapping) -> Iterator[str]:
+    separator = "{"
+    for key, value in obj.items():
+        yield separator + json.dumps(camelize(key)) + ": "
+        yield from _encode(value)
+        separator = ", "
+    yield "}" if separator == ", " else "{}"
+
+
+def _encode_list(obj) -> Iterator[str]:
+    separator = "["
+    for value in obj:
+        yield separator
+        yield from _encode(value)
+        separator = ", "
+    yield "]" if separator == ", " else "[]"
+
+
+def _encode(obj: Any) -> Iterator[str]:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _encode_dataclass(obj)
+    if isinstance(obj, Mapping):
+        return _encode_mapping(obj)
+    if isinstance(obj, (list, tuple)):
+        return _encode_list(obj)
+    if isinstance(obj, datetime):
+        return iter([json.dumps(obj.isoformat())])
+    return iter([json.dumps(obj)])
+
+
+def encode_json_chunks(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    pending: List[str] = []
+    pending_size = 0
+    for text in _encode(data):
+        pending.append(text)
+        pending_size += len(text)
+        if pending_size >= chunk_size:
+            yield "".join(pending).encode("utf8")
+            pending = []
+            pending_size = 0
+    if pending:
+        yield "".join(pending).encode("utf8")
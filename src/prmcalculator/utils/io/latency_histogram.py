@@ -0,0 +1,58 @@
+import logging
+from bisect import bisect_right, insort
+from threading import Lock
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_BUCKET_UPPER_BOUNDS_SECONDS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+
+class LatencyHistogram:
+    def __init__(self, name: str):
+        self._name = name
+        self._lock = Lock()
+        self._sorted_seconds: List[float] = []
+
+    @property
+    def count(self) -> int:
+        return len(self._sorted_seconds)
+
+    def record(self, seconds: float):
+        with self._lock:
+            insort(self._sorted_seconds, seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        with self._lock:
+            if not self._sorted_seconds:
+                return None
+            index = round(percent / 100 * (len(self._sorted_seconds) - 1))
+            return self._sorted_seconds[index]
+
+    def buckets(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {}
+            below = 0
+            for upper_bound in _BUCKET_UPPER_BOUNDS_SECONDS:
+                within = bisect_right(self._sorted_seconds, upper_bound) - below
+                counts[f"le_{upper_bound}s"] = within
+                below += within
+            counts["gt_30.0s"] = len(self._sorted_seconds) - below
+            return counts
+
+    def log_summary(self):
+        if self.count == 0:
+            return
+        logger.info(
+            f"{self._name} latencies over {self.count} requests",
+            extra={
+                "event": "LATENCY_HISTOGRAM",
+                "histogram": self._name,
+                "count": self.count,
+                "p50_seconds": self.percentile(50),
+                "p95_seconds": self.percentile(95),
+                "p99_seconds": self.percentile(99),
+                "max_seconds": self.percentile(100),
+                "buckets": self.buckets(),
+            },
+        )
@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+from prmcalculator.utils.io.storage import (
+    ParquetFilters,
+    encode_json,
+    encode_parquet,
+    parameter_response,
+)
+
+_METADATA_SUFFIX = ".metadata.json"
+
+
+class LocalFileDataManager:
+    def __init__(self, root: Path):
+        self._root = root
+
+    def path(self, object_uri: str) -> Path:
+        uri = urlparse(object_uri)
+        return self._root / uri.netloc / uri.path.lstrip("/")
+
+    def fetch_parquet(
+        self, object_uri: str, columns: Optional[List[str]] = None, etag: Optional[str] = None
+    ) -> pa.NativeFile:
+        return pa.memory_map(str(self.path(object_uri)))
+
+    def read_parquet(
+        self,
+        object_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[ParquetFilters] = None,
+    ) -> pa.Table:
+        return pq.read_table(self.fetch_parquet(object_uri), columns=columns, filters=filters)
+
+    def open_parquet_dataset(self, prefix_uri: str, partitioning: ds.Partitioning) -> ds.Dataset:
+        return ds.dataset(str(self.path(prefix_uri)), format="parquet", partitioning=partitioning)
+
+    def read_etag(self, object_uri: str) -> str:
+        stat = self.path(object_uri).stat()
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def read_json(self, object_uri: str) -> Any:
+        return json.loads(self.path(object_uri).read_text())
+
+    def read_metadata(self, object_uri: str) -> Dict[str, str]:
+        path = self.path(object_uri)
+        return json.loads(path.with_name(path.name + _METADATA_SUFFIX).read_text())
+
+    def _write(self, object_uri: str, chunks: Iterable[bytes], metadata: Optional[Dict[str, str]]):
+        path = self.path(object_uri)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        if metadata is not None:
+            path.with_name(path.name + _METADATA_SUFFIX).write_text(json.dumps(metadata))
+
+    def write_json(
+        self,
+        object_uri: str,
+        data: Any,
+        metadata: Dict[str, str],
+        log_data: bool = False,
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        self._write(object_uri, [encode_json(data)], metadata)
+
+    def write_json_chunks(
+        self,
+        object_uri: str,
+        chunks: Iterable[bytes],
+        metadata: Dict[str, str],
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        self._write(object_uri, chunks, metadata)
+
+    def write_parquet(
+        self, object_uri: str, table: pa.Table, metadata: Optional[Dict[str, str]] = None
+    ):
+        self._write(object_uri, [encode_parquet(table)], metadata)
+
+    def close(self):
+        pass
+
+
+class LocalFileParameterStore:
+    def __init__(self, path: Path):
+        self._path = path
+
+    def get_parameter(self, Name: str) -> dict:
+        parameters = json.loads(self._path.read_text()) if self._path.exists() else {}
+        return parameter_response(Name, parameters)
+
+    def put_parameter(self, Name: str, Value: str, Type: str, Overwrite: bool):
+        parameters = json.loads(self._path.read_text()) if self._path.exists() else {}
+        parameters[Name] = Value
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(json.dumps(parameters, indent=2))
@@ -1,34 +1,116 @@
+import io
 import json
 import logging
-from datetime import datetime
-from io import BytesIO
-from typing import Dict, Union
+import time
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
+import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from botocore.exceptions import HTTPClientError, IncompleteReadError
+from pyarrow.fs import FileSystem, S3FileSystem
 from pyarrow.lib import Table
 
 from prmcalculator.domain.national.construct_national_metrics_presentation import (
     NationalMetricsPresentation,
 )
+from prmcalculator.utils.io.content_encoding import ContentEncoding, EncodedChunks, decode_body
+from prmcalculator.utils.io.disk_cache import DiskCache
+from prmcalculator.utils.io.hedged_requests import HedgedRequests
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
+from prmcalculator.utils.io.s3_ranges import RangedDownloader, read_body_into_buffer
+from prmcalculator.utils.io.storage import (
+    ParquetFilters,
+    encode_json,
+    encode_parquet,
+    parquet_columns_to_fetch,
+)
+from prmcalculator.utils.retry import RetryPolicy, retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+_RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "PreconditionFailed",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+}
+
+
+_NOT_FOUND_ERROR_CODES = {"404", "NoSuchKey", "NotFound"}
+
+_DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def _is_not_found_error(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in _NOT_FOUND_ERROR_CODES
+
+
+def _is_retryable_read_error(error: Exception) -> bool:
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in _RETRYABLE_ERROR_CODES
+    return isinstance(error, (BotoConnectionError, HTTPClientError, IncompleteReadError))
+
 
-def _serialize_datetime(obj):
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} is not JSON serializable")
+def _json_upload_args(metadata: Dict[str, str], encoded_chunks: EncodedChunks) -> dict:
+    upload_args = {"ContentType": "application/json", "Metadata": metadata}
+    if encoded_chunks.content_encoding != ContentEncoding.IDENTITY:
+        upload_args["ContentEncoding"] = encoded_chunks.content_encoding.value
+    return upload_args
+
+
+class _ChunkReader(io.RawIOBase):
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
 
 
 class S3DataManager:
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        disk_cache: Optional[DiskCache] = None,
+        filesystem: Optional[FileSystem] = None,
+        retry_policy: RetryPolicy = _DEFAULT_RETRY_POLICY,
+        read_latencies: Optional[LatencyHistogram] = None,
+        hedged_requests: Optional[HedgedRequests] = None,
+        ranged_downloader: Optional[RangedDownloader] = None,
+    ):
         self._client = client
+        self._disk_cache = disk_cache
+        self._filesystem = filesystem
+        self._retry_policy = retry_policy
+        self._read_latencies = read_latencies
+        self._hedged_requests = hedged_requests
+        self._ranged_downloader = ranged_downloader
 
-    def _object_from_uri(self, uri: str):
+    @staticmethod
+    def _bucket_and_key_from_uri(uri: str) -> Tuple[str, str]:
         object_url = urlparse(uri)
-        s3_bucket = object_url.netloc
-        s3_key = object_url.path.lstrip("/")
+        return object_url.netloc, object_url.path.lstrip("/")
+
+    def _object_from_uri(self, uri: str):
+        s3_bucket, s3_key = self._bucket_and_key_from_uri(uri)
         return self._client.Object(s3_bucket, s3_key)
 
     def read_json(self, object_uri: str):
@@ -47,7 +129,7 @@ class S3DataManager:
             )
             raise FileNotFoundError(object_uri)
 
-        body = response["Body"].read()
+        body = decode_body(response["Body"].read(), response.get("ContentEncoding"))
         return json.loads(body.decode("utf8"))
 
     def write_json(
@@ -56,14 +138,16 @@ class S3DataManager:
         data: Union[dict, NationalMetricsPresentation],
         metadata: Dict[str, str],
         log_data: bool = False,
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
     ):
         logger.info(
             "Attempting to upload: " + object_uri,
             extra={"event": "ATTEMPTING_UPLOAD_JSON_TO_S3", "object_uri": object_uri},
         )
         s3_object = self._object_from_uri(object_uri)
-        body = json.dumps(data, default=_serialize_datetime).encode("utf8")
-        s3_object.put(Body=body, ContentType="application/json", Metadata=metadata)
+        encoded_chunks = EncodedChunks([encode_json(data)], content_encoding)
+        s3_object.put(Body=b"".join(encoded_chunks), **_json_upload_args(metadata, encoded_chunks))
+        encoded_chunks.log_ratio(object_uri)
         if log_data:
             logger.info(
                 "Successfully uploaded to: " + object_uri,
@@ -79,21 +163,184 @@ class S3DataManager:
                 extra={"event": "UPLOADED_JSON_TO_S3", "object_uri": object_uri},
             )
 
-    def read_parquet(self, object_uri: str) -> Table:
+    def write_json_chunks(
+        self,
+        object_uri: str,
+        chunks: Iterable[bytes],
+        metadata: Dict[str, str],
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_JSON_TO_S3", "object_uri": object_uri},
+        )
+        s3_object = self._object_from_uri(object_uri)
+        encoded_chunks = EncodedChunks(chunks, content_encoding)
+        s3_object.upload_fileobj(
+            io.BufferedReader(_ChunkReader(encoded_chunks)),
+            ExtraArgs=_json_upload_args(metadata, encoded_chunks),
+        )
+        encoded_chunks.log_ratio(object_uri)
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={"event": "UPLOADED_JSON_TO_S3", "object_uri": object_uri},
+        )
+
+    def write_parquet(
+        self, object_uri: str, table: pa.Table, metadata: Optional[Dict[str, str]] = None
+    ):
+        logger.info(
+            "Attempting to upload: " + object_uri,
+            extra={"event": "ATTEMPTING_UPLOAD_PARQUET_TO_S3", "object_uri": object_uri},
+        )
+        self._object_from_uri(object_uri).put(
+            Body=encode_parquet(table),
+            ContentType="application/vnd.apache.parquet",
+            Metadata=metadata or {},
+        )
+        logger.info(
+            "Successfully uploaded to: " + object_uri,
+            extra={"event": "UPLOADED_PARQUET_TO_S3", "object_uri": object_uri},
+        )
+
+    def close(self):
+        if self._hedged_requests is not None:
+            self._hedged_requests.close()
+        if self._ranged_downloader is not None:
+            self._ranged_downloader.close()
+
+    def open_parquet_dataset(self, prefix_uri: str, partitioning: ds.Partitioning) -> ds.Dataset:
+        logger.info(
+            "Discovering files under: " + prefix_uri,
+            extra={"event": "LISTING_FILES_IN_S3", "prefix_uri": prefix_uri},
+        )
+        s3_bucket, s3_prefix = self._bucket_and_key_from_uri(prefix_uri)
+        return ds.dataset(
+            f"{s3_bucket}/{s3_prefix}",
+            filesystem=self._filesystem or S3FileSystem(),
+            format="parquet",
+            partitioning=partitioning,
+        )
+
+    def _head_object(self, object_uri: str) -> dict:
+        s3_bucket, s3_key = self._bucket_and_key_from_uri(object_uri)
+        s3_client = self._client.meta.client
+        try:
+            return retry_with_backoff(
+                partial(s3_client.head_object, Bucket=s3_bucket, Key=s3_key),
+                self._retry_policy,
+                is_retryable=_is_retryable_read_error,
+                on_retry=partial(self._log_retry, object_uri),
+            )
+        except ClientError as error:
+            if _is_not_found_error(error):
+                raise FileNotFoundError(object_uri)
+            raise
+
+    def read_etag(self, object_uri: str) -> str:
+        try:
+            return self._head_object(object_uri)["ETag"]
+        except FileNotFoundError:
+            logger.error(
+                f"File not found: {object_uri}, exiting...",
+                extra={"event": "FILE_NOT_FOUND_IN_S3"},
+            )
+            raise
+
+    def read_metadata(self, object_uri: str) -> Dict[str, str]:
+        return self._head_object(object_uri)["Metadata"]
+
+    def fetch_parquet(
+        self, object_uri: str, columns: Optional[List[str]] = None, etag: Optional[str] = None
+    ) -> pa.NativeFile:
         logger.info(
             "Reading file from: " + object_uri,
             extra={"event": "READING_FILE_FROM_S3", "object_uri": object_uri},
         )
-        s3_object = self._object_from_uri(object_uri)
+        s3_bucket, s3_key = self._bucket_and_key_from_uri(object_uri)
+
+        if self._disk_cache is None:
+            body, _ = self._download(object_uri, columns)
+            return pa.BufferReader(body)
+
+        if etag is None:
+            etag = self.read_etag(object_uri)
+        cached_file = self._disk_cache.get(s3_bucket, s3_key, etag)
+        if cached_file is not None:
+            return cached_file
+
+        body, etag = self._download(object_uri)
+        self._disk_cache.put(s3_bucket, s3_key, etag, body)
+        return pa.BufferReader(body)
+
+    def read_parquet(
+        self,
+        object_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[ParquetFilters] = None,
+    ) -> Table:
+        parquet_file = self.fetch_parquet(object_uri, parquet_columns_to_fetch(columns, filters))
+        return pq.read_table(parquet_file, columns=columns, filters=filters)
+
+    def _download(
+        self, object_uri: str, columns: Optional[List[str]] = None
+    ) -> Tuple[pa.Buffer, str]:
+        return retry_with_backoff(
+            partial(self._hedged_get_object, object_uri, columns),
+            self._retry_policy,
+            is_retryable=_is_retryable_read_error,
+            on_retry=partial(self._log_retry, object_uri),
+        )
 
+    @staticmethod
+    def _log_retry(object_uri: str, attempt: int, delay: float, error: Exception):
+        logger.warning(
+            f"Retrying read of {object_uri} after attempt {attempt} failed: {error}",
+            extra={
+                "event": "RETRYING_S3_READ",
+                "object_uri": object_uri,
+                "attempt": attempt,
+                "delay_seconds": delay,
+            },
+        )
+
+    def _hedged_get_object(
+        self, object_uri: str, columns: Optional[List[str]]
+    ) -> Tuple[pa.Buffer, str]:
+        if self._hedged_requests is None:
+            return self._get_object(object_uri, columns)
+        return self._hedged_requests.call(
+            partial(self._get_object, object_uri, columns), description=object_uri
+        )
+
+    def _get_object(self, object_uri: str, columns: Optional[List[str]]) -> Tuple[pa.Buffer, str]:
+        started = time.monotonic()
+        s3_bucket, s3_key = self._bucket_and_key_from_uri(object_uri)
+
+        # Parquet files may be read from several threads at once, and unlike the
+        # resource API the underlying low-level client is safe to share between threads.
+        s3_client = self._client.meta.client
         try:
-            response = s3_object.get()
-        except self._client.meta.client.exceptions.NoSuchKey:
+            body, etag = self._fetch_object(s3_client, s3_bucket, s3_key, columns)
+        except s3_client.exceptions.NoSuchKey:
             logger.error(
                 f"File not found: {object_uri}, exiting...",
                 extra={"event": "FILE_NOT_FOUND_IN_S3"},
             )
             raise FileNotFoundError(object_uri)
 
-        body = BytesIO(response["Body"].read())
-        return pq.read_table(body)
+        if self._read_latencies is not None:
+            self._read_latencies.record(time.monotonic() - started)
+        return body, etag
+
+    def _fetch_object(
+        self, s3_client, s3_bucket: str, s3_key: str, columns: Optional[List[str]]
+    ) -> Tuple[pa.Buffer, str]:
+        if self._ranged_downloader is not None:
+            return self._ranged_downloader.download(s3_client, s3_bucket, s3_key, columns)
+
+        response = s3_client.get_object(Bucket=s3_bucket, Key=s3_key)
+        # Reading the body straight into one Arrow buffer means the compressed file is held
+        # once while decoding, rather than as bytes and again as a copy inside BytesIO.
+        body = read_body_into_buffer(response["Body"], response["ContentLength"])
+        return body, response["ETag"]
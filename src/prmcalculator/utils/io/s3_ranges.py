@@ -0,0 +1,157 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError, IncompleteReadError
+
+_FALLBACK_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_chunk_into(body, view: memoryview) -> int:
+    if hasattr(body, "readinto"):
+        return body.readinto(view)
+    # Older botocore streaming bodies can only read into new bytes objects.
+    chunk = body.read(min(len(view), _FALLBACK_READ_CHUNK_SIZE))
+    view[: len(chunk)] = chunk
+    return len(chunk)
+
+
+def read_body_into(body, view: memoryview) -> int:
+    bytes_read = 0
+    while bytes_read < len(view):
+        chunk_size = _read_chunk_into(body, view[bytes_read:])
+        if not chunk_size:
+            break
+        bytes_read += chunk_size
+    return bytes_read
+
+
+def _read_exactly_into(body, view: memoryview):
+    bytes_read = read_body_into(body, view)
+    if bytes_read != len(view):
+        raise IncompleteReadError(actual_bytes=bytes_read, expected_bytes=len(view))
+
+
+def read_body_into_buffer(body, content_length: int) -> pa.Buffer:
+    buffer = pa.allocate_buffer(content_length)
+    _read_exactly_into(body, memoryview(buffer).cast("B"))
+    return buffer
+
+
+_FOOTER_READ_SIZE = 64 * 1024
+_PARQUET_TRAILER_SIZE = 8
+_MAX_RANGE_GAP = 1024 * 1024
+
+ByteRange = Tuple[int, int]
+
+
+def _byte_range(start: int, end: int) -> str:
+    return f"bytes={start}-{end - 1}"
+
+
+def _get_object_range(s3_client, bucket: str, key: str, byte_range: str) -> dict:
+    try:
+        return s3_client.get_object(Bucket=bucket, Key=key, Range=byte_range)
+    except ClientError as error:
+        # S3 rejects every range of an empty object, which can only be read whole.
+        if error.response.get("Error", {}).get("Code") != "InvalidRange":
+            raise
+        return s3_client.get_object(Bucket=bucket, Key=key)
+
+
+def _object_size(response) -> int:
+    if "ContentRange" in response:
+        return int(response["ContentRange"].rsplit("/", 1)[1])
+    return response["ContentLength"]
+
+
+def _column_chunk_range(column_chunk) -> ByteRange:
+    start = column_chunk.data_page_offset
+    if column_chunk.has_dictionary_page and column_chunk.dictionary_page_offset is not None:
+        start = min(start, column_chunk.dictionary_page_offset)
+    return start, start + column_chunk.total_compressed_size
+
+
+def _column_ranges(metadata: pq.FileMetaData, column_names: Set[str]) -> List[ByteRange]:
+    return [
+        _column_chunk_range(row_group.column(index))
+        for row_group in map(metadata.row_group, range(metadata.num_row_groups))
+        for index in range(row_group.num_columns)
+        if row_group.column(index).path_in_schema.split(".")[0] in column_names
+    ]
+
+
+def _coalesce(ranges: Iterable[ByteRange], max_gap: int) -> List[ByteRange]:
+    coalesced: List[ByteRange] = []
+    for start, end in sorted(ranges):
+        if coalesced and start - coalesced[-1][1] <= max_gap:
+            coalesced[-1] = (coalesced[-1][0], max(end, coalesced[-1][1]))
+        else:
+            coalesced.append((start, end))
+    return coalesced
+
+
+class RangedDownloader:
+    def __init__(self, part_size: int, max_workers: int, footer_first: bool = False):
+        self._part_size = part_size
+        self._footer_first = footer_first
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _download_range(self, s3_client, bucket: str, key: str, etag: str, view, byte_range):
+        start, end = byte_range
+        response = s3_client.get_object(
+            Bucket=bucket, Key=key, Range=_byte_range(start, end), IfMatch=etag
+        )
+        _read_exactly_into(response["Body"], view[start:end])
+
+    def _download_ranges(self, s3_client, bucket, key, etag, view, byte_ranges: List[ByteRange]):
+        download_range = partial(self._download_range, s3_client, bucket, key, etag, view)
+        list(self._executor.map(download_range, byte_ranges))
+
+    def download(
+        self, s3_client, bucket: str, key: str, columns: Optional[List[str]] = None
+    ) -> Tuple[pa.Buffer, str]:
+        if self._footer_first and columns is not None:
+            return self._download_columns(s3_client, bucket, key, set(columns))
+
+        first_part = _get_object_range(s3_client, bucket, key, _byte_range(0, self._part_size))
+        etag = first_part["ETag"]
+        buffer = pa.allocate_buffer(_object_size(first_part))
+        view = memoryview(buffer).cast("B")
+        _read_exactly_into(first_part["Body"], view[: first_part["ContentLength"]])
+
+        part_ranges = [
+            (start, min(start + self._part_size, len(view)))
+            for start in range(first_part["ContentLength"], len(view), self._part_size)
+        ]
+        self._download_ranges(s3_client, bucket, key, etag, view, part_ranges)
+        return buffer, etag
+
+    def _download_columns(
+        self, s3_client, bucket: str, key: str, column_names: Set[str]
+    ) -> Tuple[pa.Buffer, str]:
+        # The buffer spans the whole object so Parquet offsets can be used as they are, but only
+        # the footer and the chunks of the requested columns are fetched and written into it.
+        footer = _get_object_range(s3_client, bucket, key, f"bytes=-{_FOOTER_READ_SIZE}")
+        etag = footer["ETag"]
+        buffer = pa.allocate_buffer(_object_size(footer))
+        view = memoryview(buffer).cast("B")
+        footer_start = len(view) - footer["ContentLength"]
+        _read_exactly_into(footer["Body"], view[footer_start:])
+        if footer_start == 0:
+            return buffer, etag
+
+        metadata_size = int.from_bytes(view[-_PARQUET_TRAILER_SIZE:-4], "little")
+        metadata_start = len(view) - _PARQUET_TRAILER_SIZE - metadata_size
+        if metadata_start < footer_start:
+            self._download_range(s3_client, bucket, key, etag, view, (metadata_start, footer_start))
+
+        metadata = pq.read_metadata(pa.BufferReader(buffer))
+        column_ranges = _coalesce(_column_ranges(metadata, column_names), _MAX_RANGE_GAP)
+        self._download_ranges(s3_client, bucket, key, etag, view, column_ranges)
+        return buffer, etag
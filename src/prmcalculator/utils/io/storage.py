@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+
+ParquetFilters = List[Tuple[str, str, Any]]
+
+
+def _serialize_datetime(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type {type(obj)} is not JSON serializable")
+
+
+def encode_json(data) -> bytes:
+    return json.dumps(data, default=_serialize_datetime).encode("utf8")
+
+
+def encode_parquet(table: pa.Table) -> bytes:
+    writer = pa.BufferOutputStream()
+    pq.write_table(table, writer)
+    return writer.getvalue().to_pybytes()
+
+
+def parquet_columns_to_fetch(
+    columns: Optional[List[str]], filters: Optional[ParquetFilters]
+) -> Optional[List[str]]:
+    if columns is None:
+        return None
+    return columns + [column for column, _, _ in filters or []]
+
+
+class StorageBackend(Protocol):
+    def read_parquet(
+        self,
+        object_uri: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[ParquetFilters] = None,
+    ) -> pa.Table:
+        ...
+
+    def fetch_parquet(
+        self, object_uri: str, columns: Optional[List[str]] = None, etag: Optional[str] = None
+    ) -> pa.NativeFile:
+        ...
+
+    def open_parquet_dataset(self, prefix_uri: str, partitioning: ds.Partitioning) -> ds.Dataset:
+        ...
+
+    def read_etag(self, object_uri: str) -> str:
+        ...
+
+    def read_json(self, object_uri: str) -> Any:
+        ...
+
+    def read_metadata(self, object_uri: str) -> Dict[str, str]:
+        ...
+
+    def write_json(
+        self,
+        object_uri: str,
+        data: Any,
+        metadata: Dict[str, str],
+        log_data: bool = False,
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        ...
+
+    def write_json_chunks(
+        self,
+        object_uri: str,
+        chunks: Iterable[bytes],
+        metadata: Dict[str, str],
+        content_encoding: ContentEncoding = ContentEncoding.IDENTITY,
+    ):
+        ...
+
+    def write_parquet(
+        self, object_uri: str, table: pa.Table, metadata: Optional[Dict[str, str]] = None
+    ):
+        ...
+
+    def close(self):
+        ...
+
+
+class ParameterStore(Protocol):
+    def get_parameter(self, Name: str) -> dict:
+        ...
+
+    def put_parameter(self, Name: str, Value: str, Type: str, Overwrite: bool) -> Any:
+        ...
+
+
+def parameter_response(name: str, parameters: Dict[str, str]) -> dict:
+    if name not in parameters:
+        raise ClientError({"Error": {"Code": "ParameterNotFound", "Message": name}}, "GetParameter")
+    return {"Parameter": {"Name": name, "Value": parameters[name]}}
@@ -0,0 +1,40 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+Result = TypeVar("Result")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 1
+    base_delay_seconds: float = 0.1
+    max_delay_seconds: float = 5.0
+
+    def backoff_delay(self, attempt: int, jitter: Callable[[], float] = random.random) -> float:
+        return jitter() * min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+
+
+def _ignore_retry(attempt: int, delay: float, error: Exception):
+    pass
+
+
+def retry_with_backoff(
+    function: Callable[[], Result],
+    policy: RetryPolicy,
+    is_retryable: Callable[[Exception], bool],
+    on_retry: Callable[[int, float, Exception], None] = _ignore_retry,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Result:
+    attempt = 1
+    while True:
+        try:
+            return function()
+        except Exception as error:
+            if attempt >= policy.max_attempts or not is_retryable(error):
+                raise
+            delay = policy.backoff_delay(attempt - 1)
+            on_retry(attempt, delay, error)
+            sleep(delay)
+            attempt += 1
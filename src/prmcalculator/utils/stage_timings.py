@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, TypeVar
+
+Item = TypeVar("Item")
+
+
+class StageTimings:
+    def __init__(self):
+        self._seconds_by_stage: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - started_at
+            self._seconds_by_stage[name] = self._seconds_by_stage.get(name, 0.0) + elapsed
+
+    def iterate(self, name: str, items: Iterable[Item]) -> Iterator[Item]:
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 6) for name, seconds in self._seconds_by_stage.items()}
+
+    @property
+    def total_seconds(self) -> float:
+        return round(sum(self._seconds_by_stage.values()), 6)
@@ -0,0 +1,191 @@
+import logging
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Generator, Iterable, Iterator, List
+
+from prmcalculator.utils.concurrent_map import concurrent_map
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    function: Callable[[Any], Any]
+    max_workers: int = 1
+
+
+class StageMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.idle_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self._total_queue_depth = 0
+        self._queue_depth_samples = 0
+        self._lock = Lock()
+
+    def record_busy(self, seconds: float):
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+
+    def record_queue_depth(self, depth: int):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._total_queue_depth += depth
+        self._queue_depth_samples += 1
+
+    @property
+    def mean_queue_depth(self) -> float:
+        if self._queue_depth_samples == 0:
+            return 0.0
+        return self._total_queue_depth / self._queue_depth_samples
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "idle_seconds": round(self.idle_seconds, 6),
+            "blocked_seconds": round(self.blocked_seconds, 6),
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": round(self.mean_queue_depth, 3),
+        }
+
+
+class _End:
+    pass
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _StageRunner(Thread):
+    def __init__(
+        self, stage: Stage, metrics: StageMetrics, inputs: Iterable, output: Queue, stopped: Event
+    ):
+        super().__init__(name=f"pipeline-{stage.name}", daemon=True)
+        self._stage = stage
+        self._metrics = metrics
+        self._inputs = inputs
+        self._output = output
+        self._stopped = stopped
+
+    def _timed(self, item):
+        started_at = perf_counter()
+        result = self._stage.function(item)
+        self._metrics.record_busy(perf_counter() - started_at)
+        return result
+
+    def _put(self, item):
+        started_at = perf_counter()
+        while True:
+            try:
+                self._output.put(item, timeout=_POLL_SECONDS)
+                break
+            except Full:
+                if self._stopped.is_set():
+                    raise _Stopped()
+        self._metrics.blocked_seconds += perf_counter() - started_at
+        self._metrics.record_queue_depth(self._output.qsize())
+
+    def _timed_inputs(self) -> Iterator:
+        inputs = iter(self._inputs)
+        while True:
+            started_at = perf_counter()
+            item = next(inputs, _End)
+            self._metrics.idle_seconds += perf_counter() - started_at
+            if item is _End:
+                return
+            yield item
+
+    def _process(self):
+        results: Generator = concurrent_map(  # type: ignore
+            self._timed, self._timed_inputs(), self._stage.max_workers
+        )
+        try:
+            for result in results:
+                self._put(result)
+        finally:
+            results.close()
+        self._put(_End)
+
+    def _process_or_forward_failure(self):
+        try:
+            self._process()
+        except _Stopped:
+            raise
+        except BaseException as error:
+            self._put(_Failure(error))
+
+    def run(self):
+        try:
+            self._process_or_forward_failure()
+        except _Stopped:
+            pass
+
+
+def _next_queued(queue: Queue, stopped: Event):
+    while not stopped.is_set():
+        try:
+            return queue.get(timeout=_POLL_SECONDS)
+        except Empty:
+            continue
+    raise _Stopped()
+
+
+def _queued_items(queue: Queue, stopped: Event) -> Iterator:
+    while True:
+        item = _next_queued(queue, stopped)
+        if item is _End:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+class StagedPipeline:
+    def __init__(self, stages: List[Stage], queue_size: int):
+        self._stages = stages
+        self._queue_size = queue_size
+        self.metrics = [StageMetrics(stage.name) for stage in stages]
+
+    def run(self, items: Iterable) -> Generator:
+        stopped = Event()
+        inputs: Iterable = items
+        runners = []
+        for stage, metrics in zip(self._stages, self.metrics):
+            output: Queue = Queue(maxsize=self._queue_size)
+            runners.append(_StageRunner(stage, metrics, inputs, output, stopped))
+            inputs = _queued_items(output, stopped)
+        for runner in runners:
+            runner.start()
+        try:
+            yield from inputs
+        finally:
+            stopped.set()
+            for runner in runners:
+                runner.join()
+
+    def log_metrics(self, description: str):
+        for metrics in self.metrics:
+            logger.info(
+                f"{description} pipeline stage {metrics.name} processed {metrics.items} items",
+                extra={
+                    "event": "PIPELINE_STAGE_METRICS",
+                    "pipeline": description,
+                    **metrics.to_dict(),
+                },
+            )
@@ -1,4 +1,7 @@
 from datetime import timedelta
+from typing import List
+
+import pyarrow as pa
 
 from prmcalculator.domain.gp2gp.sla import EIGHT_DAYS_IN_SECONDS, THREE_DAYS_IN_SECONDS
 from prmcalculator.domain.gp2gp.transfer import (
@@ -203,3 +206,48 @@ def a_transfer_where_a_copc_triggered_an_error(**kwargs):
         ),
         date_requested=kwargs.get("date_requested", a_datetime()),
     )
+
+
+_TRANSFER_TABLE_SCHEMA = pa.schema(
+    [
+        ("conversation_id", pa.string()),
+        ("sla_duration", pa.uint64()),
+        ("requesting_practice_asid", pa.string()),
+        ("requesting_supplier", pa.string()),
+        ("status", pa.string()),
+        ("failure_reason", pa.string()),
+        ("date_requested", pa.timestamp("us", tz="utc")),
+        ("last_sender_message_timestamp", pa.timestamp("us", tz="utc")),
+        ("requesting_practice_name", pa.string()),
+        ("requesting_practice_ods_code", pa.string()),
+        ("requesting_practice_sicbl_name", pa.string()),
+        ("requesting_practice_sicbl_ods_code", pa.string()),
+    ]
+)
+
+
+def build_transfer_table(transfers: List[Transfer]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [
+            {
+                "conversation_id": transfer.conversation_id,
+                "sla_duration": None
+                if transfer.sla_duration is None
+                else int(transfer.sla_duration.total_seconds()),
+                "requesting_practice_asid": transfer.requesting_practice.asid,
+                "requesting_supplier": transfer.requesting_practice.supplier,
+                "status": transfer.outcome.status.value,
+                "failure_reason": None
+                if transfer.outcome.failure_reason is None
+                else transfer.outcome.failure_reason.value,
+                "date_requested": transfer.date_requested,
+                "last_sender_message_timestamp": transfer.last_sender_message_timestamp,
+                "requesting_practice_name": transfer.requesting_practice.name,
+                "requesting_practice_ods_code": transfer.requesting_practice.ods_code,
+                "requesting_practice_sicbl_name": transfer.requesting_practice.sicbl_name,
+                "requesting_practice_sicbl_ods_code": transfer.requesting_practice.sicbl_ods_code,
+            }
+            for transfer in transfers
+        ],
+        schema=_TRANSFER_TABLE_SCHEMA,
+    )
@@ -190,20 +190,7 @@ def _get_ssm_param(ssm_parameter_name):
     return param["Parameter"]["Value"]
 
 
-@pytest.mark.filterwarnings("ignore:Conversion of")
-@mock_ssm
-@mock.patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": FAKE_S3_ACCESS_KEY})
-def test_reads_daily_input_files_and_outputs_metrics_to_s3_including_slow_transfers(datadir):
-    fake_s3, s3_client = _setup()
-    fake_s3.start()
-
-    environ["NUMBER_OF_MONTHS"] = "2"
-    environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
-
-    output_metrics_bucket = _build_fake_s3_bucket(S3_OUTPUT_METRICS_BUCKET_NAME, s3_client)
-
-    input_transfer_bucket = _build_fake_s3_bucket(S3_INPUT_TRANSFER_DATA_BUCKET_NAME, s3_client)
-
+def _upload_transfer_data_including_slow_transfers(datadir):
     _upload_template_transfer_data(
         datadir,
         S3_INPUT_TRANSFER_DATA_BUCKET_NAME,
@@ -238,6 +225,37 @@ def test_reads_daily_input_files_and_outputs_metrics_to_s3_including_slow_transf
             input_folder="inputs/daily_including_slow_transfers",
         )
 
+
+@pytest.mark.filterwarnings("ignore:Conversion of")
+@pytest.mark.parametrize(
+    "metrics_engine, transfer_data_discovery",
+    [
+        ("transfers", "daily"),
+        ("fused", "daily"),
+        ("arrow", "daily"),
+        ("transfers", "dataset"),
+        ("arrow", "dataset"),
+    ],
+)
+@mock_ssm
+@mock.patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": FAKE_S3_ACCESS_KEY})
+def test_reads_daily_input_files_and_outputs_metrics_to_s3_including_slow_transfers(
+    datadir, metrics_engine, transfer_data_discovery
+):
+    fake_s3, s3_client = _setup()
+    fake_s3.start()
+
+    environ["NUMBER_OF_MONTHS"] = "2"
+    environ["DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+    environ["METRICS_ENGINE"] = metrics_engine
+    environ["TRANSFER_DATA_DISCOVERY"] = transfer_data_discovery
+
+    output_metrics_bucket = _build_fake_s3_bucket(S3_OUTPUT_METRICS_BUCKET_NAME, s3_client)
+
+    input_transfer_bucket = _build_fake_s3_bucket(S3_INPUT_TRANSFER_DATA_BUCKET_NAME, s3_client)
+
+    _upload_transfer_data_including_slow_transfers(datadir)
+
     expected_practice_metrics_output_key = "2019-12-practiceMetrics.json"
 
     expected_practice_metrics_including_slow_transfers = _read_json(
@@ -287,8 +305,11 @@ def test_reads_daily_input_files_and_outputs_metrics_to_s3_including_slow_transf
         )
         assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
 
-        assert actual_practice_metrics_s3_metadata_including_slow_transfers == expected_metadata
-        assert actual_national_metrics_s3_metadata == expected_metadata
+        assert actual_practice_metrics_s3_metadata_including_slow_transfers == {
+            **expected_metadata,
+            "content-hash": ANY,
+        }
+        assert actual_national_metrics_s3_metadata == {**expected_metadata, "content-hash": ANY}
 
         national_metrics_s3_uri_ssm_value = _get_ssm_param(NATIONAL_METRICS_S3_PATH_PARAM_NAME)
         assert national_metrics_s3_uri_ssm_value == "2019/12/2019-12-nationalMetrics.json"
@@ -301,6 +322,65 @@ def test_reads_daily_input_files_and_outputs_metrics_to_s3_including_slow_transf
         environ.clear()
 
 
+@pytest.mark.filterwarnings("ignore:Conversion of")
+@pytest.mark.parametrize("metrics_engine", ["transfers", "arrow"])
+@mock_ssm
+@mock.patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": FAKE_S3_ACCESS_KEY})
+def test_backfill_outputs_metrics_for_every_date_anchor_matching_single_runs(
+    datadir, metrics_engine
+):
+    fake_s3, s3_client = _setup()
+    fake_s3.start()
+
+    output_metrics_bucket = _build_fake_s3_bucket(S3_OUTPUT_METRICS_BUCKET_NAME, s3_client)
+    input_transfer_bucket = _build_fake_s3_bucket(S3_INPUT_TRANSFER_DATA_BUCKET_NAME, s3_client)
+    _upload_transfer_data_including_slow_transfers(datadir)
+
+    environ["NUMBER_OF_MONTHS"] = "1"
+    environ["METRICS_ENGINE"] = metrics_engine
+    s3_metrics_output_paths = [
+        "v12/2019/11/2019-11-nationalMetrics.json",
+        "v12/2019/11/2019-11-practiceMetrics.json",
+        "v12/2019/12/2019-12-nationalMetrics.json",
+        "v12/2019/12/2019-12-practiceMetrics.json",
+    ]
+
+    try:
+        single_run_outputs = []
+        for date_anchor in ["2019-12-30T18:44:49Z", "2020-01-30T18:44:49Z"]:
+            environ["DATE_ANCHOR"] = date_anchor
+            main()
+        for path in s3_metrics_output_paths:
+            single_run_outputs.append(_read_s3_json(output_metrics_bucket, path))
+
+        _delete_bucket_with_objects(output_metrics_bucket)
+        output_metrics_bucket = _build_fake_s3_bucket(S3_OUTPUT_METRICS_BUCKET_NAME, s3_client)
+        environ["DATE_ANCHOR"] = "2019-12-30T18:44:49Z"
+        environ["BACKFILL_END_DATE_ANCHOR"] = "2020-01-30T18:44:49Z"
+        main()
+
+        for path, single_run_output in zip(s3_metrics_output_paths, single_run_outputs):
+            backfill_output = _read_s3_json(output_metrics_bucket, path)
+            del backfill_output["generatedOn"], single_run_output["generatedOn"]
+            assert backfill_output == single_run_output
+
+        assert (
+            _read_s3_metadata(output_metrics_bucket, s3_metrics_output_paths[0])["date-anchor"]
+            == "2019-12-30T18:44:49+00:00"
+        )
+        assert (
+            _read_s3_metadata(output_metrics_bucket, s3_metrics_output_paths[2])["date-anchor"]
+            == "2020-01-30T18:44:49+00:00"
+        )
+        national_metrics_s3_uri_ssm_value = _get_ssm_param(NATIONAL_METRICS_S3_PATH_PARAM_NAME)
+        assert national_metrics_s3_uri_ssm_value == "2019/12/2019-12-nationalMetrics.json"
+    finally:
+        _delete_bucket_with_objects(output_metrics_bucket)
+        _delete_bucket_with_objects(input_transfer_bucket)
+        fake_s3.stop()
+        environ.clear()
+
+
 def test_exception_in_main():
     with mock.patch.object(sys, "exit") as exitSpy:
         with mock.patch.object(logger, "error") as mock_log_error:
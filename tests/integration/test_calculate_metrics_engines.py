@@ -0,0 +1,193 @@
+import pickle
+import random
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from freezegun import freeze_time
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from prmcalculator.domain.national.calculate_national_metrics_data import (
+    calculate_national_metrics_data,
+    calculate_national_metrics_data_from_aggregate,
+    calculate_national_metrics_data_from_table,
+)
+from prmcalculator.domain.practice.calculate_practice_metrics import (
+    calculate_practice_metrics,
+    calculate_practice_metrics_from_aggregate,
+    calculate_practice_metrics_from_table,
+)
+from prmcalculator.domain.reporting_window import ReportingWindow
+from tests.builders.common import a_datetime
+from tests.builders.gp2gp import (
+    a_transfer_integrated_between_3_and_8_days,
+    a_transfer_integrated_beyond_8_days,
+    a_transfer_integrated_within_3_days,
+    a_transfer_that_was_never_integrated,
+    a_transfer_where_a_copc_triggered_an_error,
+    a_transfer_where_the_request_was_never_acknowledged,
+    a_transfer_with_a_final_error,
+    build_practice_details,
+    build_transfer_table,
+)
+
+_TRANSFER_BUILDERS = [
+    a_transfer_integrated_within_3_days,
+    a_transfer_integrated_between_3_and_8_days,
+    a_transfer_integrated_beyond_8_days,
+    a_transfer_that_was_never_integrated,
+    a_transfer_where_a_copc_triggered_an_error,
+    a_transfer_where_the_request_was_never_acknowledged,
+    a_transfer_with_a_final_error,
+]
+
+_PRACTICES = [build_practice_details() for _ in range(5)] + [
+    build_practice_details(ods_code=None),
+    build_practice_details(sicbl_ods_code=None),
+]
+
+
+def _a_mix_of_transfers(count):
+    transfers = []
+    for _ in range(count):
+        build_a_transfer = random.choice(_TRANSFER_BUILDERS)
+        transfer = build_a_transfer(
+            date_requested=a_datetime(year=2021, month=random.choice([5, 6, 7]))
+        )
+        transfers.append(transfer._replace(requesting_practice=random.choice(_PRACTICES)))
+    return transfers
+
+
+@freeze_time(datetime(year=2021, month=8, day=2))
+def test_table_engine_calculates_same_metrics_as_transfer_engine():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+    transfers = _a_mix_of_transfers(500)
+    transfer_table = build_transfer_table(transfers)
+
+    expected_national_metrics = calculate_national_metrics_data(
+        transfers, reporting_window, observability_probe=Mock()
+    )
+    expected_practice_metrics = calculate_practice_metrics(
+        transfers, reporting_window, observability_probe=Mock()
+    )
+
+    actual_national_metrics = calculate_national_metrics_data_from_table(
+        transfer_table, reporting_window, observability_probe=Mock()
+    )
+    actual_practice_metrics = calculate_practice_metrics_from_table(
+        transfer_table, reporting_window, observability_probe=Mock()
+    )
+
+    assert actual_national_metrics == expected_national_metrics
+    assert actual_practice_metrics == expected_practice_metrics
+
+
+def test_table_engine_reports_the_same_unknown_practices_as_transfer_engine():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+    transfers = _a_mix_of_transfers(100)
+    transfer_probe = Mock()
+    table_probe = Mock()
+
+    calculate_practice_metrics(transfers, reporting_window, observability_probe=transfer_probe)
+    calculate_practice_metrics_from_table(
+        build_transfer_table(transfers), reporting_window, observability_probe=table_probe
+    )
+
+    assert table_probe.mock_calls == transfer_probe.mock_calls
+
+
+@freeze_time(datetime(year=2021, month=8, day=2))
+def test_aggregate_of_transfers_calculates_same_metrics_as_transfer_engine():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+    transfers = _a_mix_of_transfers(500)
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(transfers)
+
+    expected_national_metrics = calculate_national_metrics_data(
+        transfers, reporting_window, observability_probe=Mock()
+    )
+    expected_practice_metrics = calculate_practice_metrics(
+        transfers, reporting_window, observability_probe=Mock()
+    )
+
+    actual_national_metrics = calculate_national_metrics_data_from_aggregate(
+        aggregator, reporting_window, observability_probe=Mock()
+    )
+    actual_practice_metrics = calculate_practice_metrics_from_aggregate(
+        aggregator, reporting_window, observability_probe=Mock()
+    )
+
+    assert actual_national_metrics == expected_national_metrics
+    assert actual_practice_metrics == expected_practice_metrics
+
+
+@freeze_time(datetime(year=2021, month=8, day=2))
+def test_parallel_practice_metrics_are_the_same_as_serial_practice_metrics():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+    transfers = _a_mix_of_transfers(500)
+
+    expected = calculate_practice_metrics(transfers, reporting_window, observability_probe=Mock())
+
+    with patch("os.cpu_count", return_value=2):
+        actual = calculate_practice_metrics(
+            transfers, reporting_window, observability_probe=Mock(), max_workers=2
+        )
+
+    assert actual == expected
+
+
+class _PicklingExecutor:
+    pickled_bytes = 0
+
+    def __init__(self, max_workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def map(self, function, *iterables):
+        for arguments in zip(*iterables):
+            pickled_arguments = pickle.dumps(arguments)
+            _PicklingExecutor.pickled_bytes += len(pickled_arguments)
+            yield function(*pickle.loads(pickled_arguments))
+
+
+def _bytes_sent_to_practice_metrics_workers(transfers, reporting_window) -> int:
+    _PicklingExecutor.pickled_bytes = 0
+    with patch("os.cpu_count", return_value=2), patch(
+        "prmcalculator.domain.practice.calculate_practice_metrics.ProcessPoolExecutor",
+        _PicklingExecutor,
+    ):
+        calculate_practice_metrics(
+            transfers, reporting_window, observability_probe=Mock(), max_workers=2
+        )
+    return _PicklingExecutor.pickled_bytes
+
+
+@freeze_time(datetime(year=2021, month=8, day=2))
+def test_parallel_practice_metrics_send_workers_counts_rather_than_transfers():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+
+    bytes_for_few_transfers = _bytes_sent_to_practice_metrics_workers(
+        _a_mix_of_transfers(100), reporting_window
+    )
+    bytes_for_many_transfers = _bytes_sent_to_practice_metrics_workers(
+        _a_mix_of_transfers(5000), reporting_window
+    )
+
+    assert bytes_for_many_transfers < bytes_for_few_transfers * 1.5
+
+
+def test_practice_metrics_are_calculated_serially_with_a_single_cpu():
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=8), 3)
+
+    with patch("os.cpu_count", return_value=1), patch(
+        "prmcalculator.domain.practice.calculate_practice_metrics.ProcessPoolExecutor"
+    ) as process_pool_executor:
+        calculate_practice_metrics(
+            _a_mix_of_transfers(100), reporting_window, observability_probe=Mock(), max_workers=4
+        )
+
+    process_pool_executor.assert_not_called()
@@ -19,7 +19,7 @@ from tests.builders.common import a_datetime
 from tests.builders.gp2gp import (
     a_transfer_integrated_within_3_days,
     a_transfer_that_was_never_integrated,
-    build_practice,
+    build_practice_details,
 )
 
 
@@ -38,7 +38,7 @@ def test_calculates_correct_practice_metrics_given_transfers():
     requesting_ods_code = "A12345"
     sicbl_ods_code = "23B"
     sicbl_name = "Test ICB - 23B"
-    requesting_practice = build_practice(
+    requesting_practice = build_practice_details(
         asid="343434343434",
         supplier="SystemOne",
         sicbl_name=sicbl_name,
@@ -165,7 +165,7 @@ def test_calculates_correct_practice_metrics_without_filtering_transfers():
     sicbl_ods_code = "23B"
     sicbl_name = "Test ICB - 23B"
 
-    requesting_practice = build_practice(
+    requesting_practice = build_practice_details(
         asid="343434343434",
         supplier="SystemOne",
         sicbl_name=sicbl_name,
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from prmcalculator.benchmark.main import main
+
+
+@pytest.mark.parametrize("metrics_engine", ["transfers", "fused", "arrow"])
+def test_benchmark_writes_stage_timings_as_json(tmp_path, metrics_engine):
+    output = tmp_path / "results.json"
+
+    main(
+        [
+            "--data-directory",
+            str(tmp_path / "data"),
+            "--output",
+            str(output),
+            "--practices",
+            "20",
+            "--sicbls",
+            "3",
+            "--transfers-per-month",
+            "300",
+            "--number-of-months",
+            "1",
+            "--metrics-engine",
+            metrics_engine,
+        ]
+    )
+
+    results = json.loads(output.read_text())
+
+    assert list(results["stage_seconds"].keys()) == ["read", "national", "practice", "write", "ssm"]
+    assert results["daily_file_count"] == 30
+    assert results["transfer_count"] == 30 * 9
+    assert results["config"]["metrics_engine"] == metrics_engine
+
+
+def test_benchmark_times_backfilled_windows_with_the_aggregate_cache(tmp_path):
+    output = tmp_path / "results.json"
+    arguments = [
+        "--data-directory",
+        str(tmp_path / "data"),
+        "--output",
+        str(output),
+        "--practices",
+        "20",
+        "--sicbls",
+        "3",
+        "--transfers-per-month",
+        "300",
+        "--number-of-months",
+        "1",
+        "--date-anchor",
+        "2021-06-01T00:00:00Z",
+        "--backfill-end-date-anchor",
+        "2021-07-01T00:00:00Z",
+        "--metrics-engine",
+        "arrow",
+        "--aggregate-cache",
+    ]
+
+    main(arguments)
+    main(arguments)
+
+    results = json.loads(output.read_text())
+
+    assert results["daily_file_count"] == 31 + 30
+    assert results["config"]["aggregate_cache"] is True
+    assert (tmp_path / "data" / "metrics" / "aggregate-cache").exists()
@@ -0,0 +1,216 @@
+from dataclasses import replace
+from unittest.mock import Mock, patch
+
+import pytest
+from dateutil.parser import isoparse
+
+from prmcalculator.benchmark.synthetic_transfers import SyntheticTransferGenerator
+from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.pipeline.config import MetricsEngine, PipelineConfig, TransferDataDiscovery
+from prmcalculator.pipeline.metrics_calculator import MetricsCalculator
+from prmcalculator.pipeline.s3_uri_resolver import PlatformMetricsS3UriResolver
+from prmcalculator.pipeline.storage_factory import UnsupportedStorageUri
+from prmcalculator.utils.io.in_memory import InMemoryDataManager, InMemoryParameterStore
+from prmcalculator.utils.io.local_files import LocalFileDataManager, LocalFileParameterStore
+
+_DATE_ANCHOR = isoparse("2021-07-01T00:00:00Z")
+_URIS = PlatformMetricsS3UriResolver(
+    transfer_data_bucket="transfer-data", data_platform_metrics_bucket="metrics"
+)
+_LAST_MONTH = (2021, 6)
+
+
+def _build_config(
+    storage_uri=None,
+    metrics_engine=MetricsEngine.TRANSFERS,
+    transfer_data_discovery=TransferDataDiscovery.DAILY,
+):
+    return PipelineConfig(
+        build_tag="abc",
+        input_transfer_data_bucket="transfer-data",
+        output_metrics_bucket="metrics",
+        date_anchor=_DATE_ANCHOR,
+        number_of_months=1,
+        s3_endpoint_url=None,
+        national_metrics_s3_path_param_name="national-metrics-path",
+        practice_metrics_s3_path_param_name="practice-metrics-path",
+        metrics_engine=metrics_engine,
+        storage_uri=storage_uri,
+        transfer_data_discovery=transfer_data_discovery,
+    )
+
+
+def _write_transfer_data(storage):
+    generator = SyntheticTransferGenerator(
+        seed=1, practice_count=20, sicbl_count=3, transfers_per_month=300
+    )
+    dates = ReportingWindow.prior_to(_DATE_ANCHOR, 1).dates
+    transfer_count = 0
+    for date, uri in zip(dates, _URIS.transfer_data(dates)):
+        table = generator.daily_transfer_table(date)
+        storage.write_parquet(uri, table)
+        transfer_count += table.num_rows
+    return transfer_count
+
+
+@pytest.mark.parametrize("metrics_engine", list(MetricsEngine))
+def test_runs_against_local_files_configured_by_storage_uri(tmp_path, metrics_engine):
+    transfer_count = _write_transfer_data(LocalFileDataManager(tmp_path))
+
+    MetricsCalculator(_build_config(f"file://{tmp_path}", metrics_engine)).run()
+
+    files = LocalFileDataManager(tmp_path)
+    national_metrics = files.read_json(_URIS.national_metrics(_LAST_MONTH))
+    parameters = LocalFileParameterStore(tmp_path / "ssm-parameters.json")
+    assert national_metrics["metrics"][0]["transferCount"] == transfer_count
+    assert files.read_metadata(_URIS.national_metrics(_LAST_MONTH))["date-anchor"] == (
+        _DATE_ANCHOR.isoformat()
+    )
+    assert parameters.get_parameter(Name="national-metrics-path")["Parameter"][
+        "Value"
+    ] == _URIS.national_metrics_key(_LAST_MONTH)
+
+
+def test_injected_in_memory_storage_matches_local_files(tmp_path):
+    storage = InMemoryDataManager()
+    parameter_store = InMemoryParameterStore()
+    _write_transfer_data(storage)
+    _write_transfer_data(LocalFileDataManager(tmp_path))
+
+    MetricsCalculator(_build_config(), storage=storage, parameter_store=parameter_store).run()
+    MetricsCalculator(_build_config(f"file://{tmp_path}")).run()
+
+    practice_metrics_uri = _URIS.practice_metrics(_LAST_MONTH)
+    expected = LocalFileDataManager(tmp_path).read_json(practice_metrics_uri)
+    actual = storage.read_json(practice_metrics_uri)
+    assert actual["practices"] == expected["practices"]
+    assert actual["sicbls"] == expected["sicbls"]
+    assert parameter_store.get_parameter(Name="practice-metrics-path")["Parameter"]["Value"] == (
+        _URIS.practice_metrics_key(_LAST_MONTH)
+    )
+
+
+def test_keeps_injected_storage_when_parameter_store_comes_from_storage_uri(tmp_path):
+    storage = InMemoryDataManager()
+    _write_transfer_data(storage)
+
+    MetricsCalculator(_build_config(f"file://{tmp_path}"), storage=storage).run()
+
+    parameters = LocalFileParameterStore(tmp_path / "ssm-parameters.json")
+    assert storage.read_json(_URIS.national_metrics(_LAST_MONTH))["metrics"]
+    assert parameters.get_parameter(Name="national-metrics-path")["Parameter"]["Value"] == (
+        _URIS.national_metrics_key(_LAST_MONTH)
+    )
+
+
+def test_monitors_the_connection_pool_only_for_s3_storage(tmp_path):
+    _write_transfer_data(LocalFileDataManager(tmp_path))
+
+    with patch(
+        "prmcalculator.pipeline.metrics_calculator.ConnectionPoolMonitor"
+    ) as connection_pool_monitor:
+        MetricsCalculator(_build_config(f"file://{tmp_path}")).run()
+
+    connection_pool_monitor.assert_not_called()
+
+
+def test_rejects_unsupported_storage_uri():
+    with pytest.raises(UnsupportedStorageUri):
+        MetricsCalculator(_build_config("ftp://somewhere"))
+
+
+@pytest.mark.parametrize("metrics_engine", list(MetricsEngine))
+def test_dataset_discovery_matches_daily_uris(tmp_path, metrics_engine):
+    _write_transfer_data(LocalFileDataManager(tmp_path))
+    dataset_storage = InMemoryDataManager()
+    _write_transfer_data(dataset_storage)
+
+    MetricsCalculator(_build_config(f"file://{tmp_path}", metrics_engine)).run()
+    MetricsCalculator(
+        _build_config(
+            metrics_engine=metrics_engine, transfer_data_discovery=TransferDataDiscovery.DATASET
+        ),
+        storage=dataset_storage,
+        parameter_store=InMemoryParameterStore(),
+    ).run()
+
+    practice_metrics_uri = _URIS.practice_metrics(_LAST_MONTH)
+    expected = LocalFileDataManager(tmp_path).read_json(practice_metrics_uri)
+    actual = dataset_storage.read_json(practice_metrics_uri)
+    assert actual["practices"] == expected["practices"]
+    assert actual["sicbls"] == expected["sicbls"]
+
+
+@pytest.mark.parametrize("metrics_engine", list(MetricsEngine))
+@pytest.mark.parametrize("aggregate_cache_uri", [None, "s3://metrics/aggregate-cache"])
+def test_prefetch_pipeline_matches_direct_reads(tmp_path, metrics_engine, aggregate_cache_uri):
+    _write_transfer_data(LocalFileDataManager(tmp_path))
+    prefetch_storage = InMemoryDataManager()
+    _write_transfer_data(prefetch_storage)
+    prefetch_config = replace(
+        _build_config(metrics_engine=metrics_engine),
+        max_concurrent_reads=4,
+        prefetch_queue_size=2,
+        aggregate_cache_uri=aggregate_cache_uri,
+    )
+
+    MetricsCalculator(_build_config(f"file://{tmp_path}", metrics_engine)).run()
+    for _ in range(2):
+        MetricsCalculator(
+            prefetch_config, storage=prefetch_storage, parameter_store=InMemoryParameterStore()
+        ).run()
+
+        practice_metrics_uri = _URIS.practice_metrics(_LAST_MONTH)
+        expected = LocalFileDataManager(tmp_path).read_json(practice_metrics_uri)
+        actual = prefetch_storage.read_json(practice_metrics_uri)
+        assert actual["practices"] == expected["practices"]
+        assert actual["sicbls"] == expected["sicbls"]
+
+
+def test_rerun_with_unchanged_metrics_skips_uploads_and_ssm_writes():
+    storage = InMemoryDataManager()
+    parameter_store = Mock(wraps=InMemoryParameterStore())
+    _write_transfer_data(storage)
+    national_metrics_uri = _URIS.national_metrics(_LAST_MONTH)
+    practice_metrics_uri = _URIS.practice_metrics(_LAST_MONTH)
+
+    MetricsCalculator(_build_config(), storage=storage, parameter_store=parameter_store).run()
+    first_national_metrics = storage.read_json(national_metrics_uri)
+    first_practice_metrics = storage.read_json(practice_metrics_uri)
+    MetricsCalculator(_build_config(), storage=storage, parameter_store=parameter_store).run()
+
+    assert storage.read_json(national_metrics_uri) == first_national_metrics
+    assert storage.read_json(practice_metrics_uri) == first_practice_metrics
+    assert parameter_store.put_parameter.call_count == 2
+
+    MetricsCalculator(
+        replace(_build_config(), build_tag="def"), storage=storage, parameter_store=parameter_store
+    ).run()
+
+    assert storage.read_json(practice_metrics_uri) != first_practice_metrics
+    assert storage.read_metadata(practice_metrics_uri)["metrics-calculator-version"] == "def"
+
+
+def test_writes_practice_metrics_parquet_matching_json():
+    storage = InMemoryDataManager()
+    _write_transfer_data(storage)
+    config = replace(_build_config(), practice_metrics_parquet=True)
+
+    MetricsCalculator(config, storage=storage, parameter_store=InMemoryParameterStore()).run()
+
+    practice_metrics = storage.read_json(_URIS.practice_metrics(_LAST_MONTH))
+    practice = practice_metrics["practices"][0]
+    table = storage.read_parquet(
+        _URIS.practice_metrics_parquet(_LAST_MONTH),
+        filters=[("ods_code", "=", practice["odsCode"])],
+    )
+    rows = table.to_pylist()
+
+    assert table.schema.metadata[b"generated_on"] == practice_metrics["generatedOn"].encode()
+    assert [(row["year"], row["month"]) for row in rows] == [
+        (metrics["year"], metrics["month"]) for metrics in practice["metrics"]
+    ]
+    assert rows[0]["sicbl_ods_code"] == practice["sicblOdsCode"]
+    assert rows[0]["requested_count"] == (
+        practice["metrics"][0]["requestedTransfers"]["requestedCount"]
+    )
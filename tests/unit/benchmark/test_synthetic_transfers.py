@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from dateutil.tz import UTC
+
+from prmcalculator.benchmark.synthetic_transfers import SyntheticTransferGenerator
+from prmcalculator.domain.gp2gp.transfer import convert_table_to_transfers
+
+_A_DAY = datetime(2021, 6, 1, tzinfo=UTC)
+
+
+def test_generates_the_same_daily_table_for_the_same_seed():
+    first = SyntheticTransferGenerator(seed=1, practice_count=50, transfers_per_month=3000)
+    second = SyntheticTransferGenerator(seed=1, practice_count=50, transfers_per_month=3000)
+
+    assert first.daily_transfer_table(_A_DAY) == second.daily_transfer_table(_A_DAY)
+
+
+def test_generates_different_daily_tables_for_different_seeds():
+    first = SyntheticTransferGenerator(seed=1, practice_count=50, transfers_per_month=3000)
+    second = SyntheticTransferGenerator(seed=2, practice_count=50, transfers_per_month=3000)
+
+    assert first.daily_transfer_table(_A_DAY) != second.daily_transfer_table(_A_DAY)
+
+
+def test_generates_transfers_requested_on_the_given_day_that_can_be_converted():
+    generator = SyntheticTransferGenerator(
+        seed=1, practice_count=50, sicbl_count=5, transfers_per_month=3000
+    )
+
+    transfers = convert_table_to_transfers(generator.daily_transfer_table(_A_DAY))
+
+    assert len(transfers) == generator.transfers_per_day == 98
+    assert {transfer.date_requested.date() for transfer in transfers} == {_A_DAY.date()}
+    assert len({transfer.requesting_practice.sicbl_ods_code for transfer in transfers}) <= 5
+    assert len({transfer.outcome for transfer in transfers}) > 1
@@ -281,3 +281,46 @@ def test_convert_table_to_transfers_handles_none_values_gracefully():
     ]
 
     assert actual_transfers == expected_transfers
+
+
+def test_maps_outcomes_of_dictionary_encoded_columns_split_across_chunks():
+    statuses = ["Technical failure", "Integrated on time", "Process failure", None]
+    failure_reasons = ["Final error", None, "Integrated late", "Final error"]
+    table = _build_transfer_table(
+        conversation_id=["1", "2", "3", "4"],
+        sla_duration=[1, 2, 3, 4],
+        requesting_practice_asid=["a"] * 4,
+        requesting_supplier=["s"] * 4,
+        status=pa.chunked_array([statuses[:2], statuses[2:]]).dictionary_encode(),
+        failure_reason=failure_reasons,
+        date_requested=[a_datetime()] * 4,
+        last_sender_message_timestamp=[None] * 4,
+        requesting_practice_ods_code=["A1"] * 4,
+        requesting_practice_name=["n"] * 4,
+        requesting_practice_sicbl_ods_code=["B1"] * 4,
+        requesting_practice_sicbl_name=["m"] * 4,
+    )
+
+    try:
+        convert_table_to_transfers(table)
+    except UnexpectedTransferOutcome as ex:
+        assert str(ex) == "Unexpected Status: None - cannot be mapped."
+
+    transfers = convert_table_to_transfers(table.slice(0, 3))
+
+    assert [transfer.outcome for transfer in transfers] == [
+        TransferOutcome(TransferStatus.TECHNICAL_FAILURE, TransferFailureReason.FINAL_ERROR),
+        TransferOutcome(TransferStatus.INTEGRATED_ON_TIME, None),
+        TransferOutcome(TransferStatus.PROCESS_FAILURE, TransferFailureReason.INTEGRATED_LATE),
+    ]
+
+
+def test_ignores_unexpected_dictionary_values_that_no_row_uses():
+    status = pa.DictionaryArray.from_arrays(
+        pa.array([1], pa.int32()), pa.array(["MISSING_STATUS", "Integrated on time"])
+    )
+    table = _build_transfer_table(status=status)
+
+    transfers = convert_table_to_transfers(table)
+
+    assert transfers[0].outcome == TransferOutcome(TransferStatus.INTEGRATED_ON_TIME, None)
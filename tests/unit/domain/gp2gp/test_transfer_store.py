@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+from prmcalculator.domain.gp2gp.sla import SlaBand
+from prmcalculator.domain.gp2gp.transfer import (
+    TransferFailureReason,
+    TransferOutcome,
+    TransferStatus,
+    convert_table_to_transfers,
+)
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
+from prmcalculator.domain.reporting_window import ReportingWindow
+from tests.builders.common import a_datetime
+from tests.builders.gp2gp import (
+    a_transfer_integrated_within_3_days,
+    a_transfer_that_was_never_integrated,
+    build_practice_details,
+    build_transfer,
+    build_transfer_table,
+)
+
+
+def test_iterates_transfers_in_the_order_they_were_added():
+    transfers = [
+        a_transfer_integrated_within_3_days(),
+        a_transfer_that_was_never_integrated(last_sender_message_timestamp=None),
+        build_transfer(requesting_practice=build_practice_details(ods_code=None)),
+    ]
+
+    actual = TransferStore.from_transfers(transfers)
+
+    assert len(actual) == 3
+    assert list(actual) == transfers
+    assert actual[1] == transfers[1]
+    assert actual[-1] == transfers[-1]
+
+
+def test_reads_transfers_from_table_the_same_as_converting_to_transfers():
+    practice = build_practice_details()
+    transfers = [
+        a_transfer_integrated_within_3_days(requesting_practice=practice),
+        a_transfer_that_was_never_integrated(requesting_practice=practice),
+    ]
+    transfer_table = build_transfer_table(transfers)
+
+    actual = TransferStore.from_table(transfer_table)
+
+    assert list(actual) == convert_table_to_transfers(transfer_table)
+
+
+def test_shares_one_copy_of_each_practice_and_outcome():
+    practice = build_practice_details()
+    transfer_table = build_transfer_table(
+        [a_transfer_integrated_within_3_days(requesting_practice=practice) for _ in range(3)]
+    )
+
+    first, second, third = TransferStore.from_table(transfer_table)
+
+    assert first.requesting_practice is second.requesting_practice is third.requesting_practice
+    assert first.outcome is second.outcome is third.outcome
+
+
+def test_groups_transfers_by_practice_ods_code_in_order_of_first_appearance():
+    practice_a = build_practice_details(ods_code="A12345")
+    practice_b = build_practice_details(ods_code="B12345")
+    transfers = [
+        build_transfer(requesting_practice=practice_b),
+        build_transfer(requesting_practice=practice_a),
+        build_transfer(requesting_practice=practice_b),
+    ]
+
+    actual = TransferStore.from_transfers(transfers).group_by_practice_ods_code()
+
+    assert list(actual.keys()) == ["B12345", "A12345"]
+    assert list(actual["B12345"]) == [transfers[0], transfers[2]]
+    assert list(actual["A12345"]) == [transfers[1]]
+
+
+def test_returns_first_of_the_latest_requested_transfers():
+    date_requested = a_datetime(year=2021, month=7)
+    transfers = [
+        build_transfer(date_requested=date_requested),
+        build_transfer(date_requested=date_requested + timedelta(days=1)),
+        build_transfer(date_requested=date_requested + timedelta(days=1)),
+    ]
+
+    actual = TransferStore.from_transfers(transfers).latest_transfer()
+
+    assert actual == transfers[1]
+
+
+def test_groups_transfers_by_month_requested():
+    january = build_transfer(date_requested=a_datetime(year=2021, month=1, day=31))
+    february = build_transfer(date_requested=a_datetime(year=2021, month=2, day=1))
+    store = TransferStore.from_transfers([january, february, january])
+
+    actual = store.group_by_month_requested()
+
+    assert {month: list(transfers) for month, transfers in actual.items()} == {
+        (2021, 1): [january, january],
+        (2021, 2): [february],
+    }
+
+
+def test_selects_transfers_requested_in_last_month_of_reporting_window():
+    january = build_transfer(date_requested=a_datetime(year=2021, month=1, day=31))
+    february = build_transfer(date_requested=a_datetime(year=2021, month=2, day=1))
+    reporting_window = ReportingWindow.prior_to(a_datetime(year=2021, month=3, day=4), 2)
+
+    actual = TransferStore.from_transfers([january, february]).requested_in_last_month(
+        reporting_window
+    )
+
+    assert list(actual) == [february]
+
+
+def test_counts_transfers_by_outcome_and_sla_band():
+    integrated = build_transfer(
+        outcome=TransferOutcome(status=TransferStatus.INTEGRATED_ON_TIME, failure_reason=None),
+        sla_duration=timedelta(days=1),
+    )
+    integrated_later = build_transfer(
+        outcome=integrated.outcome,
+        sla_duration=timedelta(days=5),
+    )
+    failed = build_transfer(
+        outcome=TransferOutcome(
+            status=TransferStatus.TECHNICAL_FAILURE,
+            failure_reason=TransferFailureReason.FINAL_ERROR,
+        ),
+        sla_duration=None,
+    )
+    store = TransferStore.from_transfers([integrated, failed, integrated, integrated_later])
+
+    assert store.outcome_counts() == {integrated.outcome: 3, failed.outcome: 1}
+    assert store.outcome_sla_band_counts() == {
+        (integrated.outcome, SlaBand.WITHIN_3_DAYS): 2,
+        (integrated.outcome, SlaBand.WITHIN_8_DAYS): 1,
+        (failed.outcome, None): 1,
+    }
+
+
+def test_only_compares_equal_to_another_store():
+    transfers = [build_transfer(), build_transfer()]
+
+    assert TransferStore.from_transfers(transfers) == TransferStore.from_transfers(transfers)
+    assert TransferStore.from_transfers(transfers) != transfers
+
+
+def test_keeps_conversation_ids_of_selected_transfers():
+    transfers = [
+        build_transfer(conversation_id="first"),
+        build_transfer(conversation_id=""),
+        build_transfer(conversation_id="thïrd"),
+    ]
+
+    actual = TransferStore.from_transfers(transfers)[1:]
+
+    assert [transfer.conversation_id for transfer in actual] == ["", "thïrd"]
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+
+from prmcalculator.domain.gp2gp.sla import SlaBand
+from prmcalculator.domain.gp2gp.transfer import (
+    TransferOutcome,
+    TransferStatus,
+    UnexpectedTransferOutcome,
+)
+from prmcalculator.domain.gp2gp.transfer_table import (
+    count_transfers_by_outcome,
+    filter_transfer_table_by_month_requested,
+    latest_transfers_by_practice,
+)
+from tests.builders.common import a_datetime
+from tests.builders.gp2gp import (
+    a_transfer_integrated_between_3_and_8_days,
+    a_transfer_integrated_within_3_days,
+    a_transfer_that_was_never_integrated,
+    build_practice_details,
+    build_transfer,
+    build_transfer_table,
+)
+
+_INTEGRATED_ON_TIME = TransferOutcome(status=TransferStatus.INTEGRATED_ON_TIME, failure_reason=None)
+
+
+def test_counts_transfers_by_outcome_and_sla_band():
+    transfer_table = build_transfer_table(
+        [
+            a_transfer_integrated_within_3_days(),
+            a_transfer_integrated_within_3_days(),
+            a_transfer_integrated_between_3_and_8_days(),
+            a_transfer_that_was_never_integrated(),
+        ]
+    )
+
+    actual = count_transfers_by_outcome(transfer_table, keys=[])
+
+    never_integrated = a_transfer_that_was_never_integrated().outcome
+    expected = {
+        (): {
+            (_INTEGRATED_ON_TIME, SlaBand.WITHIN_3_DAYS): 2,
+            (_INTEGRATED_ON_TIME, SlaBand.WITHIN_8_DAYS): 1,
+            (never_integrated, None): 1,
+        }
+    }
+
+    assert actual == expected
+
+
+def test_count_transfers_by_outcome_raises_error_given_unknown_status():
+    transfer_table = build_transfer_table([build_transfer()])
+    transfer_table = transfer_table.set_column(
+        transfer_table.schema.get_field_index("status"), "status", [["Lost in the post"]]
+    )
+
+    with pytest.raises(UnexpectedTransferOutcome):
+        count_transfers_by_outcome(transfer_table, keys=[])
+
+
+def test_filters_transfer_table_to_month_requested():
+    transfer_in_month = build_transfer(date_requested=a_datetime(year=2021, month=7))
+    transfer_table = build_transfer_table(
+        [
+            build_transfer(date_requested=a_datetime(year=2021, month=6)),
+            transfer_in_month,
+            build_transfer(date_requested=a_datetime(year=2021, month=8)),
+        ]
+    )
+
+    actual = filter_transfer_table_by_month_requested(transfer_table, (2021, 7))
+
+    assert actual["conversation_id"].to_pylist() == [transfer_in_month.conversation_id]
+
+
+def test_latest_transfers_by_practice_prefers_first_of_equally_recent_transfers():
+    date_requested = a_datetime(year=2021, month=7)
+    old_details = build_practice_details(ods_code="A12345", name="Old name")
+    new_details = build_practice_details(ods_code="A12345", name="New name")
+    newer_details = build_practice_details(ods_code="A12345", name="Newer name")
+    transfer_table = build_transfer_table(
+        [
+            build_transfer(
+                requesting_practice=old_details,
+                date_requested=date_requested - timedelta(days=1),
+            ),
+            build_transfer(requesting_practice=new_details, date_requested=date_requested),
+            build_transfer(requesting_practice=newer_details, date_requested=date_requested),
+        ]
+    )
+
+    actual = latest_transfers_by_practice(transfer_table)
+
+    assert actual["A12345"].requesting_practice == new_details
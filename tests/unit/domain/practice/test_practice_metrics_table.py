@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pyarrow as pa
+
+from prmcalculator.domain.practice.calculate_practice_metrics import (
+    PracticeMetricsPresentation,
+    SICBLPresentation,
+)
+from prmcalculator.domain.practice.construct_practice_summary import (
+    MonthlyMetricsPresentation,
+    PracticeSummary,
+    RequestedTransferMetrics,
+)
+from prmcalculator.domain.practice.practice_metrics_table import (
+    PRACTICE_METRICS_SCHEMA,
+    convert_practice_metrics_to_table,
+)
+
+
+def _requested_transfers(requested_count, received_percent_of_requested=None):
+    return RequestedTransferMetrics(
+        requested_count=requested_count,
+        received_count=1,
+        received_percent_of_requested=received_percent_of_requested,
+        integrated_within_3_days_count=1,
+        integrated_within_3_days_percent_of_received=100.0,
+        integrated_within_8_days_count=0,
+        integrated_within_8_days_percent_of_received=0.0,
+        not_integrated_within_8_days_total=0,
+        not_integrated_within_8_days_percent_of_received=0.0,
+        failures_total_count=0,
+        failures_total_percent_of_requested=None,
+    )
+
+
+def _a_practice(ods_code, sicbl_ods_code, metrics):
+    return PracticeSummary(
+        ods_code=ods_code,
+        name=f"Practice {ods_code}",
+        sicbl_ods_code=sicbl_ods_code,
+        sicbl_name=f"ICB {sicbl_ods_code}",
+        metrics=metrics,
+    )
+
+
+def test_returns_one_row_per_practice_month():
+    presentation = PracticeMetricsPresentation(
+        generated_on=datetime(2021, 1, 1),
+        practices=[
+            _a_practice(
+                "A12345",
+                "12A",
+                [
+                    MonthlyMetricsPresentation(
+                        year=2020, month=12, requested_transfers=_requested_transfers(4, 25.0)
+                    ),
+                    MonthlyMetricsPresentation(
+                        year=2020, month=11, requested_transfers=_requested_transfers(2)
+                    ),
+                ],
+            ),
+            _a_practice(
+                "B12345",
+                "12A",
+                [
+                    MonthlyMetricsPresentation(
+                        year=2020, month=12, requested_transfers=_requested_transfers(7)
+                    )
+                ],
+            ),
+        ],
+        sicbls=[SICBLPresentation(ods_code="12A", name="ICB 12A", practices=["A12345", "B12345"])],
+    )
+
+    table = convert_practice_metrics_to_table(presentation)
+
+    assert table.column("ods_code").to_pylist() == ["A12345", "A12345", "B12345"]
+    assert table.column("sicbl_name").to_pylist() == ["ICB 12A", "ICB 12A", "ICB 12A"]
+    assert table.column("month").to_pylist() == [12, 11, 12]
+    assert table.column("requested_count").to_pylist() == [4, 2, 7]
+    assert table.column("received_percent_of_requested").to_pylist() == [25.0, None, None]
+
+
+def test_uses_dictionary_encoded_identifiers_and_records_generated_on():
+    generated_on = datetime(2021, 1, 1)
+    presentation = PracticeMetricsPresentation(generated_on=generated_on, practices=[], sicbls=[])
+
+    table = convert_practice_metrics_to_table(presentation)
+
+    assert table.num_rows == 0
+    assert table.schema.equals(PRACTICE_METRICS_SCHEMA)
+    assert table.schema.field("ods_code").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("name").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.metadata == {b"generated_on": generated_on.isoformat().encode()}
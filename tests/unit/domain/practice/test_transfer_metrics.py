@@ -1,3 +1,6 @@
+from collections import Counter
+
+from prmcalculator.domain.gp2gp.sla import assign_to_sla_band
 from prmcalculator.domain.practice.transfer_metrics import TransferMetrics
 from tests.builders.gp2gp import (
     a_transfer_integrated_between_3_and_8_days,
@@ -290,3 +293,31 @@ def test_returns_zero_when_portion_is_zero():
     transfer_metrics = TransferMetrics(transfers=transfers)
 
     assert transfer_metrics.failures_percent_of_requested() == 0.0
+
+
+def test_from_counts_returns_same_metrics_as_transfers():
+    transfers = [
+        a_transfer_integrated_within_3_days(),
+        a_transfer_integrated_within_3_days(),
+        a_transfer_integrated_beyond_8_days(),
+        a_transfer_that_was_never_integrated(),
+        a_transfer_with_a_final_error(),
+    ]
+    counts = Counter(
+        (
+            transfer.outcome,
+            assign_to_sla_band(transfer.sla_duration) if transfer.sla_duration else None,
+        )
+        for transfer in transfers
+    )
+
+    expected = TransferMetrics(transfers=transfers)
+
+    actual = TransferMetrics.from_counts(counts)
+
+    assert actual.requested_by_practice_total() == expected.requested_by_practice_total()
+    assert actual.received_by_practice_total() == expected.received_by_practice_total()
+    assert actual.integrated_within_3_days() == expected.integrated_within_3_days()
+    assert actual.integrated_within_8_days() == expected.integrated_within_8_days()
+    assert actual.integrated_beyond_8_days() == expected.integrated_beyond_8_days()
+    assert actual.failures_total_count() == expected.failures_total_count()
@@ -1,5 +1,6 @@
 from unittest.mock import Mock
 
+from prmcalculator.domain.gp2gp.transfer_store import TransferStore
 from prmcalculator.domain.practice.transfer_service import SICBL, Practice, TransfersService
 from tests.builders.common import a_datetime, a_string
 from tests.builders.gp2gp import build_practice_details, build_transfer
@@ -27,7 +28,7 @@ def test_produces_a_group_given_a_single_practice_with_a_single_transfer():
         Practice(
             name="Practice 1",
             ods_code="A1234",
-            transfers=[transfer_one],
+            transfers=TransferStore.from_transfers([transfer_one]),
             sicbl_name="SICBL 1",
             sicbl_ods_code="AA1234",
         )
@@ -58,7 +59,7 @@ def test_produces_a_group_given_a_single_practice_with_multiple_transfer():
         Practice(
             name="Practice 1",
             ods_code="A1234",
-            transfers=[transfer_one, transfer_two],
+            transfers=TransferStore.from_transfers([transfer_one, transfer_two]),
             sicbl_name="SICBL 1",
             sicbl_ods_code="AA1234",
         )
@@ -100,7 +101,9 @@ def test_sets_practice_fields_based_on_latest_transfer_transfer():
         Practice(
             name="Practice Latest",
             ods_code="A1234",
-            transfers=[transfer_one_oldest, transfer_two_latest, transfer_three_old],
+            transfers=TransferStore.from_transfers(
+                [transfer_one_oldest, transfer_two_latest, transfer_three_old]
+            ),
             sicbl_name="SICBL Latest",
             sicbl_ods_code="LATEST1234",
         )
@@ -137,14 +140,14 @@ def test_produces_correct_groups_given_two_practices_each_with_transfers():
         Practice(
             name="Practice 1",
             ods_code="A1234",
-            transfers=[transfer_one],
+            transfers=TransferStore.from_transfers([transfer_one]),
             sicbl_name="SICBL 1",
             sicbl_ods_code="AA1234",
         ),
         Practice(
             name="Practice 2",
             ods_code="B1234",
-            transfers=[transfer_two, transfer_three],
+            transfers=TransferStore.from_transfers([transfer_two, transfer_three]),
             sicbl_name="SICBL 2",
             sicbl_ods_code="BB1234",
         ),
@@ -0,0 +1,193 @@
+import json
+from datetime import timedelta
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from tests.builders.common import a_datetime
+from tests.builders.gp2gp import (
+    a_transfer_integrated_beyond_8_days,
+    a_transfer_integrated_within_3_days,
+    a_transfer_that_was_never_integrated,
+    build_practice_details,
+    build_transfer,
+    build_transfer_table,
+)
+
+
+def test_counts_national_transfers_for_month_including_unknown_practices():
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(
+        [
+            a_transfer_integrated_within_3_days(date_requested=a_datetime(year=2021, month=7)),
+            a_transfer_integrated_within_3_days(
+                date_requested=a_datetime(year=2021, month=7),
+                requesting_practice=build_practice_details(ods_code=None),
+            ),
+            a_transfer_integrated_within_3_days(date_requested=a_datetime(year=2021, month=6)),
+        ]
+    )
+
+    actual = aggregator.national_metrics_month((2021, 7))
+
+    assert actual.total == 2
+    assert actual.integrated_on_time_total() == 2
+
+
+def test_counts_practice_transfers_by_month():
+    practice = build_practice_details()
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(
+        [
+            a_transfer_integrated_within_3_days(
+                requesting_practice=practice, date_requested=a_datetime(year=2021, month=7)
+            ),
+            a_transfer_integrated_beyond_8_days(
+                requesting_practice=practice, date_requested=a_datetime(year=2021, month=7)
+            ),
+            a_transfer_that_was_never_integrated(
+                requesting_practice=practice, date_requested=a_datetime(year=2021, month=6)
+            ),
+        ]
+    )
+
+    (latest_transfer,) = aggregator.latest_practice_transfers
+    actual = aggregator.practice_transfer_metrics(latest_transfer)
+
+    assert actual.monthly_metrics(2021, 7).requested_by_practice_total() == 2
+    assert actual.monthly_metrics(2021, 7).integrated_within_3_days() == 1
+    assert actual.monthly_metrics(2021, 7).integrated_beyond_8_days() == 1
+    assert actual.monthly_metrics(2021, 6).process_failure_not_integrated() == 1
+
+
+def test_keeps_latest_practice_details_in_order_of_first_appearance():
+    date_requested = a_datetime(year=2021, month=7)
+    first_practice_old = build_practice_details(ods_code="A12345", name="Old name")
+    first_practice_new = build_practice_details(ods_code="A12345", name="New name")
+    second_practice = build_practice_details(ods_code="B12345")
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(
+        [
+            build_transfer(requesting_practice=first_practice_old, date_requested=date_requested),
+            build_transfer(requesting_practice=second_practice, date_requested=date_requested),
+            build_transfer(
+                requesting_practice=first_practice_new,
+                date_requested=date_requested + timedelta(days=1),
+            ),
+        ]
+    )
+
+    actual = [transfer.requesting_practice for transfer in aggregator.latest_practice_transfers]
+
+    assert actual == [first_practice_new, second_practice]
+
+
+def test_aggregates_table_the_same_as_transfers():
+    transfers = [
+        a_transfer_integrated_within_3_days(date_requested=a_datetime(year=2021, month=7)),
+        a_transfer_that_was_never_integrated(
+            requesting_practice=build_practice_details(ods_code=None),
+            date_requested=a_datetime(year=2021, month=7),
+        ),
+    ]
+    transfers_aggregator = MetricsAggregator()
+    transfers_aggregator.add_transfers(transfers)
+    table_aggregator = MetricsAggregator()
+    table_aggregator.add_transfer_table(build_transfer_table(transfers))
+
+    assert table_aggregator.unknown_practice_transfers == transfers[1:]
+    assert table_aggregator.latest_practice_transfers == transfers[:1]
+    assert (
+        table_aggregator.national_metrics_month((2021, 7)).total
+        == transfers_aggregator.national_metrics_month((2021, 7)).total
+    )
+
+
+def test_aggregating_daily_tables_one_at_a_time_matches_whole_table():
+    practice = build_practice_details()
+    daily_transfers = [
+        [
+            a_transfer_integrated_within_3_days(
+                requesting_practice=practice, date_requested=a_datetime(year=2021, month=7, day=1)
+            ),
+            build_transfer(date_requested=a_datetime(year=2021, month=7, day=1)),
+        ],
+        [
+            a_transfer_integrated_beyond_8_days(
+                requesting_practice=practice, date_requested=a_datetime(year=2021, month=7, day=2)
+            ),
+        ],
+    ]
+    whole_table_aggregator = MetricsAggregator()
+    whole_table_aggregator.add_transfer_table(
+        build_transfer_table(daily_transfers[0] + daily_transfers[1])
+    )
+    daily_aggregator = MetricsAggregator()
+    for transfers in daily_transfers:
+        daily_aggregator.add_transfer_table(build_transfer_table(transfers))
+
+    expected = [
+        whole_table_aggregator.practice_transfer_metrics(transfer).monthly_metrics(2021, 7)
+        for transfer in whole_table_aggregator.latest_practice_transfers
+    ]
+
+    actual = [
+        daily_aggregator.practice_transfer_metrics(transfer).monthly_metrics(2021, 7)
+        for transfer in daily_aggregator.latest_practice_transfers
+    ]
+
+    assert daily_aggregator.latest_practice_transfers == (
+        whole_table_aggregator.latest_practice_transfers
+    )
+    assert [metrics.requested_by_practice_total() for metrics in actual] == [
+        metrics.requested_by_practice_total() for metrics in expected
+    ]
+
+
+def test_merging_daily_aggregates_matches_aggregating_all_transfers():
+    practice = build_practice_details()
+    first_day = [
+        a_transfer_integrated_within_3_days(
+            requesting_practice=practice, date_requested=a_datetime(year=2021, month=7, day=1)
+        ),
+        build_transfer(
+            requesting_practice=build_practice_details(ods_code=None),
+            date_requested=a_datetime(year=2021, month=7, day=1),
+        ),
+    ]
+    second_day = [
+        a_transfer_that_was_never_integrated(
+            requesting_practice=practice, date_requested=a_datetime(year=2021, month=7, day=2)
+        ),
+    ]
+    whole_aggregator = MetricsAggregator()
+    whole_aggregator.add_transfers(first_day + second_day)
+    first_day_aggregator = MetricsAggregator()
+    first_day_aggregator.add_transfers(first_day)
+    second_day_aggregator = MetricsAggregator()
+    second_day_aggregator.add_transfers(second_day)
+
+    merged_aggregator = MetricsAggregator()
+    merged_aggregator.merge(first_day_aggregator)
+    merged_aggregator.merge(second_day_aggregator)
+
+    assert merged_aggregator.to_dict() == whole_aggregator.to_dict()
+    assert merged_aggregator.latest_practice_transfers == second_day
+
+
+def test_aggregate_survives_round_trip_through_json():
+    transfers = [
+        a_transfer_integrated_within_3_days(date_requested=a_datetime(year=2021, month=7)),
+        a_transfer_integrated_beyond_8_days(date_requested=a_datetime(year=2021, month=6)),
+        a_transfer_that_was_never_integrated(
+            requesting_practice=build_practice_details(ods_code=None),
+            date_requested=a_datetime(year=2021, month=7),
+        ),
+    ]
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(transfers)
+
+    actual = MetricsAggregator.from_dict(json.loads(json.dumps(aggregator.to_dict())))
+
+    assert actual.to_dict() == aggregator.to_dict()
+    assert actual.latest_practice_transfers == aggregator.latest_practice_transfers
+    assert actual.unknown_practice_transfers == aggregator.unknown_practice_transfers
+    assert actual.national_metrics_month((2021, 7)).total == 2
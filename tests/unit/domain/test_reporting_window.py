@@ -4,6 +4,7 @@ import pytest
 from dateutil.tz import UTC, gettz
 
 from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.utils.date_converter import to_epoch_microseconds
 from tests.builders.common import a_datetime
 
 
@@ -86,8 +87,12 @@ def test_last_month_contains_returns_correct_boolean(test_case):
     reporting_window = ReportingWindow.prior_to(date_anchor=moment, number_of_months=6)
 
     actual = reporting_window.last_month_contains(test_case["date"])
+    actual_from_epoch_microseconds = reporting_window.last_month_contains_epoch_microseconds(
+        to_epoch_microseconds(test_case["date"])
+    )
 
     assert actual == test_case["expected"]
+    assert actual_from_epoch_microseconds == test_case["expected"]
 
 
 def test_returns_dates_list_when_date_anchor_is_bst():
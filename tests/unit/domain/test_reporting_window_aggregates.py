@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from dateutil.tz import UTC
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from prmcalculator.domain.reporting_window import ReportingWindow
+from prmcalculator.domain.reporting_window_aggregates import aggregate_reporting_windows
+from tests.builders.gp2gp import a_transfer_integrated_within_3_days
+
+
+def _daily_aggregates(dates):
+    for date in dates:
+        aggregator = MetricsAggregator()
+        aggregator.add_transfers([a_transfer_integrated_within_3_days(date_requested=date)])
+        yield date, aggregator
+
+
+def test_aggregates_each_reporting_window_from_its_own_days():
+    reporting_windows = [
+        ReportingWindow.prior_to(datetime(2021, month, 1, tzinfo=UTC), number_of_months=2)
+        for month in [3, 4, 5]
+    ]
+    dates = sorted({date for window in reporting_windows for date in window.dates})
+
+    actual = list(aggregate_reporting_windows(reporting_windows, _daily_aggregates(dates)))
+
+    assert [window for window, _ in actual] == reporting_windows
+    assert [
+        [aggregator.national_metrics_month(month).total for month in window.metric_months]
+        for window, aggregator in actual
+    ] == [[28, 31], [31, 28], [30, 31]]
+    assert [aggregator.national_metrics_month((2021, 1)).total for _, aggregator in actual] == [
+        31,
+        0,
+        0,
+    ]
+
+
+def test_yields_each_reporting_window_once_its_last_day_has_been_read():
+    reporting_windows = [
+        ReportingWindow.prior_to(datetime(2021, month, 1, tzinfo=UTC), number_of_months=1)
+        for month in [2, 3]
+    ]
+    dates = sorted({date for window in reporting_windows for date in window.dates})
+    days_read = []
+
+    def recording_daily_aggregates():
+        for date, aggregator in _daily_aggregates(dates):
+            days_read.append(date)
+            yield date, aggregator
+
+    aggregates_by_window = aggregate_reporting_windows(
+        reporting_windows, recording_daily_aggregates()
+    )
+    next(aggregates_by_window)
+
+    assert days_read == reporting_windows[0].dates
@@ -4,6 +4,7 @@ from unittest.mock import Mock, call
 import pyarrow as pa
 
 from prmcalculator.domain.gp2gp.transfer import (
+    TRANSFER_COLUMNS,
     Transfer,
     TransferFailureReason,
     TransferOutcome,
@@ -137,7 +138,7 @@ def test_read_transfer_data():
 
     assert actual_data == expected_data
 
-    s3_manager.read_parquet.assert_called_once_with(s3_uri)
+    s3_manager.read_parquet.assert_called_once_with(s3_uri, columns=TRANSFER_COLUMNS)
 
 
 def test_read_transfer_data_from_multiple_files():
@@ -166,4 +167,33 @@ def test_read_transfer_data_from_multiple_files():
 
     assert actual_data == expected_data
 
-    s3_manager.read_parquet.assert_has_calls([call(s3_uri_one), call(s3_uri_two)])
+    s3_manager.read_parquet.assert_has_calls(
+        [
+            call(s3_uri_one, columns=TRANSFER_COLUMNS),
+            call(s3_uri_two, columns=TRANSFER_COLUMNS),
+        ]
+    )
+
+
+def test_read_transfer_data_into_store_from_multiple_files():
+    s3_manager = Mock()
+    s3_manager.read_parquet.side_effect = [
+        pa.Table.from_pydict(_INTEGRATED_TRANSFER_DATA_DICT, schema=_SCHEMA),
+        pa.Table.from_pydict(_INTEGRATED_LATE_TRANSFER_DATA_DICT, schema=_SCHEMA),
+    ]
+    s3_uris = [
+        f"s3://test_transfer_data_bucket/v4/{_METRIC_YEAR}/{_METRIC_MONTH}/transfers.parquet",
+        f"s3://test_transfer_data_bucket/v4/{_METRIC_YEAR}/{_METRIC_MONTH - 1}/transfers.parquet",
+    ]
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+    )
+
+    expected_data = [_INTEGRATED_TRANSFER, _INTEGRATED_LATE_TRANSFER]
+
+    actual_data = metrics_io.read_transfers_as_store(s3_uris=s3_uris)
+
+    assert list(actual_data) == expected_data
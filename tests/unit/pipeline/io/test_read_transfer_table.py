@@ -1,8 +1,12 @@
-from unittest.mock import Mock
+from typing import Generator, cast
+from unittest.mock import Mock, patch
 
 import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
 
 from prmcalculator.pipeline.io import PlatformMetricsIO
+from prmcalculator.utils.staged_pipeline import StagedPipeline
 from tests.builders.common import a_datetime
 
 _METRIC_MONTH = 12
@@ -39,4 +43,124 @@ def test_read_transfer_table():
 
     assert actual_table == expected_table
 
-    s3_manager.read_parquet.assert_called_once_with(s3_uri)
+    s3_manager.read_parquet.assert_called_once_with(s3_uri, columns=None)
+
+
+def test_read_transfer_table_concurrently_keeps_order_of_uris():
+    s3_uris = [
+        f"s3://test_transfer_data_bucket/v4/2020/12/{day}/transfers.parquet" for day in range(10)
+    ]
+    tables_by_uri = {
+        s3_uri: pa.Table.from_pydict({"conversation_id": [s3_uri]}) for s3_uri in s3_uris
+    }
+    s3_manager = Mock()
+    s3_manager.read_parquet.side_effect = lambda s3_uri, **kwargs: tables_by_uri[s3_uri]
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+        max_concurrent_reads=4,
+    )
+
+    actual_table = metrics_io.read_transfers_as_table(s3_uris=s3_uris)
+
+    assert actual_table.column("conversation_id").to_pylist() == s3_uris
+
+
+def test_read_transfer_tables_reads_one_file_at_a_time_as_tables_are_consumed():
+    s3_uris = [
+        f"s3://test_transfer_data_bucket/v4/2020/12/{day}/transfers.parquet" for day in range(3)
+    ]
+    s3_manager = Mock()
+    s3_manager.read_parquet.side_effect = lambda s3_uri, **kwargs: pa.Table.from_pydict(
+        {"conversation_id": [s3_uri]}
+    )
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+    )
+
+    transfer_tables = metrics_io.read_transfer_tables(s3_uris=s3_uris)
+    first_table = next(transfer_tables)
+
+    assert first_table.column("conversation_id").to_pylist() == s3_uris[:1]
+    assert s3_manager.read_parquet.call_count == 1
+
+
+def test_read_transfer_aggregates_skips_download_of_cached_days():
+    s3_uris = [
+        "s3://test_transfer_data_bucket/v4/2020/12/1/transfers.parquet",
+        "s3://test_transfer_data_bucket/v4/2020/12/2/transfers.parquet",
+    ]
+    cached_aggregate = Mock()
+    new_aggregate = Mock()
+    new_table = pa.Table.from_pydict({"conversation_id": ["123"]})
+    parquet_file = pa.BufferOutputStream()
+    pq.write_table(new_table, parquet_file)
+    s3_manager = Mock()
+    s3_manager.read_etag.return_value = '"an-etag"'
+    s3_manager.fetch_parquet.return_value = pa.BufferReader(parquet_file.getvalue())
+    aggregate_cache = Mock()
+    aggregate_cache.get.side_effect = [cached_aggregate, None]
+    aggregate_table = Mock(return_value=new_aggregate)
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+        aggregate_cache=aggregate_cache,
+    )
+
+    actual = list(metrics_io.read_transfer_aggregates(s3_uris, aggregate_table=aggregate_table))
+
+    assert actual == [cached_aggregate, new_aggregate]
+    s3_manager.fetch_parquet.assert_called_once_with(s3_uris[1], None, '"an-etag"')
+    aggregate_table.assert_called_once_with(new_table)
+    aggregate_cache.put.assert_called_once_with(s3_uris[1], '"an-etag"', new_aggregate)
+
+
+def test_read_transfer_tables_logs_stage_metrics_when_a_read_fails():
+    s3_manager = Mock()
+    s3_manager.fetch_parquet.side_effect = OSError("read failed")
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+        prefetch_queue_size=1,
+    )
+
+    with patch.object(StagedPipeline, "log_metrics") as log_metrics:
+        with pytest.raises(OSError, match="read failed"):
+            list(metrics_io.read_transfer_tables(s3_uris=["s3://bucket/transfers.parquet"]))
+
+    log_metrics.assert_called_once_with("transfer tables")
+
+
+def test_read_transfer_aggregates_logs_stage_metrics_when_closed_early():
+    s3_uris = [f"s3://bucket/v4/2020/12/{day}/transfers.parquet" for day in range(3)]
+    parquet_file = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pydict({"conversation_id": ["123"]}), parquet_file)
+    s3_manager = Mock()
+    s3_manager.fetch_parquet.side_effect = lambda s3_uri, columns: pa.BufferReader(
+        parquet_file.getvalue()
+    )
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+        prefetch_queue_size=1,
+    )
+
+    with patch.object(StagedPipeline, "log_metrics") as log_metrics:
+        aggregates = cast(
+            Generator, metrics_io.read_transfer_aggregates(s3_uris, aggregate_table=Mock())
+        )
+        next(aggregates)
+        aggregates.close()
+
+    log_metrics.assert_called_once_with("transfer aggregates")
@@ -137,3 +137,33 @@ def test_resolver_returns_correct_transfer_data_uris():
     ]
 
     assert actual == expected
+
+
+def test_resolver_returns_transfer_data_prefix():
+    transfer_data_bucket = a_string()
+
+    uri_resolver = PlatformMetricsS3UriResolver(
+        data_platform_metrics_bucket=a_string(),
+        transfer_data_bucket=transfer_data_bucket,
+    )
+
+    assert uri_resolver.transfer_data_prefix() == f"s3://{transfer_data_bucket}/v11/cutoff-14"
+
+
+def test_resolver_returns_correct_practice_metrics_parquet_uri():
+    data_platform_metrics_bucket = a_string()
+    date_anchor = a_datetime()
+    year = date_anchor.year
+    month = date_anchor.month
+
+    uri_resolver = PlatformMetricsS3UriResolver(
+        data_platform_metrics_bucket=data_platform_metrics_bucket,
+        transfer_data_bucket=a_string(),
+    )
+
+    actual = uri_resolver.practice_metrics_parquet((year, month))
+
+    expected_filename = f"{year}-{month}-practiceMetrics.parquet"
+    expected = f"s3://{data_platform_metrics_bucket}/v12/{year}/{month}/{expected_filename}"
+
+    assert actual == expected
@@ -9,6 +9,7 @@ from prmcalculator.pipeline.io import PlatformMetricsIO, logger
 
 def test_store_ssm_param():
     ssm_manager = Mock()
+    ssm_manager.get_parameter.return_value = {"Parameter": {"Value": "a/previous/value"}}
     s3_key = "some/uri/nationalMetrics.json"
     ssm_param_name = "a/param/name"
 
@@ -27,6 +28,7 @@ def test_store_ssm_param():
 
 def test_exit_when_fails_to_store_ssm_param():
     ssm_manager = Mock()
+    ssm_manager.get_parameter.return_value = {"Parameter": {"Value": "a/previous/value"}}
     s3_uri = "some/uri/nationalMetrics.json"
     ssm_param_name = "a/param/name"
 
@@ -53,3 +55,20 @@ def test_exit_when_fails_to_store_ssm_param():
             "ssm_param_value": s3_uri,
         },
     )
+
+
+def test_skips_storing_ssm_param_with_unchanged_value():
+    ssm_manager = Mock()
+    s3_key = "some/uri/nationalMetrics.json"
+    ssm_manager.get_parameter.return_value = {"Parameter": {"Value": s3_key}}
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=Mock(),
+        ssm_manager=ssm_manager,
+        output_metadata={},
+    )
+
+    metrics_io.store_ssm_param(ssm_param_name="a/param/name", ssm_param_value=s3_key)
+
+    ssm_manager.get_parameter.assert_called_once_with(Name="a/param/name")
+    ssm_manager.put_parameter.assert_not_called()
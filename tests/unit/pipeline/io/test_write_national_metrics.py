@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 
 from dateutil.tz import UTC
 
@@ -11,6 +11,7 @@ from prmcalculator.domain.national.construct_national_metrics_presentation impor
     ProcessFailureMetricsPresentation,
 )
 from prmcalculator.pipeline.io import PlatformMetricsIO
+from prmcalculator.utils.io.content_encoding import ContentEncoding
 from tests.builders.common import a_string
 
 _DATE_ANCHOR_MONTH = 1
@@ -98,6 +99,36 @@ def test_given_national_metrics_object_will_generate_json():
     s3_manager.write_json.assert_called_once_with(
         object_uri=s3_uri,
         data=expected_national_metrics_dict,
-        metadata=output_metadata,
+        metadata={**output_metadata, "content-hash": ANY},
         log_data=True,
+        content_encoding=ContentEncoding.IDENTITY,
+    )
+
+
+def test_write_national_metrics_overrides_output_metadata():
+    s3_manager = Mock()
+    s3_uri = f"s3://{a_string()}/v8/2021/1/2021-1-nationalMetrics.json"
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={"metadata-field": "metadata_value", "date-anchor": "2021-01-01"},
+    )
+
+    metrics_io.write_national_metrics(
+        national_metrics_presentation_data=_NATIONAL_METRICS_OBJECT,
+        s3_uri=s3_uri,
+        metadata={"date-anchor": "2021-02-01"},
+    )
+
+    s3_manager.write_json.assert_called_once_with(
+        object_uri=s3_uri,
+        data=_NATIONAL_METRICS_DICT,
+        metadata={
+            "metadata-field": "metadata_value",
+            "date-anchor": "2021-02-01",
+            "content-hash": ANY,
+        },
+        log_data=True,
+        content_encoding=ContentEncoding.IDENTITY,
     )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock, patch
 
 from prmcalculator.domain.practice.calculate_practice_metrics import (
     PracticeMetricsPresentation,
@@ -10,7 +10,11 @@ from prmcalculator.domain.practice.construct_practice_summary import (
     PracticeSummary,
     RequestedTransferMetrics,
 )
+from prmcalculator.pipeline import io
 from prmcalculator.pipeline.io import PlatformMetricsIO
+from prmcalculator.utils.io.content_encoding import ContentEncoding
+from prmcalculator.utils.io.in_memory import InMemoryDataManager
+from prmcalculator.utils.io.json_stream import encode_json_chunks
 from tests.builders.common import a_string
 
 _DATE_ANCHOR_MONTH = 1
@@ -51,7 +55,7 @@ _PRACTICE_METRICS_OBJECT = PracticeMetricsPresentation(
 )
 
 _PRACTICE_METRICS_DICT = {
-    "generatedOn": datetime(_DATE_ANCHOR_YEAR, _DATE_ANCHOR_MONTH, 1),
+    "generatedOn": datetime(_DATE_ANCHOR_YEAR, _DATE_ANCHOR_MONTH, 1).isoformat(),
     "practices": [
         {
             "odsCode": "A12345",
@@ -84,7 +88,7 @@ _PRACTICE_METRICS_DICT = {
 
 
 def test_given_practice_metrics_object_will_generate_json():
-    s3_manager = Mock()
+    s3_manager = InMemoryDataManager()
 
     data_platform_metrics_bucket = a_string()
     s3_file_name = f"{_DATE_ANCHOR_YEAR}-{_DATE_ANCHOR_MONTH}-practiceMetrics.json"
@@ -104,13 +108,12 @@ def test_given_practice_metrics_object_will_generate_json():
 
     expected_practice_metrics_dict = _PRACTICE_METRICS_DICT
 
-    s3_manager.write_json.assert_called_once_with(
-        object_uri=s3_uri, data=expected_practice_metrics_dict, metadata=output_metadata
-    )
+    assert s3_manager.read_json(s3_uri) == expected_practice_metrics_dict
+    assert s3_manager.read_metadata(s3_uri) == {**output_metadata, "content-hash": ANY}
 
 
 def test_given_data_platform_metrics_version_will_override_default():
-    s3_manager = Mock()
+    s3_manager = InMemoryDataManager()
 
     data_platform_metrics_bucket = a_string()
     data_platform_metrics_version = "99"
@@ -132,6 +135,80 @@ def test_given_data_platform_metrics_version_will_override_default():
 
     expected_practice_metrics_dict = _PRACTICE_METRICS_DICT
 
-    s3_manager.write_json.assert_called_once_with(
-        object_uri=s3_uri, data=expected_practice_metrics_dict, metadata={}
+    assert s3_manager.read_json(s3_uri) == expected_practice_metrics_dict
+    assert s3_manager.read_metadata(s3_uri) == {"content-hash": ANY}
+
+
+def test_uploads_practice_metrics_with_generated_on_when_skipping_unchanged_outputs():
+    s3_manager = InMemoryDataManager()
+    expected_manager = InMemoryDataManager()
+    s3_uri = f"s3://{a_string()}/practiceMetrics.json"
+    expected_manager.write_json_chunks(s3_uri, encode_json_chunks(_PRACTICE_METRICS_OBJECT), {})
+
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+    )
+    metrics_io.write_practice_metrics(
+        practice_metrics_presentation_data=_PRACTICE_METRICS_OBJECT, s3_uri=s3_uri
+    )
+
+    assert s3_manager.read_etag(s3_uri) == expected_manager.read_etag(s3_uri)
+
+
+def test_only_encodes_unchanged_practice_metrics_to_hash_them():
+    s3_manager = InMemoryDataManager()
+    s3_uri = f"s3://{a_string()}/practiceMetrics.json"
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+    )
+    metrics_io.write_practice_metrics(
+        practice_metrics_presentation_data=_PRACTICE_METRICS_OBJECT, s3_uri=s3_uri
+    )
+
+    with patch.object(io, "encode_json_chunks", wraps=io.encode_json_chunks) as encode_spy:
+        metrics_io.write_practice_metrics(
+            practice_metrics_presentation_data=_PRACTICE_METRICS_OBJECT, s3_uri=s3_uri
+        )
+
+    assert encode_spy.call_count == 1
+
+
+def _write_with_parquet(s3_manager, output_content_encoding):
+    metrics_io = PlatformMetricsIO(
+        s3_data_manager=s3_manager,
+        ssm_manager=Mock(),
+        output_metadata={},
+        output_content_encoding=output_content_encoding,
     )
+    metrics_io.write_practice_metrics(
+        practice_metrics_presentation_data=_PRACTICE_METRICS_OBJECT,
+        s3_uri="s3://bucket/practiceMetrics.json",
+        parquet_s3_uri="s3://bucket/practiceMetrics.parquet",
+    )
+
+
+def test_parquet_output_reuses_json_content_digest_and_ignores_content_encoding():
+    identity_manager = InMemoryDataManager()
+    gzip_manager = InMemoryDataManager()
+
+    with patch.object(io, "encode_json_chunks", wraps=io.encode_json_chunks) as encode_spy:
+        _write_with_parquet(identity_manager, ContentEncoding.IDENTITY)
+    _write_with_parquet(gzip_manager, ContentEncoding.GZIP)
+
+    json_hashes = [
+        manager.read_metadata("s3://bucket/practiceMetrics.json")["content-hash"]
+        for manager in (identity_manager, gzip_manager)
+    ]
+    parquet_hashes = [
+        manager.read_metadata("s3://bucket/practiceMetrics.parquet")["content-hash"]
+        for manager in (identity_manager, gzip_manager)
+    ]
+    parquet_table = identity_manager.read_parquet("s3://bucket/practiceMetrics.parquet")
+    assert encode_spy.call_count == 2
+    assert json_hashes[0] != json_hashes[1]
+    assert parquet_hashes[0] == parquet_hashes[1]
+    assert parquet_table.column("ods_code").to_pylist() == ["A12345"]
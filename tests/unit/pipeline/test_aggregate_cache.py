@@ -0,0 +1,72 @@
+import boto3
+from moto import mock_s3
+
+from prmcalculator.domain.metrics_aggregator import MetricsAggregator
+from prmcalculator.pipeline.aggregate_cache import AggregateCache
+from prmcalculator.utils.io.s3 import S3DataManager
+from tests.builders.common import a_datetime
+from tests.builders.gp2gp import a_transfer_integrated_within_3_days
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+_SOURCE_URI = "s3://transfers-bucket/v11/2021/07/01/2021-07-01-transfers.parquet"
+
+
+def _an_aggregator() -> MetricsAggregator:
+    aggregator = MetricsAggregator()
+    aggregator.add_transfers(
+        [a_transfer_integrated_within_3_days(date_requested=a_datetime(year=2021, month=7))]
+    )
+    return aggregator
+
+
+def test_returns_none_when_source_has_not_been_cached(tmp_path):
+    cache = AggregateCache(S3DataManager(None), str(tmp_path))
+
+    assert cache.get(_SOURCE_URI, etag='"abc"') is None
+
+
+def test_returns_cached_aggregate_for_same_etag(tmp_path):
+    aggregator = _an_aggregator()
+    cache = AggregateCache(S3DataManager(None), str(tmp_path / "cache"))
+    cache.put(_SOURCE_URI, etag='"abc"', aggregator=aggregator)
+
+    actual = cache.get(_SOURCE_URI, etag='"abc"')
+
+    assert actual is not None
+    assert actual.to_dict() == aggregator.to_dict()
+
+
+def test_returns_none_when_source_etag_has_changed(tmp_path):
+    cache = AggregateCache(S3DataManager(None), str(tmp_path))
+    cache.put(_SOURCE_URI, etag='"abc"', aggregator=_an_aggregator())
+
+    assert cache.get(_SOURCE_URI, etag='"def"') is None
+
+
+def test_treats_an_undecodable_entry_as_a_miss_and_replaces_it(tmp_path):
+    cache = AggregateCache(S3DataManager(None), str(tmp_path))
+    cache.put(_SOURCE_URI, etag='"abc"', aggregator=_an_aggregator())
+    (entry_file,) = tmp_path.iterdir()
+    entry_file.write_text(entry_file.read_text()[:20])
+
+    missed = cache.get(_SOURCE_URI, etag='"abc"')
+    cache.put(_SOURCE_URI, etag='"abc"', aggregator=_an_aggregator())
+
+    assert missed is None
+    assert cache.get(_SOURCE_URI, etag='"abc"') is not None
+    assert [path.name for path in tmp_path.iterdir()] == [entry_file.name]
+
+
+@mock_s3
+def test_stores_aggregates_in_s3():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="cache-bucket")
+    aggregator = _an_aggregator()
+    cache = AggregateCache(S3DataManager(conn), "s3://cache-bucket/aggregates")
+    cache.put(_SOURCE_URI, etag='"abc"', aggregator=aggregator)
+
+    actual = cache.get(_SOURCE_URI, etag='"abc"')
+
+    assert actual is not None
+    assert actual.to_dict() == aggregator.to_dict()
+    assert cache.get("s3://transfers-bucket/another.parquet", etag='"abc"') is None
@@ -4,10 +4,14 @@ import pytest
 from dateutil.tz import UTC
 
 from prmcalculator.pipeline.config import (
+    AwsRetryMode,
     InvalidEnvironmentVariableValue,
+    MetricsEngine,
     MissingEnvironmentVariable,
     PipelineConfig,
+    TransferDataDiscovery,
 )
+from prmcalculator.utils.io.content_encoding import ContentEncoding
 from tests.builders.common import a_string
 
 
@@ -22,6 +26,30 @@ def test_reads_from_environment_variables_and_converts_to_required_format():
         "BUILD_TAG": build_tag,
         "NATIONAL_METRICS_S3_PATH_PARAM_NAME": "a/param/name",
         "PRACTICE_METRICS_S3_PATH_PARAM_NAME": "another/param/name",
+        "MAX_CONCURRENT_READS": "8",
+        "METRICS_ENGINE": "arrow",
+        "AGGREGATE_CACHE_URI": "s3://aggregate-cache-bucket/v1",
+        "BACKFILL_END_DATE_ANCHOR": "2020-06-30T18:44:49Z",
+        "PRACTICE_METRICS_MAX_WORKERS": "4",
+        "PARQUET_CACHE_DIRECTORY": "/tmp/parquet-cache",
+        "PARQUET_CACHE_MAX_BYTES": "1048576",
+        "STORAGE_URI": "file:///tmp/storage",
+        "TRANSFER_DATA_DISCOVERY": "dataset",
+        "S3_READ_MAX_ATTEMPTS": "5",
+        "S3_READ_RETRY_BASE_DELAY_MS": "250",
+        "S3_READ_HEDGING": "true",
+        "S3_READ_PART_SIZE_BYTES": "0",
+        "S3_READ_PART_CONCURRENCY": "8",
+        "S3_READ_FOOTER_FIRST": "true",
+        "S3_MAX_POOL_CONNECTIONS": "64",
+        "S3_CONNECT_TIMEOUT_SECONDS": "5",
+        "S3_READ_TIMEOUT_SECONDS": "30",
+        "S3_TCP_KEEPALIVE": "true",
+        "AWS_RETRY_MODE": "adaptive",
+        "PREFETCH_QUEUE_SIZE": "2",
+        "OUTPUT_CONTENT_ENCODING": "br",
+        "SKIP_UNCHANGED_OUTPUTS": "false",
+        "PRACTICE_METRICS_PARQUET": "true",
     }
 
     expected_config = PipelineConfig(
@@ -33,6 +61,32 @@ def test_reads_from_environment_variables_and_converts_to_required_format():
         build_tag=build_tag,
         national_metrics_s3_path_param_name="a/param/name",
         practice_metrics_s3_path_param_name="another/param/name",
+        max_concurrent_reads=8,
+        metrics_engine=MetricsEngine.ARROW,
+        aggregate_cache_uri="s3://aggregate-cache-bucket/v1",
+        backfill_end_date_anchor=datetime(
+            year=2020, month=6, day=30, hour=18, minute=44, second=49, tzinfo=UTC
+        ),
+        practice_metrics_max_workers=4,
+        parquet_cache_directory="/tmp/parquet-cache",
+        parquet_cache_max_bytes=1048576,
+        storage_uri="file:///tmp/storage",
+        transfer_data_discovery=TransferDataDiscovery.DATASET,
+        s3_read_max_attempts=5,
+        s3_read_retry_base_delay_ms=250,
+        s3_read_hedging=True,
+        s3_read_part_size_bytes=0,
+        s3_read_part_concurrency=8,
+        s3_read_footer_first=True,
+        s3_max_pool_connections=64,
+        s3_connect_timeout_seconds=5,
+        s3_read_timeout_seconds=30,
+        s3_tcp_keepalive=True,
+        aws_retry_mode=AwsRetryMode.ADAPTIVE,
+        prefetch_queue_size=2,
+        output_content_encoding=ContentEncoding.BROTLI,
+        skip_unchanged_outputs=False,
+        practice_metrics_parquet=True,
     )
 
     actual_config = PipelineConfig.from_environment_variables(environment)
@@ -59,6 +113,30 @@ def test_read_config_from_environment_when_optional_parameters_are_not_set():
         build_tag=build_tag,
         national_metrics_s3_path_param_name="a/param/name",
         practice_metrics_s3_path_param_name="another/param/name",
+        max_concurrent_reads=1,
+        metrics_engine=MetricsEngine.TRANSFERS,
+        aggregate_cache_uri=None,
+        backfill_end_date_anchor=None,
+        practice_metrics_max_workers=1,
+        parquet_cache_directory=None,
+        parquet_cache_max_bytes=10 * 1024**3,
+        storage_uri=None,
+        transfer_data_discovery=TransferDataDiscovery.DAILY,
+        s3_read_max_attempts=3,
+        s3_read_retry_base_delay_ms=100,
+        s3_read_hedging=False,
+        s3_read_part_size_bytes=0,
+        s3_read_part_concurrency=4,
+        s3_read_footer_first=False,
+        s3_max_pool_connections=None,
+        s3_connect_timeout_seconds=60,
+        s3_read_timeout_seconds=60,
+        s3_tcp_keepalive=False,
+        aws_retry_mode=None,
+        prefetch_queue_size=0,
+        output_content_encoding=ContentEncoding.IDENTITY,
+        skip_unchanged_outputs=True,
+        practice_metrics_parquet=False,
     )
 
     actual_config = PipelineConfig.from_environment_variables(environment)
@@ -87,3 +165,20 @@ def test_error_from_environment_when_incorrect_type_field_set():
     with pytest.raises(InvalidEnvironmentVariableValue) as e:
         PipelineConfig.from_environment_variables(environment)
     assert str(e.value) == "Expected environment variable DATE_ANCHOR value is invalid, exiting..."
+
+
+def test_error_from_environment_when_metrics_engine_is_unknown():
+    environment = {
+        "INPUT_TRANSFER_DATA_BUCKET": "input-transfer-data-bucket",
+        "OUTPUT_METRICS_BUCKET": "output-metrics-bucket",
+        "BUILD_TAG": a_string(),
+        "NATIONAL_METRICS_S3_PATH_PARAM_NAME": "a/param/name",
+        "PRACTICE_METRICS_S3_PATH_PARAM_NAME": "another/param/name",
+        "METRICS_ENGINE": "abacus",
+    }
+
+    with pytest.raises(InvalidEnvironmentVariableValue) as e:
+        PipelineConfig.from_environment_variables(environment)
+    assert (
+        str(e.value) == "Expected environment variable METRICS_ENGINE value is invalid, exiting..."
+    )
@@ -0,0 +1,73 @@
+from dataclasses import replace
+
+from dateutil.parser import isoparse
+
+from prmcalculator.pipeline.config import AwsRetryMode, PipelineConfig
+from prmcalculator.pipeline.storage_factory import create_boto_config, s3_max_pool_connections
+
+
+def _build_config(**kwargs) -> PipelineConfig:
+    config = PipelineConfig(
+        build_tag="abc",
+        input_transfer_data_bucket="transfer-data",
+        output_metrics_bucket="metrics",
+        date_anchor=isoparse("2021-07-01T00:00:00Z"),
+        number_of_months=1,
+        s3_endpoint_url=None,
+        national_metrics_s3_path_param_name="national-metrics-path",
+        practice_metrics_s3_path_param_name="practice-metrics-path",
+    )
+    return replace(config, **kwargs)
+
+
+def test_pool_size_defaults_to_botocore_default_for_serial_reads():
+    config = _build_config(max_concurrent_reads=1, s3_read_part_concurrency=4)
+
+    assert s3_max_pool_connections(config) == 10
+
+
+def test_pool_size_covers_every_concurrent_ranged_and_hedged_request():
+    config = _build_config(
+        max_concurrent_reads=8,
+        s3_read_part_size_bytes=1024,
+        s3_read_part_concurrency=4,
+        s3_read_hedging=True,
+    )
+
+    assert s3_max_pool_connections(config) == 64
+
+
+def test_pool_size_ignores_part_concurrency_without_ranged_reads():
+    config = _build_config(max_concurrent_reads=16, s3_read_part_concurrency=4)
+
+    assert s3_max_pool_connections(config) == 16
+
+
+def test_pool_size_can_be_configured_explicitly():
+    config = _build_config(max_concurrent_reads=8, s3_max_pool_connections=12)
+
+    assert s3_max_pool_connections(config) == 12
+
+
+def test_boto_config_applies_client_tuning():
+    config = _build_config(
+        s3_max_pool_connections=32,
+        s3_connect_timeout_seconds=5,
+        s3_read_timeout_seconds=30,
+        s3_tcp_keepalive=True,
+        aws_retry_mode=AwsRetryMode.ADAPTIVE,
+    )
+
+    boto_config = create_boto_config(config)
+
+    assert boto_config.max_pool_connections == 32
+    assert boto_config.connect_timeout == 5
+    assert boto_config.read_timeout == 30
+    assert boto_config.tcp_keepalive is True
+    assert boto_config.retries == {"mode": "adaptive"}
+
+
+def test_boto_config_leaves_retry_mode_to_botocore_by_default():
+    boto_config = create_boto_config(_build_config())
+
+    assert boto_config.retries is None
@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest import mock
+
+import pyarrow as pa
+import pytest
+
+from prmcalculator.pipeline.s3_uri_resolver import PlatformMetricsS3UriResolver
+from prmcalculator.pipeline.transfer_dataset import (
+    TRANSFER_DATA_PARTITIONING,
+    TransferDataset,
+    logger,
+)
+from prmcalculator.utils.io.in_memory import InMemoryDataManager
+from prmcalculator.utils.io.local_files import LocalFileDataManager
+
+_URIS = PlatformMetricsS3UriResolver(
+    transfer_data_bucket="transfer-data", data_platform_metrics_bucket="metrics"
+)
+_STORED_DATES = [
+    datetime(2021, 11, 30),
+    datetime(2021, 12, 1),
+    datetime(2021, 12, 2),
+    datetime(2022, 1, 1),
+]
+
+
+def _build_storage(storage_type, tmp_path):
+    storage = LocalFileDataManager(tmp_path) if storage_type == "local" else InMemoryDataManager()
+    for a_date, uri in zip(_STORED_DATES, _URIS.transfer_data(_STORED_DATES)):
+        storage.write_parquet(uri, pa.table({"conversation_id": [a_date.isoformat()]}))
+    return storage
+
+
+def _open_transfer_dataset(storage):
+    dataset = storage.open_parquet_dataset(_URIS.transfer_data_prefix(), TRANSFER_DATA_PARTITIONING)
+    return TransferDataset(dataset)
+
+
+@pytest.mark.parametrize("storage_type", ["local", "in_memory"])
+def test_read_table_only_includes_requested_dates(storage_type, tmp_path):
+    transfer_dataset = _open_transfer_dataset(_build_storage(storage_type, tmp_path))
+
+    table = transfer_dataset.read_table(
+        [datetime(2021, 12, 1), datetime(2022, 1, 1)], columns=["conversation_id"]
+    )
+
+    assert table.to_pydict() == {"conversation_id": ["2021-12-01T00:00:00", "2022-01-01T00:00:00"]}
+
+
+@pytest.mark.parametrize("storage_type", ["local", "in_memory"])
+def test_read_table_warns_about_missing_dates(storage_type, tmp_path):
+    transfer_dataset = _open_transfer_dataset(_build_storage(storage_type, tmp_path))
+
+    with mock.patch.object(logger, "warning") as mock_log_warning:
+        table = transfer_dataset.read_table(
+            [datetime(2021, 12, 2), datetime(2021, 12, 3)], columns=["conversation_id"]
+        )
+
+    assert table.num_rows == 1
+    mock_log_warning.assert_called_once_with(
+        "No transfer data found for 1 dates",
+        extra={"event": "MISSING_TRANSFER_DATA", "dates": ["2021-12-03"]},
+    )
+
+
+@pytest.mark.parametrize("storage_type", ["local", "in_memory"])
+def test_read_tables_by_date_returns_an_empty_table_for_missing_dates(storage_type, tmp_path):
+    transfer_dataset = _open_transfer_dataset(_build_storage(storage_type, tmp_path))
+
+    tables = transfer_dataset.read_tables_by_date(
+        [datetime(2021, 11, 30), datetime(2021, 12, 15), datetime(2021, 12, 2)],
+        columns=["conversation_id"],
+    )
+
+    assert [table.column("conversation_id").to_pylist() for table in tables] == [
+        ["2021-11-30T00:00:00"],
+        [],
+        ["2021-12-02T00:00:00"],
+    ]
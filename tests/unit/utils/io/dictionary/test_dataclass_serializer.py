@@ -0,0 +1,46 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from prmcalculator.utils.io.dictionary import camelize_dict, serializer_for
+
+
+@dataclass
+class _Month:
+    year: int
+    integrated_within_3_days_count: Optional[int]
+
+
+@dataclass
+class _Practice:
+    ods_code: str
+    generated_on: datetime
+    metrics: List[_Month]
+    sla_metrics: dict
+
+
+def test_converts_dataclass_the_same_as_camelizing_its_dictionary():
+    practice = _Practice(
+        ods_code="A12345",
+        generated_on=datetime(2021, 1, 1),
+        metrics=[_Month(2021, 3), _Month(2020, None)],
+        sla_metrics={"within_3_days": {"sla_band": 5}},
+    )
+
+    actual = serializer_for(_Practice).to_dict(practice)
+
+    assert actual == camelize_dict(asdict(practice))
+
+
+def test_computes_camelized_field_names_once_per_type():
+    serializer = serializer_for(_Month)
+
+    assert serializer_for(_Month) is serializer
+    assert serializer.fields == (
+        ("year", "year"),
+        ("integrated_within_3_days_count", "integratedWithin3DaysCount"),
+    )
+    assert serializer.encoded_fields == (
+        ("year", '"year": '),
+        ("integrated_within_3_days_count", '"integratedWithin3DaysCount": '),
+    )
@@ -0,0 +1,63 @@
+from unittest import mock
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_s3
+
+from prmcalculator.utils.io.s3 import S3DataManager
+from prmcalculator.utils.retry import RetryPolicy
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_read_etag_returns_object_etag():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_object = bucket.Object("fruits.parquet")
+    s3_object.put(Body=b"mango")
+
+    s3_manager = S3DataManager(conn)
+    actual = s3_manager.read_etag("s3://test_bucket/fruits.parquet")
+
+    assert actual == s3_object.e_tag
+
+
+@mock_s3
+def test_read_etag_raises_file_not_found_error_when_object_is_missing():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+
+    s3_manager = S3DataManager(conn)
+
+    with pytest.raises(FileNotFoundError):
+        s3_manager.read_etag("s3://test_bucket/missing.parquet")
+
+
+def test_read_etag_retries_throttled_requests():
+    client = mock.MagicMock()
+    client.meta.client.head_object.side_effect = [
+        ClientError({"Error": {"Code": "SlowDown"}}, "HeadObject"),
+        {"ETag": '"an-etag"'},
+    ]
+
+    s3_manager = S3DataManager(
+        client, retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0)
+    )
+
+    assert s3_manager.read_etag("s3://test_bucket/fruits.parquet") == '"an-etag"'
+    assert client.meta.client.head_object.call_count == 2
+
+
+def test_read_metadata_does_not_report_access_denied_as_missing():
+    client = mock.MagicMock()
+    client.meta.client.head_object.side_effect = ClientError(
+        {"Error": {"Code": "403"}}, "HeadObject"
+    )
+
+    s3_manager = S3DataManager(client, retry_policy=RetryPolicy(max_attempts=3))
+
+    with pytest.raises(ClientError):
+        s3_manager.read_metadata("s3://test_bucket/fruits.parquet")
+
+    assert client.meta.client.head_object.call_count == 1
@@ -1,12 +1,20 @@
+from io import BytesIO, RawIOBase
 from unittest import mock
 
 import boto3
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+from botocore.exceptions import ClientError
 from moto import mock_s3
 from pyarrow.parquet import write_table
 
+from prmcalculator.utils.io import s3_ranges
+from prmcalculator.utils.io.disk_cache import DiskCache
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
 from prmcalculator.utils.io.s3 import S3DataManager, logger
+from prmcalculator.utils.io.s3_ranges import RangedDownloader
+from prmcalculator.utils.retry import RetryPolicy
 from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
 
 
@@ -32,6 +40,48 @@ def test_read_parquet_returns_table():
     assert actual_data == expected_data
 
 
+@mock_s3
+def test_read_parquet_returns_only_requested_columns():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket_name = "test_bucket"
+    bucket = conn.create_bucket(Bucket=bucket_name)
+    s3_object = bucket.Object("fruits.parquet")
+
+    fruit_table = pa.table({"fruit": ["mango", "lemon"], "colour": ["orange", "yellow"]})
+    writer = pa.BufferOutputStream()
+    write_table(fruit_table, writer)
+    s3_object.put(Body=bytes(writer.getvalue()))
+
+    s3_manager = S3DataManager(conn)
+    actual_data = s3_manager.read_parquet(f"s3://{bucket_name}/fruits.parquet", columns=["fruit"])
+
+    expected_data = pa.table({"fruit": ["mango", "lemon"]})
+
+    assert actual_data == expected_data
+
+
+@mock_s3
+def test_read_parquet_returns_only_rows_matching_filters():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket_name = "test_bucket"
+    bucket = conn.create_bucket(Bucket=bucket_name)
+    s3_object = bucket.Object("fruits.parquet")
+
+    fruit_table = pa.table({"fruit": ["mango", "lemon", "apple"], "weight": [300, 100, 150]})
+    writer = pa.BufferOutputStream()
+    write_table(fruit_table, writer, row_group_size=1)
+    s3_object.put(Body=bytes(writer.getvalue()))
+
+    s3_manager = S3DataManager(conn)
+    actual_data = s3_manager.read_parquet(
+        f"s3://{bucket_name}/fruits.parquet", filters=[("weight", "<", 200)]
+    )
+
+    expected_data = pa.table({"fruit": ["lemon", "apple"], "weight": [100, 150]})
+
+    assert actual_data == expected_data
+
+
 @mock_s3
 def test_will_log_reading_file_event():
     conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
@@ -97,3 +147,275 @@ def test_read_json_logs_error_when_s3_json_file_not_found():
     )
 
     assert str(e.value) == object_uri
+
+
+class _SlowBody(RawIOBase):
+    def __init__(self, data: bytes, max_chunk_size: int):
+        self._data = BytesIO(data)
+        self._max_chunk_size = max_chunk_size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(memoryview(buffer)[: self._max_chunk_size])
+
+
+class _ReadOnlyBody:
+    def __init__(self, data: bytes):
+        self._data = BytesIO(data)
+
+    def read(self, amount):
+        return self._data.read(min(amount, 5))
+
+
+def _fruit_parquet_bytes(fruit_table):
+    writer = pa.BufferOutputStream()
+    write_table(fruit_table, writer)
+    return bytes(writer.getvalue())
+
+
+@pytest.mark.parametrize(
+    "build_body",
+    [lambda data: _SlowBody(data, max_chunk_size=7), _ReadOnlyBody],
+)
+def test_read_parquet_reads_body_arriving_in_chunks(build_body):
+    fruit_table = pa.table({"fruit": ["mango", "lemon"] * 100})
+    data = _fruit_parquet_bytes(fruit_table)
+    client = mock.MagicMock()
+    client.meta.client.get_object.return_value = {
+        "Body": build_body(data),
+        "ContentLength": len(data),
+        "ETag": '"an-etag"',
+    }
+
+    s3_manager = S3DataManager(client)
+    actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert actual_data == fruit_table
+
+
+@mock_s3
+def test_read_parquet_serves_repeat_reads_from_disk_cache(tmp_path):
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    fruit_table = pa.table({"fruit": ["mango", "lemon"]})
+    bucket.Object("fruits.parquet").put(Body=_fruit_parquet_bytes(fruit_table))
+    disk_cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+
+    s3_manager = S3DataManager(conn, disk_cache=disk_cache)
+    with mock.patch.object(
+        conn.meta.client, "get_object", wraps=conn.meta.client.get_object
+    ) as get_object_spy:
+        first_read = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+        second_read = s3_manager.read_parquet("s3://test_bucket/fruits.parquet", columns=["fruit"])
+
+    assert first_read == fruit_table
+    assert second_read == fruit_table
+    assert get_object_spy.call_count == 1
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+
+
+@mock_s3
+def test_fetch_parquet_with_a_known_etag_does_not_head_the_object(tmp_path):
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    fruit_table = pa.table({"fruit": ["mango", "lemon"]})
+    bucket.Object("fruits.parquet").put(Body=_fruit_parquet_bytes(fruit_table))
+    etag = bucket.Object("fruits.parquet").e_tag
+    disk_cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+
+    s3_manager = S3DataManager(conn, disk_cache=disk_cache)
+    with mock.patch.object(
+        conn.meta.client, "head_object", wraps=conn.meta.client.head_object
+    ) as head_object_spy:
+        s3_manager.fetch_parquet("s3://test_bucket/fruits.parquet", etag=etag)
+        cached_file = s3_manager.fetch_parquet("s3://test_bucket/fruits.parquet", etag=etag)
+
+    assert pq.read_table(cached_file) == fruit_table
+    assert head_object_spy.call_count == 0
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+
+
+class _NoSuchKey(ClientError):
+    pass
+
+
+def test_read_parquet_retries_throttled_reads():
+    fruit_table = pa.table({"fruit": ["mango", "lemon"]})
+    data = _fruit_parquet_bytes(fruit_table)
+    client = mock.MagicMock()
+    client.meta.client.exceptions.NoSuchKey = _NoSuchKey
+    client.meta.client.get_object.side_effect = [
+        ClientError({"Error": {"Code": "SlowDown"}}, "GetObject"),
+        {"Body": BytesIO(data), "ContentLength": len(data), "ETag": '"an-etag"'},
+    ]
+    read_latencies = LatencyHistogram("S3 read")
+
+    s3_manager = S3DataManager(
+        client,
+        retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0),
+        read_latencies=read_latencies,
+    )
+    actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert actual_data == fruit_table
+    assert client.meta.client.get_object.call_count == 2
+    assert read_latencies.count == 1
+
+
+def test_read_parquet_retries_truncated_bodies():
+    fruit_table = pa.table({"fruit": ["mango", "lemon"]})
+    data = _fruit_parquet_bytes(fruit_table)
+    client = mock.MagicMock()
+    client.meta.client.exceptions.NoSuchKey = _NoSuchKey
+    client.meta.client.get_object.side_effect = [
+        {"Body": BytesIO(data[:-10]), "ContentLength": len(data), "ETag": '"an-etag"'},
+        {"Body": BytesIO(data), "ContentLength": len(data), "ETag": '"an-etag"'},
+    ]
+
+    s3_manager = S3DataManager(
+        client, retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0)
+    )
+    actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert actual_data == fruit_table
+    assert client.meta.client.get_object.call_count == 2
+
+
+def test_read_parquet_does_not_retry_access_denied():
+    client = mock.MagicMock()
+    client.meta.client.exceptions.NoSuchKey = _NoSuchKey
+    client.meta.client.get_object.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied"}}, "GetObject"
+    )
+
+    s3_manager = S3DataManager(client, retry_policy=RetryPolicy(max_attempts=3))
+    with pytest.raises(ClientError):
+        s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert client.meta.client.get_object.call_count == 1
+
+
+def _wide_parquet_bytes(row_count: int) -> bytes:
+    writer = pa.BufferOutputStream()
+    write_table(
+        pa.table(
+            {
+                "fruit": [f"fruit-{index}" for index in range(row_count)],
+                "description": [f"{index} is a fruit" * 10 for index in range(row_count)],
+            }
+        ),
+        writer,
+        compression="none",
+    )
+    return bytes(writer.getvalue())
+
+
+@mock_s3
+def test_read_parquet_downloads_large_objects_in_ranged_parts():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    data = _wide_parquet_bytes(1000)
+    bucket.Object("fruits.parquet").put(Body=data)
+
+    s3_manager = S3DataManager(conn, ranged_downloader=RangedDownloader(1024, max_workers=4))
+    with mock.patch.object(
+        conn.meta.client, "get_object", wraps=conn.meta.client.get_object
+    ) as get_object_spy:
+        actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert actual_data == pq.read_table(pa.BufferReader(data))
+    assert get_object_spy.call_count == -(-len(data) // 1024)
+
+
+@mock_s3
+def test_ranged_reads_share_one_thread_pool_until_closed():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    data = _wide_parquet_bytes(1000)
+    bucket.Object("fruits.parquet").put(Body=data)
+    bucket.Object("more-fruits.parquet").put(Body=data)
+
+    with mock.patch.object(
+        s3_ranges, "ThreadPoolExecutor", wraps=s3_ranges.ThreadPoolExecutor
+    ) as executor_spy:
+        s3_manager = S3DataManager(conn, ranged_downloader=RangedDownloader(1024, max_workers=4))
+        s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+        s3_manager.read_parquet("s3://test_bucket/more-fruits.parquet")
+    s3_manager.close()
+
+    assert executor_spy.call_count == 1
+    with pytest.raises(RuntimeError):
+        s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+
+@mock_s3
+def test_read_parquet_downloads_small_objects_in_one_ranged_part():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    fruit_table = pa.table({"fruit": ["mango", "lemon"]})
+    bucket.Object("fruits.parquet").put(Body=_fruit_parquet_bytes(fruit_table))
+
+    s3_manager = S3DataManager(conn, ranged_downloader=RangedDownloader(1024**2, max_workers=4))
+    with mock.patch.object(
+        conn.meta.client, "get_object", wraps=conn.meta.client.get_object
+    ) as get_object_spy:
+        actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet")
+
+    assert actual_data == fruit_table
+    assert get_object_spy.call_count == 1
+
+
+@mock_s3
+def test_read_parquet_footer_first_fetches_only_requested_columns():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    data = _wide_parquet_bytes(3000)
+    bucket.Object("fruits.parquet").put(Body=data)
+
+    s3_manager = S3DataManager(
+        conn, ranged_downloader=RangedDownloader(1024**2, max_workers=4, footer_first=True)
+    )
+    fetched_bytes = []
+    get_object = conn.meta.client.get_object
+
+    def recording_get_object(**kwargs):
+        response = get_object(**kwargs)
+        fetched_bytes.append(response["ContentLength"])
+        return response
+
+    with mock.patch.object(conn.meta.client, "get_object", side_effect=recording_get_object):
+        actual_data = s3_manager.read_parquet("s3://test_bucket/fruits.parquet", columns=["fruit"])
+
+    assert actual_data == pq.read_table(pa.BufferReader(data), columns=["fruit"])
+    assert sum(fetched_bytes) < len(data) / 2
+
+
+@mock_s3
+def test_read_parquet_footer_first_raises_file_not_found():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    conn.create_bucket(Bucket="test_bucket")
+
+    s3_manager = S3DataManager(
+        conn, ranged_downloader=RangedDownloader(1024**2, max_workers=4, footer_first=True)
+    )
+
+    with pytest.raises(FileNotFoundError):
+        s3_manager.read_parquet("s3://test_bucket/missing.parquet", columns=["fruit"])
+
+
+@pytest.mark.parametrize("footer_first", [False, True])
+@mock_s3
+def test_ranged_reads_fetch_empty_objects_without_a_range(footer_first):
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    bucket.Object("empty.parquet").put(Body=b"")
+
+    s3_manager = S3DataManager(
+        conn,
+        ranged_downloader=RangedDownloader(1024, max_workers=4, footer_first=footer_first),
+    )
+    actual = s3_manager.fetch_parquet("s3://test_bucket/empty.parquet", columns=["fruit"])
+
+    assert actual.read() == b""
@@ -1,9 +1,11 @@
+import gzip
 from datetime import datetime
 from unittest import mock
 
 import boto3
 from moto import mock_s3
 
+from prmcalculator.utils.io.content_encoding import ContentEncoding
 from prmcalculator.utils.io.s3 import S3DataManager, logger
 from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
 
@@ -118,3 +120,43 @@ def test_will_log_writing_file_events():
                 ),
             ]
         )
+
+
+@mock_s3
+def test_writes_json_chunks_with_metadata():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn)
+
+    s3_manager.write_json_chunks(
+        object_uri="s3://test_bucket/test_object.json",
+        chunks=[b'{"fruit"', b": ", b'"mango"}'],
+        metadata=SOME_METADATA,
+    )
+
+    actual = bucket.Object("test_object.json").get()
+
+    assert actual["Body"].read() == b'{"fruit": "mango"}'
+    assert actual["Metadata"] == SOME_METADATA
+    assert actual["ContentType"] == "application/json"
+
+
+@mock_s3
+def test_writes_compressed_json_with_content_encoding():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn)
+    object_uri = "s3://test_bucket/test_object.json"
+
+    s3_manager.write_json_chunks(
+        object_uri=object_uri,
+        chunks=[b'{"fruit"', b": ", b'"mango"}'],
+        metadata=SOME_METADATA,
+        content_encoding=ContentEncoding.GZIP,
+    )
+
+    actual = bucket.Object("test_object.json").get()
+
+    assert "gzip" in actual["ContentEncoding"].split(",")
+    assert gzip.decompress(actual["Body"].read()) == b'{"fruit": "mango"}'
+    assert s3_manager.read_json(object_uri) == {"fruit": "mango"}
@@ -0,0 +1,29 @@
+from io import BytesIO
+
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+from moto import mock_s3
+
+from prmcalculator.utils.io.s3 import S3DataManager
+from tests.unit.utils.io.s3 import MOTO_MOCK_REGION
+
+
+@mock_s3
+def test_writes_table_as_parquet_with_metadata():
+    conn = boto3.resource("s3", region_name=MOTO_MOCK_REGION)
+    bucket = conn.create_bucket(Bucket="test_bucket")
+    s3_manager = S3DataManager(conn)
+    table = pa.table({"fruit": ["mango", "lemon"], "count": [1, 2]})
+
+    s3_manager.write_parquet(
+        object_uri="s3://test_bucket/fruits.parquet",
+        table=table,
+        metadata={"metadata_field": "metadata_value"},
+    )
+
+    response = bucket.Object("fruits.parquet").get()
+
+    assert pq.read_table(BytesIO(response["Body"].read())) == table
+    assert response["ContentType"] == "application/vnd.apache.parquet"
+    assert response["Metadata"] == {"metadata_field": "metadata_value"}
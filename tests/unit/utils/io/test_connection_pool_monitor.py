@@ -0,0 +1,46 @@
+import logging
+from unittest import mock
+
+from prmcalculator.utils.io.connection_pool_monitor import ConnectionPoolMonitor, logger
+
+_urllib3_logger = logging.getLogger("urllib3.connectionpool")
+
+
+def _discard_connection():
+    _urllib3_logger.warning(
+        "Connection pool is full, discarding connection: %s. Connection pool size: %s",
+        "bucket.s3.amazonaws.com",
+        10,
+    )
+
+
+def test_counts_connections_discarded_by_a_full_pool():
+    with mock.patch.object(logger, "warning"):
+        with ConnectionPoolMonitor(max_pool_connections=10) as monitor:
+            for _ in range(5):
+                _discard_connection()
+            _urllib3_logger.warning("Retrying after connection broken")
+
+    assert monitor.saturations == 5
+
+
+def test_logs_saturation_at_powers_of_two_and_on_exit():
+    with mock.patch.object(logger, "warning") as mock_log_warning:
+        with ConnectionPoolMonitor(max_pool_connections=10):
+            for _ in range(5):
+                _discard_connection()
+
+    saturations = [call.kwargs["extra"]["saturations"] for call in mock_log_warning.call_args_list]
+    assert saturations == [1, 2, 4, 5]
+    assert mock_log_warning.call_args.kwargs["extra"]["event"] == "S3_CONNECTION_POOL_SATURATED"
+
+
+def test_stops_monitoring_on_exit():
+    with ConnectionPoolMonitor(max_pool_connections=10) as monitor:
+        pass
+
+    with mock.patch.object(logger, "warning") as mock_log_warning:
+        _discard_connection()
+
+    assert monitor.saturations == 0
+    mock_log_warning.assert_not_called()
@@ -0,0 +1,55 @@
+import gzip
+from unittest import mock
+
+import pytest
+
+from prmcalculator.utils.io.content_encoding import (
+    ContentEncoding,
+    EncodedChunks,
+    decode_body,
+    logger,
+)
+
+_CHUNKS = [b'{"practices": [', b", ".join([b'{"odsCode": "A12345"}'] * 500), b"]}"]
+
+
+@pytest.mark.parametrize("content_encoding", list(ContentEncoding))
+def test_decodes_what_it_encodes(content_encoding):
+    encoded_chunks = EncodedChunks(_CHUNKS, content_encoding)
+
+    body = b"".join(encoded_chunks)
+
+    assert decode_body(body, content_encoding.value) == b"".join(_CHUNKS)
+
+
+def test_gzip_encoding_is_readable_by_gzip():
+    body = b"".join(EncodedChunks(_CHUNKS, ContentEncoding.GZIP))
+
+    assert gzip.decompress(body) == b"".join(_CHUNKS)
+
+
+def test_counts_raw_and_encoded_bytes():
+    encoded_chunks = EncodedChunks(_CHUNKS, ContentEncoding.BROTLI)
+
+    body = b"".join(encoded_chunks)
+
+    assert encoded_chunks.raw_bytes == len(b"".join(_CHUNKS))
+    assert encoded_chunks.encoded_bytes == len(body)
+    assert encoded_chunks.encoded_bytes < encoded_chunks.raw_bytes / 10
+
+
+def test_logs_compression_ratio():
+    encoded_chunks = EncodedChunks([b"a" * 1000], ContentEncoding.GZIP)
+    b"".join(encoded_chunks)
+
+    with mock.patch.object(logger, "info") as mock_log_info:
+        encoded_chunks.log_ratio("s3://bucket/key.json")
+
+    extra = mock_log_info.call_args.kwargs["extra"]
+    assert extra["event"] == "COMPRESSED_OUTPUT"
+    assert extra["raw_bytes"] == 1000
+    assert extra["compression_ratio"] == round(encoded_chunks.encoded_bytes / 1000, 4)
+
+
+def test_ignores_content_encodings_it_does_not_apply():
+    assert decode_body(b"{}", "aws-chunked") == b"{}"
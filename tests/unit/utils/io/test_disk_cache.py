@@ -0,0 +1,110 @@
+import os
+
+import pyarrow as pa
+
+from prmcalculator.utils.io.disk_cache import DiskCache
+
+
+def test_returns_none_and_counts_a_miss_when_object_is_not_cached(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+    actual = cache.get("a-bucket", "a/key.parquet", '"an-etag"')
+
+    assert actual is None
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 1, 0)
+
+
+def test_returns_memory_mapped_file_and_counts_a_hit_when_object_is_cached(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put("a-bucket", "a/key.parquet", '"an-etag"', pa.py_buffer(b"some data"))
+
+    actual = cache.get("a-bucket", "a/key.parquet", '"an-etag"')
+
+    assert isinstance(actual, pa.MemoryMappedFile)
+    assert actual.read() == b"some data"
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 0, 0)
+
+
+def test_does_not_return_object_cached_with_a_different_etag(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put("a-bucket", "a/key.parquet", '"an-etag"', pa.py_buffer(b"some data"))
+
+    actual = cache.get("a-bucket", "a/key.parquet", '"another-etag"')
+
+    assert actual is None
+
+
+def test_evicts_least_recently_used_objects_once_over_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=20)
+    cache.put("a-bucket", "first.parquet", "1", pa.py_buffer(b"0123456789"))
+    cache.put("a-bucket", "second.parquet", "1", pa.py_buffer(b"0123456789"))
+    for file in tmp_path.rglob("*.parquet"):
+        os.utime(file, (0, 0))
+    cache.get("a-bucket", "first.parquet", "1")
+
+    cache.put("a-bucket", "third.parquet", "1", pa.py_buffer(b"0123456789"))
+
+    assert cache.get("a-bucket", "first.parquet", "1") is not None
+    assert cache.get("a-bucket", "second.parquet", "1") is None
+    assert cache.get("a-bucket", "third.parquet", "1") is not None
+    assert cache.evictions == 1
+
+
+def test_builds_its_index_from_objects_already_in_the_directory(tmp_path):
+    previous_cache = DiskCache(str(tmp_path), max_bytes=20)
+    previous_cache.put("a-bucket", "first.parquet", "1", pa.py_buffer(b"0123456789"))
+    previous_cache.put("a-bucket", "second.parquet", "1", pa.py_buffer(b"0123456789"))
+    first_path, second_path = sorted(
+        tmp_path.rglob("*.parquet"), key=lambda path: path.stat().st_mtime
+    )
+    os.utime(first_path, (1, 1))
+    os.utime(second_path, (2, 2))
+
+    cache = DiskCache(str(tmp_path), max_bytes=20)
+    cache.put("a-bucket", "third.parquet", "1", pa.py_buffer(b"0123456789"))
+
+    assert not first_path.exists()
+    assert second_path.exists()
+    assert cache.evictions == 1
+
+
+def test_removes_orphaned_temporary_files_on_startup(tmp_path):
+    cache_directory = tmp_path / "prm-parquet-cache"
+    cache_directory.mkdir()
+    orphaned_file = cache_directory / "partial-abc_123.tmp"
+    orphaned_file.write_bytes(b"partial data")
+
+    DiskCache(str(tmp_path), max_bytes=1024)
+
+    assert not orphaned_file.exists()
+
+
+def test_leaves_files_it_did_not_create_alone(tmp_path):
+    cache_directory = tmp_path / "prm-parquet-cache"
+    (cache_directory / "a-subdirectory").mkdir(parents=True)
+    unrelated_files = [
+        tmp_path / "notes.tmp",
+        tmp_path / f"{'a' * 64}.parquet",
+        cache_directory / "notes.tmp",
+        cache_directory / "transfers.parquet",
+    ]
+    for unrelated_file in unrelated_files:
+        unrelated_file.write_bytes(b"0123456789" * 10)
+
+    cache = DiskCache(str(tmp_path), max_bytes=20)
+    cache.put("a-bucket", "first.parquet", "1", pa.py_buffer(b"0123456789"))
+
+    assert all(unrelated_file.exists() for unrelated_file in unrelated_files)
+    assert cache.evictions == 0
+
+
+def test_counts_a_miss_when_a_cached_file_was_removed(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put("a-bucket", "a/key.parquet", '"an-etag"', pa.py_buffer(b"some data"))
+    for file in tmp_path.rglob("*.parquet"):
+        file.unlink()
+
+    actual = cache.get("a-bucket", "a/key.parquet", '"an-etag"')
+
+    assert actual is None
+    assert (cache.hits, cache.misses) == (0, 1)
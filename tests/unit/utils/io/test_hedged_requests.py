@@ -0,0 +1,90 @@
+from threading import Event
+from time import monotonic
+from unittest.mock import Mock
+
+import pytest
+
+from prmcalculator.utils.io.hedged_requests import HedgedRequests
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram
+
+
+def _latencies(seconds: float, count: int) -> LatencyHistogram:
+    latencies = LatencyHistogram("test")
+    for _ in range(count):
+        latencies.record(seconds)
+    return latencies
+
+
+def test_does_not_hedge_before_enough_samples():
+    hedged_requests = HedgedRequests(_latencies(0.0, count=2), max_workers=2, min_samples=3)
+    function = Mock(return_value="result")
+
+    assert hedged_requests.call(function, description="a request") == "result"
+    assert function.call_count == 1
+    assert hedged_requests.hedged == 0
+
+
+def test_does_not_hedge_requests_faster_than_the_percentile():
+    hedged_requests = HedgedRequests(_latencies(5.0, count=3), max_workers=2, min_samples=3)
+    function = Mock(return_value="result")
+
+    assert hedged_requests.call(function, description="a request") == "result"
+    assert function.call_count == 1
+    assert hedged_requests.hedged == 0
+
+
+def test_hedge_response_wins_over_a_stalled_request():
+    hedged_requests = HedgedRequests(_latencies(0.01, count=3), max_workers=2, min_samples=3)
+    unblock_first_request = Event()
+    responses = iter(["stalled", "hedged"])
+
+    def request():
+        response = next(responses)
+        if response == "stalled":
+            unblock_first_request.wait(timeout=5)
+        return response
+
+    try:
+        assert hedged_requests.call(request, description="a request") == "hedged"
+    finally:
+        unblock_first_request.set()
+    assert hedged_requests.hedged == 1
+
+
+def test_raises_when_both_requests_fail():
+    hedged_requests = HedgedRequests(_latencies(0.0, count=3), max_workers=2, min_samples=3)
+
+    def request():
+        raise TimeoutError("slow")
+
+    with pytest.raises(TimeoutError):
+        hedged_requests.call(request, description="a request")
+
+
+def test_close_does_not_wait_for_a_losing_request():
+    hedged_requests = HedgedRequests(_latencies(0.01, count=3), max_workers=2, min_samples=3)
+    unblock_first_request = Event()
+    responses = iter(["stalled", "hedged"])
+
+    def request():
+        response = next(responses)
+        if response == "stalled":
+            unblock_first_request.wait(timeout=5)
+        return response
+
+    try:
+        assert hedged_requests.call(request, description="a request") == "hedged"
+        started = monotonic()
+        hedged_requests.close()
+        assert monotonic() - started < 1
+    finally:
+        unblock_first_request.set()
+
+
+def test_rejects_hedged_calls_once_closed():
+    hedged_requests = HedgedRequests(_latencies(0.01, count=3), max_workers=2, min_samples=3)
+
+    hedged_requests.close()
+
+    with pytest.raises(RuntimeError):
+        hedged_requests.call(Mock(return_value="result"), description="a request")
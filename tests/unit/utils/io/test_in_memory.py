@@ -0,0 +1,46 @@
+import pyarrow as pa
+import pytest
+
+from prmcalculator.utils.io.in_memory import InMemoryDataManager, InMemoryParameterStore
+
+
+def test_round_trips_json_with_metadata():
+    storage = InMemoryDataManager()
+
+    storage.write_json("s3://bucket/key.json", {"a": 1}, metadata={"build-tag": "abc"})
+
+    assert storage.read_json("s3://bucket/key.json") == {"a": 1}
+    assert storage.read_metadata("s3://bucket/key.json") == {"build-tag": "abc"}
+
+
+def test_reads_parquet_with_filters():
+    storage = InMemoryDataManager()
+    storage.write_parquet("s3://bucket/table.parquet", pa.table({"a": [1, 2, 3]}))
+
+    table = storage.read_parquet("s3://bucket/table.parquet", filters=[("a", ">", 1)])
+
+    assert table.to_pydict() == {"a": [2, 3]}
+
+
+def test_etag_reflects_object_content():
+    storage = InMemoryDataManager()
+    storage.write_json("s3://bucket/a.json", {"a": 1}, metadata={})
+    storage.write_json("s3://bucket/b.json", {"a": 1}, metadata={})
+
+    assert storage.read_etag("s3://bucket/a.json") == storage.read_etag("s3://bucket/b.json")
+
+
+def test_raises_file_not_found_for_missing_objects():
+    storage = InMemoryDataManager()
+
+    with pytest.raises(FileNotFoundError):
+        storage.read_json("s3://bucket/missing.json")
+
+
+def test_parameter_store_overwrites_parameters():
+    parameters = InMemoryParameterStore()
+
+    parameters.put_parameter(Name="a", Value="1", Type="String", Overwrite=True)
+    parameters.put_parameter(Name="a", Value="2", Type="String", Overwrite=True)
+
+    assert parameters.get_parameter(Name="a")["Parameter"]["Value"] == "2"
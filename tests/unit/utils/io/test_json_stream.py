@@ -0,0 +1,51 @@
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from prmcalculator.utils.io.dictionary import camelize_dict
+from prmcalculator.utils.io.json_stream import encode_json_chunks
+from prmcalculator.utils.io.storage import encode_json
+
+
+@dataclass
+class _Month:
+    year: int
+    percent_of_requested: Optional[float]
+
+
+@dataclass
+class _Empty:
+    pass
+
+
+@dataclass
+class _Summary:
+    generated_on: datetime
+    ods_code: Optional[str]
+    monthly_metrics: List[_Month]
+    extra_fields: dict
+    empty: _Empty
+
+
+_SUMMARY = _Summary(
+    generated_on=datetime(2021, 1, 1),
+    ods_code='A1"é',
+    monthly_metrics=[_Month(2020, 12.5), _Month(2021, None)],
+    extra_fields={"sicbl_name": {"practice_ods_codes": []}},
+    empty=_Empty(),
+)
+
+
+def test_encodes_dataclasses_the_same_as_camelizing_their_dictionary():
+    actual = b"".join(encode_json_chunks(_SUMMARY))
+
+    assert actual == encode_json(camelize_dict(asdict(_SUMMARY)))
+
+
+def test_yields_chunks_of_at_least_chunk_size_until_the_last():
+    chunks = list(encode_json_chunks([_SUMMARY] * 20, chunk_size=100))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+    assert len(json.loads(b"".join(chunks))) == 20
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from prmcalculator.utils.io.latency_histogram import LatencyHistogram, logger
+
+
+def test_percentiles_of_recorded_latencies():
+    histogram = LatencyHistogram("test")
+    for seconds in [0.5, 0.1, 0.3, 0.2, 0.4]:
+        histogram.record(seconds)
+
+    assert histogram.percentile(0) == 0.1
+    assert histogram.percentile(50) == 0.3
+    assert histogram.percentile(100) == 0.5
+
+
+def test_percentile_is_none_without_samples():
+    assert LatencyHistogram("test").percentile(95) is None
+
+
+def test_buckets_count_latencies_up_to_each_bound():
+    histogram = LatencyHistogram("test")
+    for seconds in [0.01, 0.07, 0.08, 3.0, 60.0]:
+        histogram.record(seconds)
+
+    buckets = histogram.buckets()
+
+    assert buckets["le_0.05s"] == 1
+    assert buckets["le_0.1s"] == 2
+    assert buckets["le_5.0s"] == 1
+    assert buckets["gt_30.0s"] == 1
+    assert sum(buckets.values()) == 5
+
+
+def test_buckets_count_latencies_on_a_bound_in_that_bound():
+    histogram = LatencyHistogram("test")
+    for seconds in [0.05, 0.1, 30.0]:
+        histogram.record(seconds)
+
+    buckets = histogram.buckets()
+
+    assert buckets["le_0.05s"] == 1
+    assert buckets["le_0.1s"] == 1
+    assert buckets["le_30.0s"] == 1
+    assert buckets["gt_30.0s"] == 0
+
+
+def test_log_summary_is_skipped_without_samples():
+    with mock.patch.object(logger, "info") as mock_log_info:
+        LatencyHistogram("test").log_summary()
+
+    mock_log_info.assert_not_called()
+
+
+def test_log_summary_includes_percentiles():
+    histogram = LatencyHistogram("S3 read")
+    histogram.record(0.2)
+
+    with mock.patch.object(logger, "info") as mock_log_info:
+        histogram.log_summary()
+
+    extra = mock_log_info.call_args.kwargs["extra"]
+    assert extra["event"] == "LATENCY_HISTOGRAM"
+    assert extra["histogram"] == "S3 read"
+    assert (extra["count"], extra["p95_seconds"]) == (1, 0.2)
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pyarrow as pa
+import pytest
+
+from prmcalculator.utils.io.local_files import LocalFileDataManager, LocalFileParameterStore
+
+
+def test_maps_s3_uris_below_the_root_directory(tmp_path):
+    files = LocalFileDataManager(tmp_path)
+
+    assert files.path("s3://bucket/some/key.json") == tmp_path / "bucket" / "some" / "key.json"
+
+
+def test_round_trips_json_with_metadata(tmp_path):
+    files = LocalFileDataManager(tmp_path)
+    data = {"generatedOn": datetime(2020, 1, 1, 12)}
+
+    files.write_json("s3://bucket/key.json", data, metadata={"build-tag": "abc"})
+
+    assert files.read_json("s3://bucket/key.json") == {"generatedOn": "2020-01-01T12:00:00"}
+    assert files.read_metadata("s3://bucket/key.json") == {"build-tag": "abc"}
+
+
+def test_reads_parquet_columns(tmp_path):
+    files = LocalFileDataManager(tmp_path)
+    table = pa.table({"a": [1, 2], "b": ["x", "y"]})
+
+    files.write_parquet("s3://bucket/table.parquet", table)
+
+    assert files.read_parquet("s3://bucket/table.parquet", columns=["b"]).to_pydict() == {
+        "b": ["x", "y"]
+    }
+
+
+def test_etag_changes_when_file_is_rewritten(tmp_path):
+    files = LocalFileDataManager(tmp_path)
+    files.write_json("s3://bucket/key.json", {"a": 1}, metadata={})
+    first_etag = files.read_etag("s3://bucket/key.json")
+
+    files.write_json("s3://bucket/key.json", {"a": 12}, metadata={})
+
+    assert files.read_etag("s3://bucket/key.json") != first_etag
+
+
+def test_raises_file_not_found_for_missing_objects(tmp_path):
+    files = LocalFileDataManager(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        files.read_etag("s3://bucket/missing.json")
+
+
+def test_parameter_store_keeps_every_parameter(tmp_path):
+    parameters = LocalFileParameterStore(tmp_path / "ssm-parameters.json")
+
+    parameters.put_parameter(Name="a", Value="1", Type="String", Overwrite=True)
+    parameters.put_parameter(Name="b", Value="2", Type="String", Overwrite=True)
+
+    assert parameters.get_parameter(Name="a")["Parameter"]["Value"] == "1"
+    assert parameters.get_parameter(Name="b")["Parameter"]["Value"] == "2"
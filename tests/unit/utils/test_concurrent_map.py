@@ -0,0 +1,78 @@
+from threading import Event, Lock
+from time import sleep
+from unittest import mock
+
+import pytest
+
+from prmcalculator.utils import concurrent_map as concurrent_map_module
+from prmcalculator.utils.concurrent_map import concurrent_map
+
+
+def test_returns_results_in_input_order_when_calls_finish_out_of_order():
+    def slow_for_small_numbers(number):
+        sleep(0.01 * (5 - number))
+        return number * 2
+
+    actual = list(concurrent_map(slow_for_small_numbers, range(5), max_workers=5))
+
+    assert actual == [0, 2, 4, 6, 8]
+
+
+def test_runs_calls_in_order_without_threads_when_max_workers_is_one():
+    actual = list(concurrent_map(lambda number: number + 1, [1, 2, 3], max_workers=1))
+
+    assert actual == [2, 3, 4]
+
+
+def test_never_has_more_than_max_workers_calls_in_flight():
+    lock = Lock()
+    in_flight = 0
+    max_seen_in_flight = 0
+
+    def track_in_flight(number):
+        nonlocal in_flight, max_seen_in_flight
+        with lock:
+            in_flight += 1
+            max_seen_in_flight = max(max_seen_in_flight, in_flight)
+        sleep(0.005)
+        with lock:
+            in_flight -= 1
+        return number
+
+    actual = list(concurrent_map(track_in_flight, range(20), max_workers=3))
+
+    assert actual == list(range(20))
+    assert max_seen_in_flight <= 3
+
+
+def test_raises_first_failure_and_cancels_calls_not_yet_started():
+    started = []
+    release_first_call = Event()
+
+    def fail_on_second_item(number):
+        started.append(number)
+        if number == 0:
+            release_first_call.wait(timeout=1)
+        if number == 1:
+            release_first_call.set()
+            raise ValueError("failed to read")
+        return number
+
+    with pytest.raises(ValueError, match="failed to read"):
+        for _ in concurrent_map(fail_on_second_item, range(100), max_workers=2):
+            pass
+
+    assert len(started) < 100
+
+
+def test_blocks_on_the_first_call_while_later_calls_have_finished():
+    def slow_first_call(number):
+        if number == 0:
+            sleep(0.2)
+        return number
+
+    with mock.patch.object(concurrent_map_module, "wait", wraps=concurrent_map_module.wait) as wait:
+        actual = list(concurrent_map(slow_first_call, range(4), max_workers=4))
+
+    assert actual == [0, 1, 2, 3]
+    assert wait.call_count <= 4
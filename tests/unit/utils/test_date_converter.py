@@ -5,7 +5,10 @@ from dateutil.tz import UTC
 
 from prmcalculator.utils.date_converter import (
     convert_date_range_to_dates,
+    convert_date_range_to_monthly_datetimes,
     get_first_day_of_month_datetime,
+    to_epoch_microseconds,
+    year_month_of_epoch_microseconds,
 )
 from tests.builders.common import a_datetime
 
@@ -42,3 +45,42 @@ def test_returns_first_day_of_month_datetime():
     expected = datetime(year=2021, month=2, day=1, hour=0, minute=0, second=0, tzinfo=UTC)
 
     assert actual == expected
+
+
+def test_returns_monthly_datetimes_between_start_and_end_datetime_inclusive():
+    start_datetime = a_datetime(year=2020, month=11, day=30, hour=18, minute=0, second=0)
+    end_datetime = a_datetime(year=2021, month=2, day=28, hour=18, minute=0, second=0)
+
+    actual = convert_date_range_to_monthly_datetimes(start_datetime, end_datetime)
+
+    expected = [
+        datetime(year=2020, month=11, day=30, hour=18, minute=0, second=0, tzinfo=UTC),
+        datetime(year=2020, month=12, day=30, hour=18, minute=0, second=0, tzinfo=UTC),
+        datetime(year=2021, month=1, day=30, hour=18, minute=0, second=0, tzinfo=UTC),
+        datetime(year=2021, month=2, day=28, hour=18, minute=0, second=0, tzinfo=UTC),
+    ]
+
+    assert actual == expected
+
+
+def test_returns_single_monthly_datetime_given_same_start_and_end_datetime():
+    a_date = a_datetime(year=2021, month=2, day=1)
+
+    actual = convert_date_range_to_monthly_datetimes(a_date, a_date)
+
+    assert actual == [a_date]
+
+
+@pytest.mark.parametrize(
+    "a_datetime_in_month, expected",
+    [
+        (datetime(1969, 12, 31, 23, 59, 59, tzinfo=UTC), (1969, 12)),
+        (datetime(1970, 1, 1, tzinfo=UTC), (1970, 1)),
+        (datetime(2021, 2, 28, 23, 59, 59, 999999, tzinfo=UTC), (2021, 2)),
+        (datetime(2021, 3, 1, tzinfo=UTC), (2021, 3)),
+    ],
+)
+def test_year_month_of_epoch_microseconds(a_datetime_in_month, expected):
+    actual = year_month_of_epoch_microseconds(to_epoch_microseconds(a_datetime_in_month))
+
+    assert actual == expected
@@ -0,0 +1,68 @@
+from unittest.mock import Mock, call
+
+import pytest
+
+from prmcalculator.utils.retry import RetryPolicy, retry_with_backoff
+
+
+class _RetryableError(Exception):
+    pass
+
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, _RetryableError)
+
+
+def test_backoff_delay_grows_exponentially_up_to_the_maximum():
+    policy = RetryPolicy(max_attempts=5, base_delay_seconds=0.1, max_delay_seconds=0.3)
+
+    delays = [policy.backoff_delay(attempt, jitter=lambda: 1.0) for attempt in range(4)]
+
+    assert delays == [0.1, 0.2, 0.3, 0.3]
+
+
+def test_backoff_delay_is_jittered():
+    policy = RetryPolicy(base_delay_seconds=1.0)
+
+    assert policy.backoff_delay(2, jitter=lambda: 0.25) == 1.0
+
+
+def test_retries_retryable_errors_until_success():
+    function = Mock(side_effect=[_RetryableError(), _RetryableError(), "result"])
+    sleep = Mock()
+
+    result = retry_with_backoff(
+        function, RetryPolicy(max_attempts=3), is_retryable=_is_retryable, sleep=sleep
+    )
+
+    assert result == "result"
+    assert function.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_raises_after_max_attempts():
+    function = Mock(side_effect=_RetryableError())
+    on_retry = Mock()
+
+    with pytest.raises(_RetryableError):
+        retry_with_backoff(
+            function,
+            RetryPolicy(max_attempts=2),
+            is_retryable=_is_retryable,
+            on_retry=on_retry,
+            sleep=Mock(),
+        )
+
+    assert function.call_count == 2
+    assert on_retry.call_args_list == [call(1, on_retry.call_args[0][1], function.side_effect)]
+
+
+def test_does_not_retry_other_errors():
+    function = Mock(side_effect=FileNotFoundError())
+
+    with pytest.raises(FileNotFoundError):
+        retry_with_backoff(
+            function, RetryPolicy(max_attempts=3), is_retryable=_is_retryable, sleep=Mock()
+        )
+
+    assert function.call_count == 1
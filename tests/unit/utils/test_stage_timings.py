@@ -0,0 +1,30 @@
+from unittest import mock
+
+from prmcalculator.utils.stage_timings import StageTimings
+
+
+@mock.patch("prmcalculator.utils.stage_timings.perf_counter")
+def test_records_elapsed_seconds_for_each_stage(mock_perf_counter):
+    mock_perf_counter.side_effect = [10.0, 12.5, 20.0, 20.25, 30.0, 31.0]
+    timings = StageTimings()
+
+    with timings.stage("read"):
+        pass
+    with timings.stage("write"):
+        pass
+    with timings.stage("read"):
+        pass
+
+    assert timings.to_dict() == {"read": 3.5, "write": 0.25}
+    assert timings.total_seconds == 3.75
+
+
+@mock.patch("prmcalculator.utils.stage_timings.perf_counter")
+def test_records_time_spent_producing_each_item(mock_perf_counter):
+    mock_perf_counter.side_effect = [0.0, 1.0, 5.0, 7.0, 10.0, 10.5]
+    timings = StageTimings()
+
+    actual = list(timings.iterate("read", ["a", "b"]))
+
+    assert actual == ["a", "b"]
+    assert timings.to_dict() == {"read": 3.5}
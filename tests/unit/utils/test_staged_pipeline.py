@@ -0,0 +1,83 @@
+from threading import Event
+from time import sleep
+
+import pytest
+
+from prmcalculator.utils.staged_pipeline import Stage, StagedPipeline, StageMetrics
+
+
+def test_runs_items_through_each_stage_in_order():
+    pipeline = StagedPipeline(
+        [
+            Stage("double", lambda number: number * 2, max_workers=3),
+            Stage("increment", lambda number: number + 1),
+        ],
+        queue_size=2,
+    )
+
+    actual = list(pipeline.run(range(10)))
+
+    assert actual == [number * 2 + 1 for number in range(10)]
+
+
+def test_preserves_order_when_concurrent_calls_finish_out_of_order():
+    def slow_for_small_numbers(number):
+        sleep(0.005 * (5 - number))
+        return number
+
+    pipeline = StagedPipeline([Stage("slow", slow_for_small_numbers, max_workers=5)], queue_size=1)
+
+    assert list(pipeline.run(range(5))) == [0, 1, 2, 3, 4]
+
+
+def test_raises_error_from_any_stage():
+    def fail_on_three(number):
+        if number == 3:
+            raise ValueError("three")
+        return number
+
+    pipeline = StagedPipeline(
+        [Stage("fail", fail_on_three), Stage("identity", lambda number: number)], queue_size=1
+    )
+
+    with pytest.raises(ValueError, match="three"):
+        list(pipeline.run(range(10)))
+
+
+def test_records_items_processed_by_each_stage():
+    pipeline = StagedPipeline(
+        [Stage("first", lambda number: number), Stage("second", lambda number: number)],
+        queue_size=3,
+    )
+
+    list(pipeline.run(range(7)))
+
+    assert [metrics.items for metrics in pipeline.metrics] == [7, 7]
+    assert all(metrics.max_queue_depth <= 3 for metrics in pipeline.metrics)
+
+
+def test_stops_stage_threads_when_consumer_closes_early():
+    finished = Event()
+
+    def produce(number):
+        if number == 99:
+            finished.set()
+        return number
+
+    pipeline = StagedPipeline([Stage("produce", produce)], queue_size=1)
+    results = pipeline.run(range(100))
+
+    assert next(results) == 0
+    results.close()
+
+    assert not finished.is_set()
+
+
+def test_mean_queue_depth_averages_recorded_depths():
+    metrics = StageMetrics("stage")
+    metrics.record_busy(0.1)
+    metrics.record_busy(0.1)
+    for depth in [1, 2, 3]:
+        metrics.record_queue_depth(depth)
+
+    assert metrics.mean_queue_depth == 2.0